@@ -1,3 +1,5 @@
+import base64
+import binascii
 import enum
 import re
 from typing import Annotated, Literal
@@ -24,6 +26,27 @@ class InlineVolume(pydantic.BaseModel):
     contents: str
     relative_path: str | None = None
 
+    @pydantic.field_validator("contents", mode="before")
+    @classmethod
+    def encode_binary_contents(cls, contents):
+        if isinstance(contents, bytes):
+            return base64.b64encode(contents).decode()
+        return contents
+
+    @pydantic.field_serializer("contents")
+    def serialize_contents(self, contents: str, info: pydantic.FieldSerializationInfo):
+        # binary wire formats carry the zip itself, a third smaller than its base64
+        if info.mode != "python" or not (info.context or {}).get("binary"):
+            return contents
+        try:
+            decoded = base64.b64decode(contents, validate=True)
+        except binascii.Error:
+            return contents
+        # only if the receiver gets back exactly the same string
+        if base64.b64encode(decoded).decode() != contents:
+            return contents
+        return decoded
+
     def is_safe(self) -> bool:
         return True
 
@@ -1,9 +1,14 @@
 import abc
 import enum
 import json
+from typing import Any
 
+import msgpack
 import pydantic
 
+from .serialization import model_dumps
+from .wire_format import BINARY_CONTEXT, WireFormat, is_msgpack, msgpack_dumps, msgpack_loads
+
 
 class ValidationError(Exception):
     def __init__(self, msg):
@@ -28,13 +33,14 @@ def all_subclasses(cls: type):
 
 
 base_class_to_request_type_mapping = {}
+base_class_to_message_type_mapping = {}
 
 
 class BaseRequest(pydantic.BaseModel, abc.ABC):
     message_type: enum.Enum
 
     @classmethod
-    def type_to_model(cls, type_: enum.Enum) -> type["BaseRequest"]:
+    def _request_type_mapping(cls) -> dict[enum.Enum, type["BaseRequest"]]:
         mapping = base_class_to_request_type_mapping.get(cls)
         if not mapping:
             mapping = {}
@@ -45,24 +51,49 @@ class BaseRequest(pydantic.BaseModel, abc.ABC):
                     continue
                 mapping[message_type.default] = klass
             base_class_to_request_type_mapping[cls] = mapping
+            # the raw message types, to look up the subclass before validating anything
+            base_class_to_message_type_mapping[cls] = {
+                type_.value: klass for type_, klass in mapping.items()
+            }
+        return mapping
 
-        return mapping[type_]
+    @classmethod
+    def type_to_model(cls, type_: enum.Enum) -> type["BaseRequest"]:
+        return cls._request_type_mapping()[type_]
 
     @classmethod
-    def parse(cls, str_: str):
-        try:
-            json_ = json.loads(str_)
-        except json.JSONDecodeError as exc:
-            raise ValidationError.from_json_decode_error(exc)
+    def message_type_to_model(cls, message_type: Any) -> type["BaseRequest"] | None:
+        cls._request_type_mapping()
+        if not isinstance(message_type, str):
+            return None
+        return base_class_to_message_type_mapping[cls].get(message_type)
 
-        try:
-            base_model_object = cls.model_validate(json_)
-        except pydantic.ValidationError as exc:
-            raise ValidationError.from_pydantic_validation_error(exc)
+    def serialize(self, wire_format: WireFormat = WireFormat.json) -> str | bytes:
+        if wire_format == WireFormat.msgpack:
+            return msgpack_dumps(self.model_dump(context=BINARY_CONTEXT))
+        return model_dumps(self)
 
-        target_model = cls.type_to_model(base_model_object.message_type)
+    @classmethod
+    def parse(cls, str_: str | bytes):
+        if is_msgpack(str_):
+            try:
+                json_ = msgpack_loads(str_)
+            except (ValueError, msgpack.ExtraData, msgpack.FormatError, msgpack.StackError) as exc:
+                raise ValidationError(f"Invalid msgpack: {exc!r}")
+        else:
+            try:
+                json_ = json.loads(str_)
+            except json.JSONDecodeError as exc:
+                raise ValidationError.from_json_decode_error(exc)
+
+        # validate only once, against the subclass picked by the raw message type. the
+        # base class validation is only needed to report a missing or unknown type
+        message_type = json_.get("message_type") if isinstance(json_, dict) else None
+        target_model = cls.message_type_to_model(message_type)
 
         try:
+            if target_model is None:
+                target_model = cls.type_to_model(cls.model_validate(json_).message_type)
             return target_model.model_validate(json_)
         except pydantic.ValidationError as exc:
             raise ValidationError.from_pydantic_validation_error(exc)
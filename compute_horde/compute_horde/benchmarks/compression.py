@@ -0,0 +1,151 @@
+"""
+Micro-benchmark of the permessage-deflate compression of the websocket messages.
+
+    python -m compute_horde.benchmarks.compression --iterations 100
+
+For typical synthetic and organic job messages, compares the size of the frames and the
+time to compress and decompress them, and the time to get them across links of a few
+bandwidths with and without compression, see `compute_horde.transport.compression`.
+"""
+
+import argparse
+import base64
+import hashlib
+import io
+import random
+import zipfile
+from dataclasses import dataclass
+
+from websockets import frames
+from websockets.extensions.permessage_deflate import PerMessageDeflate
+
+from ..base.volume import InlineVolume
+from ..base_requests import BaseRequest
+from ..mv_protocol import miner_requests, validator_requests
+from ..transport.compression import DEFAULT_COMPRESSION_POLICY
+from .parse_requests import JOB_UUID, _job_finished_receipt, _time_per_call_us
+
+# bits per second, from a residential uplink to a datacenter link
+BANDWIDTHS = {"10Mbit": 10_000_000, "100Mbit": 100_000_000, "1Gbit": 1_000_000_000}
+
+
+def _zip_volume(contents: bytes) -> str:
+    # like the synthetic jobs, stored in the zip without compression
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zip_file:
+        zip_file.writestr("payload.txt", contents)
+    return base64.b64encode(buffer.getvalue()).decode()
+
+
+def sample_payloads() -> dict[str, BaseRequest]:
+    rng = random.Random(0)
+    hashes = "\n".join(hashlib.sha256(rng.randbytes(8)).hexdigest() for _ in range(2_000)).encode()
+    passwords = "\n".join(
+        "".join(rng.choices("abcdefghijklmnopqrstuvwxyz0123456789", k=8)) for _ in range(200)
+    )
+    log = "\n".join(
+        f"epoch {epoch} step {step} loss {rng.random():.6f} lr 0.0001"
+        for epoch in range(20)
+        for step in range(100)
+    )
+    return {
+        "control: accept": miner_requests.V0AcceptJobRequest(job_uuid=JOB_UUID),
+        "control: receipt": _job_finished_receipt(),
+        "synthetic: job request": validator_requests.V0JobRequest(
+            job_uuid=JOB_UUID,
+            docker_image_name="backenddevelopersltd/compute-horde-job:v0-latest",
+            docker_run_options_preset="nvidia_all",
+            docker_run_cmd=[],
+            volume=InlineVolume(contents=_zip_volume(hashes)),
+        ),
+        "synthetic: job finished": miner_requests.V0JobFinishedRequest(
+            job_uuid=JOB_UUID, docker_process_stdout=passwords, docker_process_stderr=""
+        ),
+        "organic: job finished, logs": miner_requests.V0JobFinishedRequest(
+            job_uuid=JOB_UUID, docker_process_stdout=log, docker_process_stderr=log[:2_000]
+        ),
+        "organic: job request, binary volume": validator_requests.V0JobRequest(
+            job_uuid=JOB_UUID,
+            docker_image_name="backenddevelopersltd/compute-horde-job:v0-latest",
+            docker_run_options_preset="nvidia_all",
+            docker_run_cmd=[],
+            volume=InlineVolume(contents=base64.b64encode(rng.randbytes(64_000)).decode()),
+        ),
+    }
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    size: int
+    compressed_size: int
+    compress_us: float
+    decompress_us: float
+
+    def transfer_ms(self, bandwidth: int, compressed: bool) -> float:
+        if not compressed:
+            return self.size * 8 / bandwidth * 1_000
+        return (
+            self.compressed_size * 8 / bandwidth * 1_000
+            + (self.compress_us + self.decompress_us) / 1_000
+        )
+
+
+def _extension() -> PerMessageDeflate:
+    # without context takeover, so each message is compressed on its own, as the first
+    # message of a connection would be
+    policy = DEFAULT_COMPRESSION_POLICY
+    return PerMessageDeflate(
+        True, True, 15, 15, {"level": policy.level, "memLevel": policy.mem_level}
+    )
+
+
+def benchmark(iterations: int) -> list[BenchmarkResult]:
+    results = []
+    extension = _extension()
+    for name, message in sample_payloads().items():
+        frame = frames.Frame(frames.OP_TEXT, message.model_dump_json().encode())
+        compressed = extension.encode(frame)
+        assert extension.decode(compressed) == frame
+        results.append(
+            BenchmarkResult(
+                name=name,
+                size=len(frame.data),
+                compressed_size=len(compressed.data),
+                compress_us=_time_per_call_us(lambda: extension.encode(frame), iterations),
+                decompress_us=_time_per_call_us(lambda: extension.decode(compressed), iterations),
+            )
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=100)
+    args = parser.parse_args()
+
+    results = benchmark(args.iterations)
+    print(
+        f"{'message':<36} {'bytes':>7} {'deflate':>7} {'ratio':>6} "
+        f"{'compress':>10} {'decompress':>10}  "
+        + " ".join(f"{name + ' raw/deflate':>21}" for name in BANDWIDTHS)
+    )
+    for result in results:
+        transfers = " ".join(
+            f"{result.transfer_ms(bandwidth, False):>9.3f}/"
+            f"{result.transfer_ms(bandwidth, True):>8.3f}ms"
+            for bandwidth in BANDWIDTHS.values()
+        )
+        print(
+            f"{result.name:<36} {result.size:>7} {result.compressed_size:>7} "
+            f"{result.compressed_size / result.size:>6.2f} "
+            f"{result.compress_us:>8.2f}us {result.decompress_us:>8.2f}us  {transfers}"
+        )
+    print(
+        f"messages shorter than {DEFAULT_COMPRESSION_POLICY.threshold} bytes are sent "
+        "uncompressed by default"
+    )
+
+
+if __name__ == "__main__":
+    main()
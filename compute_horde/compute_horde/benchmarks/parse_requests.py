@@ -0,0 +1,287 @@
+"""
+Micro-benchmark of `BaseRequest.parse` for every message type of the protocols.
+
+    python -m compute_horde.benchmarks.parse_requests --iterations 10000
+
+Compares the single-pass parsing with a pydantic discriminated union over all the
+message types of a protocol, and with the previous parsing, which validated each message
+against the base class first and then again against the subclass.
+"""
+
+import argparse
+import datetime
+import functools
+import json
+import operator
+import timeit
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Annotated, Any
+
+import pydantic
+
+from ..base.output_upload import ZipAndHttpPostUpload
+from ..base.volume import InlineVolume, MultiVolume, VolumeType, ZipUrlVolume
+from ..base_requests import BaseRequest
+from ..em_protocol import executor_requests
+from ..em_protocol import miner_requests as em_miner_requests
+from ..executor_class import DEFAULT_EXECUTOR_CLASS
+from ..mv_protocol import miner_requests, validator_requests
+from ..utils import MachineSpecs
+
+JOB_UUID = "7b522ac1-aa4b-4e53-a0c7-1ae6a6e1b3f3"
+MINER_HOTKEY = "5Gpk5bNr9xvLMyGKZsRAXTnsyXtnVYnhNqcgyaSNmUwGZ8s3"
+VALIDATOR_HOTKEY = "5HBVrFGy6oYhhh71m9fFGYD7zbKyAeHnWN8i8s9fJTBMCtEE"
+SIGNATURE = "0x" + "ab" * 64
+NOW = datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC)
+SPECS = MachineSpecs(specs={"gpu": {"count": 1, "details": [{"name": "A6000"}]}, "cpu": 32})
+OUTPUT = "x" * 1024
+
+
+def _volume() -> MultiVolume:
+    return MultiVolume(
+        volumes=[
+            InlineVolume(contents="UEsFBgAAAAAAAAAAAAAAAAAAAAAAAA==", relative_path="input"),
+            ZipUrlVolume(contents="https://example.com/data.zip", relative_path="data"),
+        ]
+    )
+
+
+def _initial_job_request() -> validator_requests.V0InitialJobRequest:
+    return validator_requests.V0InitialJobRequest(
+        job_uuid=JOB_UUID,
+        executor_class=DEFAULT_EXECUTOR_CLASS,
+        base_docker_image_name="backenddevelopersltd/compute-horde-job:v0-latest",
+        timeout_seconds=60,
+        volume_type=VolumeType.multi_volume,
+    )
+
+
+def _job_request() -> validator_requests.V0JobRequest:
+    return validator_requests.V0JobRequest(
+        job_uuid=JOB_UUID,
+        executor_class=DEFAULT_EXECUTOR_CLASS,
+        docker_image_name="backenddevelopersltd/compute-horde-job:v0-latest",
+        docker_run_options_preset="nvidia_all",
+        docker_run_cmd=["python", "main.py", "--seed", "42"],
+        volume=_volume(),
+        output_upload=ZipAndHttpPostUpload(
+            url="https://example.com/upload", form_fields={"key": "value"}
+        ),
+    )
+
+
+def _job_finished_receipt() -> validator_requests.V0JobFinishedReceiptRequest:
+    return validator_requests.V0JobFinishedReceiptRequest(
+        payload=validator_requests.JobFinishedReceiptPayload(
+            job_uuid=JOB_UUID,
+            miner_hotkey=MINER_HOTKEY,
+            validator_hotkey=VALIDATOR_HOTKEY,
+            time_started=NOW,
+            time_took_us=12_345_678,
+            score_str="1.23",
+        ),
+        signature=SIGNATURE,
+    )
+
+
+def _job_started_receipt() -> validator_requests.V0JobStartedReceiptRequest:
+    return validator_requests.V0JobStartedReceiptRequest(
+        payload=validator_requests.JobStartedReceiptPayload(
+            job_uuid=JOB_UUID,
+            miner_hotkey=MINER_HOTKEY,
+            validator_hotkey=VALIDATOR_HOTKEY,
+            executor_class=DEFAULT_EXECUTOR_CLASS,
+            time_accepted=NOW,
+            max_timeout=60,
+        ),
+        signature=SIGNATURE,
+    )
+
+
+SAMPLE_MESSAGES: dict[type[BaseRequest], list[BaseRequest]] = {
+    miner_requests.BaseMinerRequest: [
+        miner_requests.V0AcceptJobRequest(job_uuid=JOB_UUID),
+        miner_requests.V0DeclineJobRequest(job_uuid=JOB_UUID),
+        miner_requests.V0ExecutorManifestRequest(
+            manifest=miner_requests.ExecutorManifest(
+                executor_classes=[
+                    miner_requests.ExecutorClassManifest(
+                        executor_class=DEFAULT_EXECUTOR_CLASS, count=8
+                    )
+                ]
+            )
+        ),
+        miner_requests.V0ExecutorReadyRequest(job_uuid=JOB_UUID),
+        miner_requests.V0ExecutorFailedRequest(job_uuid=JOB_UUID),
+        miner_requests.V0JobFailedRequest(
+            job_uuid=JOB_UUID,
+            docker_process_exit_status=1,
+            docker_process_stdout=OUTPUT,
+            docker_process_stderr=OUTPUT,
+        ),
+        miner_requests.V0JobFinishedRequest(
+            job_uuid=JOB_UUID, docker_process_stdout=OUTPUT, docker_process_stderr=OUTPUT
+        ),
+        miner_requests.V0MachineSpecsRequest(job_uuid=JOB_UUID, specs=SPECS),
+        miner_requests.GenericError(details="error"),
+        miner_requests.UnauthorizedError(
+            code=miner_requests.UnauthorizedErrorType.TOKEN_TOO_OLD, details="error"
+        ),
+    ],
+    validator_requests.BaseValidatorRequest: [
+        validator_requests.V0AuthenticateRequest(
+            payload=validator_requests.AuthenticationPayload(
+                validator_hotkey=VALIDATOR_HOTKEY, miner_hotkey=MINER_HOTKEY, timestamp=1704067200
+            ),
+            signature=SIGNATURE,
+        ),
+        _initial_job_request(),
+        _job_request(),
+        validator_requests.V0MachineSpecsRequest(job_uuid=JOB_UUID, specs=SPECS),
+        _job_finished_receipt(),
+        _job_started_receipt(),
+        validator_requests.V0InitialJobBatchRequest(jobs=[_initial_job_request()] * 8),
+        validator_requests.V0JobBatchRequest(jobs=[_job_request()] * 8),
+        validator_requests.V0ReceiptBatchRequest(
+            job_started_receipts=[_job_started_receipt()] * 8,
+            job_finished_receipts=[_job_finished_receipt()] * 8,
+        ),
+        validator_requests.GenericError(details="error"),
+    ],
+    em_miner_requests.BaseMinerRequest: [
+        em_miner_requests.V0InitialJobRequest(
+            job_uuid=JOB_UUID,
+            base_docker_image_name="backenddevelopersltd/compute-horde-job:v0-latest",
+            timeout_seconds=60,
+            volume_type=VolumeType.multi_volume,
+        ),
+        em_miner_requests.V0JobRequest(
+            job_uuid=JOB_UUID,
+            docker_image_name="backenddevelopersltd/compute-horde-job:v0-latest",
+            docker_run_options_preset="nvidia_all",
+            docker_run_cmd=["python", "main.py", "--seed", "42"],
+            volume=_volume(),
+        ),
+        em_miner_requests.GenericError(details="error"),
+    ],
+    executor_requests.BaseExecutorRequest: [
+        executor_requests.V0ReadyRequest(job_uuid=JOB_UUID),
+        executor_requests.V0FailedToPrepare(job_uuid=JOB_UUID),
+        executor_requests.V0FailedRequest(
+            job_uuid=JOB_UUID,
+            docker_process_exit_status=1,
+            timeout=False,
+            docker_process_stdout=OUTPUT,
+            docker_process_stderr=OUTPUT,
+        ),
+        executor_requests.V0MachineSpecsRequest(job_uuid=JOB_UUID, specs=SPECS),
+        executor_requests.V0FinishedRequest(
+            job_uuid=JOB_UUID, docker_process_stdout=OUTPUT, docker_process_stderr=OUTPUT
+        ),
+        executor_requests.GenericError(details="error"),
+    ],
+}
+
+
+def parse_two_pass(base_class: type[BaseRequest], str_: str) -> BaseRequest:
+    """
+    How `BaseRequest.parse` worked before, kept as the baseline.
+    """
+    json_ = json.loads(str_)
+    base_model_object = base_class.model_validate(json_)
+    target_model = base_class.type_to_model(base_model_object.message_type)
+    return target_model.model_validate(json_)
+
+
+def _get_message_type(value: Any) -> str | None:
+    message_type = value.get("message_type") if isinstance(value, dict) else None
+    return message_type if isinstance(message_type, str) else None
+
+
+@functools.cache
+def discriminated_union_adapter(base_class: type[BaseRequest]) -> pydantic.TypeAdapter:
+    """
+    The alternative to `BaseRequest.parse`, validating the raw json with a tagged union.
+
+    The message types are enums, not literals, so the union needs a callable discriminator.
+    pydantic has to convert the whole json to python objects to call it, which makes it
+    slower than decoding once and validating only the picked subclass.
+    """
+    union = functools.reduce(
+        operator.or_,
+        [
+            Annotated[model, pydantic.Tag(type_.value)]
+            for type_, model in base_class._request_type_mapping().items()
+        ],
+    )
+    return pydantic.TypeAdapter(Annotated[union, pydantic.Discriminator(_get_message_type)])
+
+
+@dataclass
+class BenchmarkResult:
+    base_class: type[BaseRequest]
+    message_type: str
+    size: int
+    single_pass_us: float
+    discriminated_union_us: float
+    two_pass_us: float
+
+
+def _time_per_call_us(func: Callable[[], object], iterations: int, repeat: int = 5) -> float:
+    # the best of a few runs, the rest is noise from the other processes
+    best = min(timeit.repeat(func, number=iterations, repeat=repeat))
+    return best / iterations * 1_000_000
+
+
+def benchmark(iterations: int) -> list[BenchmarkResult]:
+    results = []
+    for base_class, messages in SAMPLE_MESSAGES.items():
+        adapter = discriminated_union_adapter(base_class)
+        for message in messages:
+            raw = message.model_dump_json()
+            results.append(
+                BenchmarkResult(
+                    base_class=base_class,
+                    message_type=message.message_type.value,
+                    size=len(raw),
+                    single_pass_us=_time_per_call_us(lambda: base_class.parse(raw), iterations),
+                    discriminated_union_us=_time_per_call_us(
+                        lambda: adapter.validate_json(raw), iterations
+                    ),
+                    two_pass_us=_time_per_call_us(
+                        lambda: parse_two_pass(base_class, raw), iterations
+                    ),
+                )
+            )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=10_000)
+    args = parser.parse_args()
+
+    results = benchmark(args.iterations)
+    print(
+        f"{'message':<42} {'bytes':>6} {'single pass':>12} {'tagged union':>13} "
+        f"{'two pass':>12} {'speedup':>8}"
+    )
+    for result in results:
+        name = f"{result.base_class.__module__.split('.')[-2]}.{result.message_type}"
+        print(
+            f"{name:<42} {result.size:>6} {result.single_pass_us:>10.2f}us "
+            f"{result.discriminated_union_us:>11.2f}us {result.two_pass_us:>10.2f}us "
+            f"{result.two_pass_us / result.single_pass_us:>7.2f}x"
+        )
+    single_pass = sum(result.single_pass_us for result in results)
+    discriminated_union = sum(result.discriminated_union_us for result in results)
+    two_pass = sum(result.two_pass_us for result in results)
+    print(
+        f"{'total':<49} {single_pass:>10.2f}us {discriminated_union:>11.2f}us "
+        f"{two_pass:>10.2f}us {two_pass / single_pass:>7.2f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
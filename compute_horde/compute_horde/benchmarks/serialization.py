@@ -0,0 +1,135 @@
+"""
+Micro-benchmark of `compute_horde.serialization`.
+
+    python -m compute_horde.benchmarks.serialization --iterations 10000
+
+Compares writing every message type of the protocols with `model_dump_json` and with
+orjson, and the throughput of the serialization a synthetic job costs the validator
+running a batch and the miner consumer, before and after.
+"""
+
+import argparse
+import json
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from ..base_requests import BaseRequest
+from ..mv_protocol import miner_requests
+from ..serialization import model_dumps
+from ..utils import _json_dumps_default
+from .compression import sample_payloads
+from .parse_requests import (
+    JOB_UUID,
+    SAMPLE_MESSAGES,
+    _initial_job_request,
+    _job_finished_receipt,
+    _job_started_receipt,
+    _time_per_call_us,
+)
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    before_us: float
+    after_us: float
+
+
+def _blob_for_signing_before(payload) -> str:
+    return json.dumps(payload.model_dump(), sort_keys=True, default=_json_dumps_default)
+
+
+def _validator_batch_job(dump: Callable[[BaseRequest], str], blob: Callable) -> None:
+    """What serializing one job costs the validator running a synthetic jobs batch"""
+    started_receipt = _job_started_receipt()
+    finished_receipt = _job_finished_receipt()
+    dump(_initial_job_request())
+    dump(sample_payloads()["synthetic: job request"])
+    blob(started_receipt.payload)
+    dump(started_receipt)
+    blob(finished_receipt.payload)
+    dump(finished_receipt)
+
+
+def _miner_consumer_job(dump: Callable[[BaseRequest], str], blob: Callable) -> None:
+    """What serializing one job costs the miner consumer, including verifying the receipts"""
+    dump(miner_requests.V0AcceptJobRequest(job_uuid=JOB_UUID))
+    dump(miner_requests.V0ExecutorReadyRequest(job_uuid=JOB_UUID))
+    dump(sample_payloads()["synthetic: job finished"])
+    blob(_job_started_receipt().payload)
+    blob(_job_finished_receipt().payload)
+
+
+def benchmark(iterations: int) -> tuple[list[BenchmarkResult], list[BenchmarkResult]]:
+    messages = []
+    for base_class, samples in SAMPLE_MESSAGES.items():
+        for message in samples:
+            messages.append(
+                BenchmarkResult(
+                    name=f"{base_class.__module__.split('.')[-2]}.{message.message_type.value}",
+                    before_us=_time_per_call_us(message.model_dump_json, iterations),
+                    after_us=_time_per_call_us(lambda: model_dumps(message), iterations),
+                )
+            )
+
+    # the messages are built once, only their serialization is measured
+    jobs = []
+    for name, job in [
+        ("validator batch, per job", _validator_batch_job),
+        ("miner consumer, per job", _miner_consumer_job),
+    ]:
+        recorded: list[tuple[str, Any]] = []
+        job(
+            lambda model: recorded.append(("dump", model)),
+            lambda payload: recorded.append(("blob", payload)),
+        )
+
+        def before():
+            for kind, obj in recorded:
+                if kind == "dump":
+                    obj.model_dump_json()
+                else:
+                    _blob_for_signing_before(obj)
+
+        def after():
+            for kind, obj in recorded:
+                if kind == "dump":
+                    obj.serialize()
+                else:
+                    obj.blob_for_signing()
+
+        jobs.append(
+            BenchmarkResult(
+                name=name,
+                before_us=_time_per_call_us(before, max(iterations // 10, 1)),
+                after_us=_time_per_call_us(after, max(iterations // 10, 1)),
+            )
+        )
+    return messages, jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=10_000)
+    args = parser.parse_args()
+
+    messages, jobs = benchmark(args.iterations)
+    print(f"{'message':<42} {'model_dump_json':>15} {'orjson':>10} {'speedup':>8}")
+    for result in messages:
+        print(
+            f"{result.name:<42} {result.before_us:>13.2f}us {result.after_us:>8.2f}us "
+            f"{result.before_us / result.after_us:>7.2f}x"
+        )
+    print()
+    print(f"{'':<42} {'before':>15} {'after':>10} {'speedup':>8}")
+    for result in jobs:
+        print(
+            f"{result.name:<42} {1_000_000 / result.before_us:>9.0f} job/s "
+            f"{1_000_000 / result.after_us:>4.0f} job/s "
+            f"{result.before_us / result.after_us:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Micro-benchmark of the wire formats for every message type of the protocols.
+
+    python -m compute_horde.benchmarks.wire_format --iterations 10000
+
+Compares the size of the frames and the time to serialize and parse them as JSON and as
+msgpack, see `compute_horde.wire_format`.
+"""
+
+import argparse
+from dataclasses import dataclass
+
+from ..base_requests import BaseRequest
+from ..wire_format import WireFormat
+from .parse_requests import SAMPLE_MESSAGES, _time_per_call_us
+
+
+@dataclass
+class BenchmarkResult:
+    base_class: type[BaseRequest]
+    message_type: str
+    json_size: int
+    msgpack_size: int
+    json_serialize_us: float
+    msgpack_serialize_us: float
+    json_parse_us: float
+    msgpack_parse_us: float
+
+
+def benchmark(iterations: int) -> list[BenchmarkResult]:
+    results = []
+    for base_class, messages in SAMPLE_MESSAGES.items():
+        for message in messages:
+            json_frame = message.serialize(WireFormat.json)
+            msgpack_frame = message.serialize(WireFormat.msgpack)
+            results.append(
+                BenchmarkResult(
+                    base_class=base_class,
+                    message_type=message.message_type.value,
+                    json_size=len(json_frame),
+                    msgpack_size=len(msgpack_frame),
+                    json_serialize_us=_time_per_call_us(
+                        lambda: message.serialize(WireFormat.json), iterations
+                    ),
+                    msgpack_serialize_us=_time_per_call_us(
+                        lambda: message.serialize(WireFormat.msgpack), iterations
+                    ),
+                    json_parse_us=_time_per_call_us(
+                        lambda: base_class.parse(json_frame), iterations
+                    ),
+                    msgpack_parse_us=_time_per_call_us(
+                        lambda: base_class.parse(msgpack_frame), iterations
+                    ),
+                )
+            )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=10_000)
+    args = parser.parse_args()
+
+    results = benchmark(args.iterations)
+    print(
+        f"{'message':<42} {'json':>6} {'msgpack':>7} "
+        f"{'json out':>10} {'msgpack out':>11} {'json in':>10} {'msgpack in':>10}"
+    )
+    for result in results:
+        name = f"{result.base_class.__module__.split('.')[-2]}.{result.message_type}"
+        print(
+            f"{name:<42} {result.json_size:>6} {result.msgpack_size:>7} "
+            f"{result.json_serialize_us:>8.2f}us {result.msgpack_serialize_us:>9.2f}us "
+            f"{result.json_parse_us:>8.2f}us {result.msgpack_parse_us:>8.2f}us"
+        )
+    print(
+        f"{'total':<42} {sum(r.json_size for r in results):>6} "
+        f"{sum(r.msgpack_size for r in results):>7} "
+        f"{sum(r.json_serialize_us for r in results):>8.2f}us "
+        f"{sum(r.msgpack_serialize_us for r in results):>9.2f}us "
+        f"{sum(r.json_parse_us for r in results):>8.2f}us "
+        f"{sum(r.msgpack_parse_us for r in results):>8.2f}us"
+    )
+
+
+if __name__ == "__main__":
+    main()
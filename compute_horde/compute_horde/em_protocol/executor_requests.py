@@ -19,6 +19,8 @@ class BaseExecutorRequest(BaseRequest):
 
 class V0ReadyRequest(BaseExecutorRequest, JobMixin):
     message_type: RequestType = RequestType.V0ReadyRequest
+    # see compute_horde.wire_format
+    wire_format: str | None = None
 
 
 class V0FailedToPrepare(BaseExecutorRequest, JobMixin):
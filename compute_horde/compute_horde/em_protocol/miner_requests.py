@@ -23,6 +23,8 @@ class V0InitialJobRequest(BaseMinerRequest, JobMixin):
     base_docker_image_name: str | None = None
     timeout_seconds: int | None = None
     volume_type: VolumeType | None = None
+    # see compute_horde.wire_format
+    wire_formats: list[str] | None = None
 
 
 class V0JobRequest(BaseMinerRequest, JobMixin):
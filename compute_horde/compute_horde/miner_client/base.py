@@ -7,6 +7,7 @@ from typing import TypeAlias
 
 from compute_horde.base_requests import BaseRequest, ValidationError
 from compute_horde.transport import AbstractTransport, TransportConnectionError
+from compute_horde.wire_format import WireFormat
 
 logger = logging.getLogger(__name__)
 ErrorCallback: TypeAlias = Callable[[str], Awaitable[None]]
@@ -18,6 +19,8 @@ class AbstractMinerClient(metaclass=abc.ABCMeta):
         self.read_messages_task: asyncio.Task | None = None
         self.deferred_send_tasks: list[asyncio.Task] = []
         self.transport = transport
+        # JSON until the miner accepts another format, see compute_horde.wire_format
+        self.wire_format = WireFormat.json
 
     @abc.abstractmethod
     def miner_url(self) -> str: ...
@@ -78,7 +81,7 @@ class AbstractMinerClient(metaclass=abc.ABCMeta):
     async def send_model(
         self, model: BaseRequest, error_event_callback: ErrorCallback | None = None
     ) -> None:
-        await self.send(model.model_dump_json(), error_event_callback)
+        await self.send(model.serialize(self.wire_format), error_event_callback)
 
     async def send(
         self, data: str | bytes, error_event_callback: ErrorCallback | None = None
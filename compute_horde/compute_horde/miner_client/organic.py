@@ -43,7 +43,9 @@ from compute_horde.mv_protocol.validator_requests import (
     V0JobStartedReceiptRequest,
 )
 from compute_horde.transport import AbstractTransport, TransportConnectionError, WSTransport
+from compute_horde.transport.compression import DEFAULT_COMPRESSION_POLICY, CompressionPolicy
 from compute_horde.utils import MachineSpecs, Timer
+from compute_horde.wire_format import SUPPORTED_WIRE_FORMATS, accepted_wire_format
 
 logger = logging.getLogger(__name__)
 
@@ -78,6 +80,7 @@ class OrganicMinerClient(AbstractMinerClient):
         job_uuid: str,
         my_keypair: bittensor.Keypair,
         transport: AbstractTransport | None = None,
+        compression: CompressionPolicy = DEFAULT_COMPRESSION_POLICY,
     ) -> None:
         self.job_uuid = job_uuid
 
@@ -102,7 +105,7 @@ class OrganicMinerClient(AbstractMinerClient):
         self.miner_machine_specs: MachineSpecs | None = None
 
         name = f"{miner_hotkey}({miner_address}:{miner_port})"
-        transport = transport or WSTransport(name, self.miner_url())
+        transport = transport or WSTransport(name, self.miner_url(), compression=compression)
         super().__init__(name, transport)
 
     @cached_property
@@ -138,6 +141,7 @@ class OrganicMinerClient(AbstractMinerClient):
     async def handle_manifest_request(self, msg: V0ExecutorManifestRequest) -> None:
         try:
             self.miner_manifest.set_result(msg.manifest)
+            self.wire_format = accepted_wire_format(msg.wire_format)
         except asyncio.InvalidStateError:
             logger.warning(f"Received manifest from {msg} but future was already set")
 
@@ -193,7 +197,9 @@ class OrganicMinerClient(AbstractMinerClient):
             timestamp=int(time.time()),
         )
         return V0AuthenticateRequest(
-            payload=payload, signature=f"0x{self.my_keypair.sign(payload.blob_for_signing()).hex()}"
+            payload=payload,
+            signature=f"0x{self.my_keypair.sign(payload.blob_for_signing()).hex()}",
+            wire_formats=SUPPORTED_WIRE_FORMATS,
         )
 
     def generate_job_started_receipt_message(
@@ -282,7 +288,7 @@ class OrganicMinerClient(AbstractMinerClient):
 
     async def connect(self) -> None:
         await super().connect()
-        await self.transport.send(self.generate_authentication_message().model_dump_json())
+        await self.transport.send(self.generate_authentication_message().serialize())
 
 
 class FailureReason(enum.Enum):
@@ -75,6 +75,10 @@ class V0MachineSpecsRequest(BaseMinerRequest, JobMixin):
 class V0ExecutorManifestRequest(BaseMinerRequest):
     message_type: RequestType = RequestType.V0ExecutorManifestRequest
     manifest: ExecutorManifest
+    # see compute_horde.wire_format
+    wire_format: str | None = None
+    # the miner handles V0InitialJobBatchRequest, V0JobBatchRequest and V0ReceiptBatchRequest
+    batch_requests: bool = False
 
 
 class GenericError(BaseMinerRequest):
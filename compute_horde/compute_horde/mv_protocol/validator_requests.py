@@ -1,6 +1,5 @@
 import datetime
 import enum
-import json
 import re
 from typing import Self
 
@@ -11,7 +10,8 @@ from ..base.output_upload import OutputUpload  # noqa
 from ..base.volume import Volume, VolumeType
 from ..base_requests import BaseRequest, JobMixin
 from ..executor_class import ExecutorClass
-from ..utils import MachineSpecs, _json_dumps_default
+from ..serialization import signing_blob
+from ..utils import MachineSpecs
 
 SAFE_DOMAIN_REGEX = re.compile(r".*")
 
@@ -23,6 +23,9 @@ class RequestType(enum.Enum):
     V0JobRequest = "V0JobRequest"
     V0JobFinishedReceiptRequest = "V0JobFinishedReceiptRequest"
     V0JobStartedReceiptRequest = "V0JobStartedReceiptRequest"
+    V0InitialJobBatchRequest = "V0InitialJobBatchRequest"
+    V0JobBatchRequest = "V0JobBatchRequest"
+    V0ReceiptBatchRequest = "V0ReceiptBatchRequest"
     GenericError = "GenericError"
 
 
@@ -36,14 +39,16 @@ class AuthenticationPayload(pydantic.BaseModel):
     timestamp: int
 
     def blob_for_signing(self):
-        # pydantic v2 does not support sort_keys anymore.
-        return json.dumps(self.model_dump(), sort_keys=True)
+        # the fields are plain values, __dict__ is what model_dump() would give
+        return signing_blob(self.__dict__)
 
 
 class V0AuthenticateRequest(BaseValidatorRequest):
     message_type: RequestType = RequestType.V0AuthenticateRequest
     payload: AuthenticationPayload
     signature: str
+    # see compute_horde.wire_format
+    wire_formats: list[str] | None = None
 
     def blob_for_signing(self):
         return self.payload.blob_for_signing()
@@ -90,8 +95,9 @@ class ReceiptPayload(pydantic.BaseModel):
     validator_hotkey: str
 
     def blob_for_signing(self):
-        # pydantic v2 does not support sort_keys anymore.
-        return json.dumps(self.model_dump(), sort_keys=True, default=_json_dumps_default)
+        # the fields are plain values, __dict__ is what model_dump() would give, with the
+        # datetimes in ISO format like their serializers write them
+        return signing_blob(self.__dict__)
 
 
 class JobFinishedReceiptPayload(ReceiptPayload):
@@ -138,3 +144,23 @@ class V0JobStartedReceiptRequest(BaseValidatorRequest):
 
     def blob_for_signing(self):
         return self.payload.blob_for_signing()
+
+
+# Batches of the requests above, sent only to the miners which advertise
+# `V0ExecutorManifestRequest.batch_requests`. The miner answers each job separately.
+
+
+class V0InitialJobBatchRequest(BaseValidatorRequest):
+    message_type: RequestType = RequestType.V0InitialJobBatchRequest
+    jobs: list[V0InitialJobRequest]
+
+
+class V0JobBatchRequest(BaseValidatorRequest):
+    message_type: RequestType = RequestType.V0JobBatchRequest
+    jobs: list[V0JobRequest]
+
+
+class V0ReceiptBatchRequest(BaseValidatorRequest):
+    message_type: RequestType = RequestType.V0ReceiptBatchRequest
+    job_started_receipts: list[V0JobStartedReceiptRequest] = []
+    job_finished_receipts: list[V0JobFinishedReceiptRequest] = []
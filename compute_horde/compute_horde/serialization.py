@@ -0,0 +1,64 @@
+"""
+Fast serialization of the protocol messages and of the blobs they are signed with.
+
+`model_dumps` writes a pydantic model as JSON with orjson. It is the same JSON as
+`model_dump_json` gives, except datetimes, which are written like `datetime.isoformat`.
+Messages with long strings, such as job requests with inline volumes, are written much
+faster than with `model_dump_json`.
+
+`signing_blob` must stay byte-compatible with the `json.dumps(..., sort_keys=True)` the
+blobs were always signed with, or signatures of the other side wouldn't verify.
+"""
+
+import datetime
+import json
+from collections.abc import Mapping
+from typing import Any
+
+import orjson
+import pydantic
+
+from .utils import _json_dumps_default
+
+# the values orjson writes the same way as json.dumps, floats are written differently
+_PLAIN_TYPES = (str, int, datetime.datetime)
+
+
+def _orjson_default(obj: Any) -> Any:
+    if isinstance(obj, pydantic.BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Cannot serialize {type(obj).__name__} to JSON")
+
+
+def dumps(obj: Any) -> bytes:
+    return orjson.dumps(obj, default=_orjson_default)
+
+
+def model_dumps(model: pydantic.BaseModel) -> str:
+    return orjson.dumps(model.model_dump(), default=_orjson_default).decode()
+
+
+def signing_blob(data: Mapping[str, Any]) -> str:
+    """
+    Exactly `json.dumps(data, sort_keys=True, default=_json_dumps_default)`, faster.
+
+    orjson writes the same JSON for flat mappings of strings, ints, bools, Nones and
+    datetimes, only without the spaces after the separators. They are added back if the
+    strings are printable ASCII and no string is mistaken for a separator, otherwise
+    json.dumps writes it.
+    """
+    if all(value is None or isinstance(value, _PLAIN_TYPES) for value in data.values()):
+        try:
+            blob = orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+        except orjson.JSONEncodeError:
+            pass
+        else:
+            if (
+                blob.isascii()
+                and b"\\" not in blob
+                and b"\x7f" not in blob
+                and blob.count(b'":') == len(data)
+                and blob.count(b',"') == len(data) - 1
+            ):
+                return blob.replace(b'":', b'": ').replace(b',"', b', "').decode()
+    return json.dumps(data, sort_keys=True, default=_json_dumps_default)
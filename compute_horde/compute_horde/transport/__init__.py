@@ -1,9 +1,11 @@
 from .base import AbstractTransport, TransportConnectionError
+from .compression import CompressionPolicy
 from .stub import StubTransport
 from .ws import WSTransport
 
 __all__ = [
     "AbstractTransport",
+    "CompressionPolicy",
     "TransportConnectionError",
     "WSTransport",
     "StubTransport",
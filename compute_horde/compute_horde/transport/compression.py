@@ -0,0 +1,99 @@
+"""
+permessage-deflate (RFC 7692) of the websocket connections, with a size threshold.
+
+Compressing every message costs CPU time and latency on the small control messages, which
+gain nothing from it. Messages shorter than `CompressionPolicy.threshold` are sent
+uncompressed, which the extension allows per message, the peer decompresses only the
+messages marked as compressed. The large ones, job outputs and inline volumes, are
+compressed.
+
+The compression is used only if the peer accepts the extension during the handshake.
+"""
+
+import dataclasses
+import zlib
+from collections.abc import Sequence
+from typing import Any
+
+from websockets import frames
+from websockets.extensions.base import ClientExtensionFactory, Extension
+from websockets.extensions.permessage_deflate import (
+    ClientPerMessageDeflateFactory,
+    PerMessageDeflate,
+)
+from websockets.typing import ExtensionParameter
+
+
+@dataclasses.dataclass(frozen=True)
+class CompressionPolicy:
+    enabled: bool = True
+    # messages shorter than this, in bytes, are sent uncompressed; with None all the sent
+    # messages are uncompressed, only the received ones can be compressed
+    threshold: int | None = 1024
+    level: int = zlib.Z_DEFAULT_COMPRESSION
+    # what websockets uses by default, much less memory than zlib's default of 8
+    mem_level: int = 5
+
+    def client_extensions(self) -> list[ClientExtensionFactory] | None:
+        if not self.enabled:
+            # not an empty list, websockets would send an empty extensions header
+            return None
+        return [ThresholdClientPerMessageDeflateFactory(self)]
+
+    def connect_kwargs(self) -> dict[str, Any]:
+        """
+        The arguments of `websockets.connect` setting up the compression of the connection.
+        """
+        return {"compression": None, "extensions": self.client_extensions()}
+
+
+DEFAULT_COMPRESSION_POLICY = CompressionPolicy()
+NO_COMPRESSION_POLICY = CompressionPolicy(enabled=False)
+
+
+class ThresholdPerMessageDeflate(PerMessageDeflate):
+    """
+    `PerMessageDeflate` which sends the messages shorter than the threshold uncompressed.
+    """
+
+    def __init__(self, *args: Any, threshold: int | None, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.threshold = threshold
+        # the continuation frames of a message sent uncompressed are sent uncompressed too
+        self.skip_cont_data = False
+
+    def encode(self, frame: frames.Frame) -> frames.Frame:
+        if frame.opcode in frames.CTRL_OPCODES:
+            return frame
+        if frame.opcode is frames.OP_CONT:
+            if self.skip_cont_data:
+                if frame.fin:
+                    self.skip_cont_data = False
+                return frame
+        elif self.threshold is None or len(frame.data) < self.threshold:
+            self.skip_cont_data = not frame.fin
+            return frame
+        return super().encode(frame)
+
+
+class ThresholdClientPerMessageDeflateFactory(ClientPerMessageDeflateFactory):
+    def __init__(self, policy: CompressionPolicy) -> None:
+        super().__init__(
+            compress_settings={"level": policy.level, "memLevel": policy.mem_level},
+        )
+        self.threshold = policy.threshold
+
+    def process_response_params(
+        self,
+        params: Sequence[ExtensionParameter],
+        accepted_extensions: Sequence[Extension],
+    ) -> PerMessageDeflate:
+        extension = super().process_response_params(params, accepted_extensions)
+        return ThresholdPerMessageDeflate(
+            extension.remote_no_context_takeover,
+            extension.local_no_context_takeover,
+            extension.remote_max_window_bits,
+            extension.local_max_window_bits,
+            extension.compress_settings,
+            threshold=self.threshold,
+        )
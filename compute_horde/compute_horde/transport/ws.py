@@ -1,10 +1,14 @@
 import asyncio
+import collections
 import logging
 import random
+import time
+from collections.abc import Callable
 
 import websockets
 
 from .base import AbstractTransport, TransportConnectionError
+from .compression import DEFAULT_COMPRESSION_POLICY, CompressionPolicy
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +40,16 @@ class WSTransport(AbstractTransport):
         print(message)
     ```
     await transport.stop()
+
+    Sent messages are queued and written by a background task, which writes all the
+    messages queued in the meantime together, in the order they were sent. `send` only
+    waits when `max_queued_frames` messages are already waiting, use `flush` to wait until
+    the messages are written. Errors of the writer are raised by the next `send` or
+    `flush`. `stop` writes the queued messages before closing the connection.
+
+    Messages are compressed with permessage-deflate if the other side supports it, except
+    the ones shorter than the threshold of the `compression` policy, see
+    `compute_horde.transport.compression`.
     """
 
     def __init__(
@@ -46,6 +60,10 @@ class WSTransport(AbstractTransport):
         max_retries: int = 5,
         base_retry_delay: int = 1,
         retry_jitter: float = 1,
+        max_queued_frames: int = 256,
+        stop_flush_timeout: float = 5,
+        on_flush: Callable[[int, float], None] | None = None,
+        compression: CompressionPolicy = DEFAULT_COMPRESSION_POLICY,
     ):
         super().__init__(name)
         self.url = url
@@ -54,6 +72,23 @@ class WSTransport(AbstractTransport):
         self.max_retries = max_retries
         self.connect_lock = asyncio.Lock()
         self._ws = None
+        self.compression = compression
+
+        self.max_queued_frames = max_queued_frames
+        self.stop_flush_timeout = stop_flush_timeout
+        # called with the number of frames written together and the time
+        # the oldest of them waited in the queue, in seconds
+        self.on_flush = on_flush
+        self.last_flush_latency: float | None = None
+        # frames waiting for the writer, with the time they were queued
+        self._outbox: collections.deque[tuple[str | bytes, float]] = collections.deque()
+        self._outbox_ready = asyncio.Event()
+        self._outbox_empty = asyncio.Event()
+        self._outbox_empty.set()
+        self._below_high_water = asyncio.Event()
+        self._below_high_water.set()
+        self._writer_task: asyncio.Task | None = None
+        self._writer_error: Exception | None = None
 
     @property
     def ws(self) -> websockets.WebSocketClientProtocol:
@@ -64,12 +99,24 @@ class WSTransport(AbstractTransport):
     def _get_retry_delay(self, attempt: int):
         return self.base_retry_delay * 2**attempt + random.uniform(0, self.retry_jitter)
 
+    @property
+    def queue_depth(self) -> int:
+        return len(self._outbox)
+
     async def start(self) -> None:
         async with self.connect_lock:
+            self._writer_error = None
             await self.connect()
 
     async def stop(self) -> None:
         async with self.connect_lock:
+            if self._outbox and self._ws and self._ws.open:
+                try:
+                    async with asyncio.timeout(self.stop_flush_timeout):
+                        await self._outbox_empty.wait()
+                except TimeoutError:
+                    logger.info(f"Dropping {len(self._outbox)} msgs to {self.name} on stop")
+            await self._stop_writer()
             if self._ws and self._ws.open:
                 await self._ws.close()
 
@@ -83,7 +130,11 @@ class WSTransport(AbstractTransport):
 
         while self.max_retries == 0 or attempt < self.max_retries:
             try:
-                self._ws = await websockets.connect(self.url, max_size=50 * (2**20))  # 50MB
+                self._ws = await websockets.connect(
+                    self.url,
+                    max_size=50 * (2**20),  # 50MB
+                    **self.compression.connect_kwargs(),
+                )
                 logger.info(f"Connected to {self.name} after {attempt} attempts")
                 return
             except (websockets.WebSocketException, OSError):
@@ -99,18 +150,86 @@ class WSTransport(AbstractTransport):
         )
 
     async def send(self, data: str | bytes) -> None:
+        self._raise_writer_error()
+        while len(self._outbox) >= self.max_queued_frames:
+            self._below_high_water.clear()
+            await self._below_high_water.wait()
+            self._raise_writer_error()
+
+        self._outbox.append((data, time.monotonic()))
+        self._outbox_empty.clear()
+        self._outbox_ready.set()
+        if self._writer_task is None or self._writer_task.done():
+            self._writer_task = asyncio.create_task(self._write_outbox())
+
+    async def flush(self) -> None:
+        """
+        Wait until all the queued messages are written.
+        """
+        await self._outbox_empty.wait()
+        self._raise_writer_error()
+
+    def _raise_writer_error(self) -> None:
+        if self._writer_error is not None:
+            error, self._writer_error = self._writer_error, None
+            raise error
+
+    async def _write_outbox(self) -> None:
+        while True:
+            await self._outbox_ready.wait()
+            oldest_queued_at = self._outbox[0][1]
+            frames = 0
+            try:
+                # ws.send doesn't yield to the event loop unless the socket buffer is full,
+                # so everything queued so far goes out back to back
+                while self._outbox:
+                    await self._write(self._outbox[0][0])
+                    self._outbox.popleft()
+                    frames += 1
+                    if len(self._outbox) < self.max_queued_frames:
+                        self._below_high_water.set()
+            except Exception as exc:
+                logger.info(f"Dropping {len(self._outbox)} msgs to {self.name}: {exc!r}")
+                self._writer_error = exc
+                self._clear_outbox()
+                return
+
+            self._outbox_ready.clear()
+            self._outbox_empty.set()
+            self.last_flush_latency = time.monotonic() - oldest_queued_at
+            if self.on_flush is not None:
+                self.on_flush(frames, self.last_flush_latency)
+            # a single yield for the whole batch, so that other tasks get to run
+            # Summary: https://github.com/python-websockets/websockets/issues/867
+            # Longer discussion: https://github.com/python-websockets/websockets/issues/865
+            await asyncio.sleep(0)
+
+    async def _write(self, data: str | bytes) -> None:
         while True:
             try:
                 await self.ws.send(data)
-                await asyncio.sleep(0)
-                # Summary: https://github.com/python-websockets/websockets/issues/867
-                # Longer discussion: https://github.com/python-websockets/websockets/issues/865
                 # logger.debug(f"Sent message to {self.name}: {data}")
                 return
             except (websockets.WebSocketException, OSError):
                 logger.info(f"Could not send msg to {self.name}. Reconnecting...")
                 await self.connect()
 
+    def _clear_outbox(self) -> None:
+        self._outbox.clear()
+        self._outbox_ready.clear()
+        self._outbox_empty.set()
+        self._below_high_water.set()
+
+    async def _stop_writer(self) -> None:
+        if self._writer_task is not None and not self._writer_task.done():
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+        self._writer_task = None
+        self._clear_outbox()
+
     async def receive(self) -> str | bytes:
         while True:
             try:
@@ -0,0 +1,71 @@
+"""
+Encodings of the protocol messages on the wire.
+
+JSON text frames are what every peer understands. msgpack binary frames are used once both
+sides agreed on them: the validator offers the formats it supports in
+`V0AuthenticateRequest.wire_formats` and the miner picks one in
+`V0ExecutorManifestRequest.wire_format`, the miner and the executor do the same with
+`V0InitialJobRequest.wire_formats` and `V0ReadyRequest.wire_format` of em_protocol. Peers
+which don't know the fields ignore them and keep using JSON.
+
+Decoding doesn't depend on the negotiation, the format of each frame is detected.
+"""
+
+import datetime
+import enum
+from typing import Any
+
+import msgpack
+
+
+class WireFormat(enum.StrEnum):
+    json = "json"
+    msgpack = "msgpack"
+
+
+# in the order of preference
+SUPPORTED_WIRE_FORMATS = [WireFormat.msgpack, WireFormat.json]
+
+# serialization context of the fields which are sent as raw bytes in binary formats,
+# instead of base64 strings, see InlineVolume
+BINARY_CONTEXT = {"binary": True}
+
+
+def choose_wire_format(offered: list[str] | None) -> WireFormat:
+    """
+    The most preferred of the supported formats the other side offered.
+    """
+    for wire_format in SUPPORTED_WIRE_FORMATS:
+        if offered and wire_format.value in offered:
+            return wire_format
+    return WireFormat.json
+
+
+def accepted_wire_format(chosen: str | None) -> WireFormat:
+    """
+    The format the other side picked from the ones offered, JSON if it didn't pick any.
+    """
+    if chosen in SUPPORTED_WIRE_FORMATS:
+        return WireFormat(chosen)
+    return WireFormat.json
+
+
+def is_msgpack(data: str | bytes) -> bool:
+    # JSON messages are always objects, a msgpack map never starts with "{"
+    return isinstance(data, bytes) and data[:1] != b"{"
+
+
+def _msgpack_default(obj: Any) -> Any:
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    if isinstance(obj, datetime.datetime | datetime.date):
+        return obj.isoformat()
+    raise TypeError(f"Cannot serialize {type(obj).__name__} to msgpack")
+
+
+def msgpack_dumps(obj: Any) -> bytes:
+    return msgpack.packb(obj, default=_msgpack_default)
+
+
+def msgpack_loads(data: bytes) -> Any:
+    return msgpack.unpackb(data)
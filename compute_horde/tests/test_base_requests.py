@@ -0,0 +1,51 @@
+import pytest
+
+from compute_horde.base_requests import ValidationError
+from compute_horde.benchmarks.parse_requests import SAMPLE_MESSAGES, benchmark, parse_two_pass
+from compute_horde.mv_protocol.miner_requests import BaseMinerRequest
+
+SAMPLES = [
+    pytest.param(base_class, message, id=f"{base_class.__module__}.{message.message_type.value}")
+    for base_class, messages in SAMPLE_MESSAGES.items()
+    for message in messages
+]
+
+
+@pytest.mark.parametrize("base_class", SAMPLE_MESSAGES)
+def test_samples_cover_every_message_type(base_class):
+    assert {message.message_type for message in SAMPLE_MESSAGES[base_class]} == set(
+        base_class._request_type_mapping()
+    )
+
+
+@pytest.mark.parametrize("base_class, message", SAMPLES)
+def test_parse(base_class, message):
+    raw = message.model_dump_json()
+
+    for parsed in (base_class.parse(raw), base_class.parse(raw.encode())):
+        assert type(parsed) is type(message)
+        assert parsed == message
+    assert base_class.parse(raw) == parse_two_pass(base_class, raw)
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        "{",
+        "[]",
+        "{}",
+        '{"message_type": []}',
+        '{"message_type": "V0UnknownRequest"}',
+        '{"message_type": "V0AcceptJobRequest"}',
+        '{"message_type": "V0AcceptJobRequest", "job_uuid": 1}',
+    ],
+)
+def test_parse_invalid(raw):
+    with pytest.raises(ValidationError):
+        BaseMinerRequest.parse(raw)
+
+
+def test_benchmark():
+    results = benchmark(iterations=1)
+
+    assert len(results) == sum(len(messages) for messages in SAMPLE_MESSAGES.values())
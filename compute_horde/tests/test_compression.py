@@ -0,0 +1,48 @@
+import pytest
+from websockets import frames
+from websockets.extensions.permessage_deflate import PerMessageDeflate
+
+from compute_horde.benchmarks.compression import benchmark, sample_payloads
+from compute_horde.transport.compression import ThresholdPerMessageDeflate
+
+
+def _extensions(threshold: int | None) -> tuple[ThresholdPerMessageDeflate, PerMessageDeflate]:
+    encoder = ThresholdPerMessageDeflate(False, False, 15, 15, threshold=threshold)
+    decoder = PerMessageDeflate(False, False, 15, 15)
+    return encoder, decoder
+
+
+@pytest.mark.parametrize(
+    "threshold, compressed",
+    [(0, [True, True]), (64, [False, True]), (None, [False, False])],
+)
+def test_threshold(threshold, compressed):
+    encoder, decoder = _extensions(threshold)
+    sent = [frames.Frame(frames.OP_TEXT, b"foo"), frames.Frame(frames.OP_TEXT, b"foo" * 100)]
+
+    encoded = [encoder.encode(frame) for frame in sent]
+
+    assert [frame.rsv1 for frame in encoded] == compressed
+    assert [decoder.decode(frame) for frame in encoded] == sent
+
+
+def test_continuation_frames_of_uncompressed_message_are_not_compressed():
+    encoder, decoder = _extensions(64)
+    sent = [
+        frames.Frame(frames.OP_TEXT, b"foo", fin=False),
+        frames.Frame(frames.OP_CONT, b"foo" * 100),
+        frames.Frame(frames.OP_TEXT, b"foo" * 100),
+    ]
+
+    encoded = [encoder.encode(frame) for frame in sent]
+
+    assert encoded[:2] == sent[:2]
+    assert encoded[2].rsv1
+    assert [decoder.decode(frame) for frame in encoded] == sent
+
+
+def test_benchmark():
+    results = benchmark(iterations=1)
+
+    assert len(results) == len(sample_payloads())
+    assert all(result.compressed_size < result.size for result in results if result.size > 1024)
@@ -0,0 +1,77 @@
+import datetime
+import json
+
+import pytest
+
+from compute_horde.benchmarks.parse_requests import (
+    SAMPLE_MESSAGES,
+    _job_finished_receipt,
+    _job_started_receipt,
+)
+from compute_horde.benchmarks.serialization import benchmark
+from compute_horde.executor_class import DEFAULT_EXECUTOR_CLASS
+from compute_horde.mv_protocol.validator_requests import AuthenticationPayload
+from compute_horde.serialization import model_dumps, signing_blob
+from compute_horde.utils import _json_dumps_default
+
+SAMPLES = [
+    pytest.param(base_class, message, id=f"{base_class.__module__}.{message.message_type.value}")
+    for base_class, messages in SAMPLE_MESSAGES.items()
+    for message in messages
+]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {},
+        {"a": "b"},
+        {"b": 1, "a": None, "c": True, "d": False},
+        {"unicode": "zażółć", "emoji": "\U0001f600"},
+        {"quote": 'a"b', "backslash": "a\\b", "newline": "a\nb", "tab": "\t", "del": "\x7f"},
+        {"colon": '":', "comma": ',"', "both": '", "a": "'},
+        {"float": 1.0, "small": 1e-7, "big": 1e20},
+        {"big_int": 2**70, "negative": -1},
+        {"nested": {"b": 1, "a": [1, "x"]}},
+        {"executor_class": DEFAULT_EXECUTOR_CLASS},
+        {
+            "naive": datetime.datetime(2024, 1, 2, 3, 4, 5, 6),
+            "aware": datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.UTC),
+            "offset": datetime.datetime(
+                2024, 1, 2, tzinfo=datetime.timezone(datetime.timedelta(hours=2))
+            ),
+        },
+        {"z": 1, "a": 2, "m": 3},
+    ],
+)
+def test_signing_blob_is_json_dumps(data):
+    assert signing_blob(data) == json.dumps(data, sort_keys=True, default=_json_dumps_default)
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        _job_started_receipt().payload,
+        _job_finished_receipt().payload,
+        AuthenticationPayload(validator_hotkey="v", miner_hotkey="m", timestamp=1_700_000_000),
+    ],
+)
+def test_blob_for_signing_is_unchanged(payload):
+    assert payload.blob_for_signing() == json.dumps(
+        payload.model_dump(), sort_keys=True, default=_json_dumps_default
+    )
+
+
+@pytest.mark.parametrize("base_class, message", SAMPLES)
+def test_model_dumps_round_trip(base_class, message):
+    assert json.loads(model_dumps(message)) == json.loads(message.model_dump_json())
+    assert base_class.parse(model_dumps(message)) == message
+
+
+def test_benchmark():
+    messages, jobs = benchmark(iterations=1)
+    assert len(messages) == len(SAMPLES)
+    assert [result.name for result in jobs] == [
+        "validator batch, per job",
+        "miner consumer, per job",
+    ]
@@ -3,8 +3,10 @@ import asyncio
 import pytest
 import pytest_asyncio
 import websockets
+from websockets import frames
 
-from compute_horde.transport import WSTransport
+from compute_horde.transport import CompressionPolicy, WSTransport
+from compute_horde.transport.compression import ThresholdPerMessageDeflate
 
 
 class WSTestServer:
@@ -92,10 +94,123 @@ async def test_send_reconnect(server: WSTestServer, ws_transport: WSTransport):
     await asyncio.sleep(0.1)
     await server.start()
     await send_task
+    await ws_transport.flush()
 
     assert await asyncio.wait_for(server.received.get(), 0.2) == "foo"
 
 
+@pytest.mark.asyncio
+async def test_send_coalesces_queued_messages(server: WSTestServer, ws_transport: WSTransport):
+    flushes = []
+    ws_transport.on_flush = lambda frames, latency: flushes.append(frames)
+    await ws_transport.start()
+
+    for i in range(10):
+        await ws_transport.send(str(i))
+    assert ws_transport.queue_depth == 10
+    await ws_transport.flush()
+
+    assert ws_transport.queue_depth == 0
+    assert flushes == [10]
+    assert ws_transport.last_flush_latency is not None
+    for i in range(10):
+        assert await asyncio.wait_for(server.received.get(), 0.2) == str(i)
+
+
+@pytest.mark.asyncio
+async def test_send_backpressure(server: WSTestServer, ws_transport: WSTransport):
+    ws_transport.max_queued_frames = 2
+    await ws_transport.start()
+    writes_allowed = asyncio.Event()
+    write = ws_transport._write
+
+    async def held_write(data):
+        await writes_allowed.wait()
+        await write(data)
+
+    ws_transport._write = held_write
+
+    await ws_transport.send("foo")
+    await ws_transport.send("bar")
+    third_send = asyncio.create_task(ws_transport.send("baz"))
+    await asyncio.sleep(0.05)
+    assert not third_send.done()
+
+    writes_allowed.set()
+    await asyncio.wait_for(third_send, 0.2)
+    await ws_transport.flush()
+    for expected in ("foo", "bar", "baz"):
+        assert await asyncio.wait_for(server.received.get(), 0.2) == expected
+
+
+@pytest.mark.asyncio
+async def test_send_error_is_raised_by_flush(ws_transport: WSTransport):
+    await ws_transport.send("foo")
+
+    with pytest.raises(RuntimeError):
+        await ws_transport.flush()
+    assert ws_transport.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_stop_writes_queued_messages(server: WSTestServer, ws_transport: WSTransport):
+    await ws_transport.start()
+
+    await ws_transport.send("foo")
+    await ws_transport.send("bar")
+    await ws_transport.stop()
+
+    assert await asyncio.wait_for(server.received.get(), 0.2) == "foo"
+    assert await asyncio.wait_for(server.received.get(), 0.2) == "bar"
+
+
+@pytest.mark.asyncio
+async def test_send_compresses_messages_above_threshold(server: WSTestServer):
+    ws_transport = WSTransport(
+        "test",
+        f"ws://{WSTestServer.host}:{WSTestServer.port}",
+        compression=CompressionPolicy(threshold=64),
+    )
+    await ws_transport.start()
+    (extension,) = ws_transport._ws.extensions
+    assert isinstance(extension, ThresholdPerMessageDeflate)
+    encoded: list[frames.Frame] = []
+    encode = extension.encode
+
+    def spy_encode(frame: frames.Frame) -> frames.Frame:
+        encoded_frame = encode(frame)
+        if frame.opcode is frames.OP_TEXT:
+            encoded.append(encoded_frame)
+        return encoded_frame
+
+    extension.encode = spy_encode
+    large = "foo" * 1000
+
+    await ws_transport.send("foo")
+    await ws_transport.send(large)
+    await ws_transport.flush()
+
+    assert await asyncio.wait_for(server.received.get(), 0.2) == "foo"
+    assert await asyncio.wait_for(server.received.get(), 0.2) == large
+    assert [frame.rsv1 for frame in encoded] == [False, True]
+    assert len(encoded[1].data) < len(large) / 10
+    await ws_transport.stop()
+
+
+@pytest.mark.asyncio
+async def test_compression_can_be_disabled(server: WSTestServer):
+    ws_transport = WSTransport(
+        "test",
+        f"ws://{WSTestServer.host}:{WSTestServer.port}",
+        compression=CompressionPolicy(enabled=False),
+    )
+    await ws_transport.start()
+
+    assert ws_transport._ws.extensions == []
+    assert server.connection.extensions == []
+    await ws_transport.stop()
+
+
 @pytest.mark.asyncio
 async def test_receive(server: WSTestServer, ws_transport: WSTransport):
     await ws_transport.start()
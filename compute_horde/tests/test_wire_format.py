@@ -0,0 +1,116 @@
+import base64
+
+import msgpack
+import pytest
+
+from compute_horde.base.volume import InlineVolume
+from compute_horde.base_requests import ValidationError
+from compute_horde.benchmarks.parse_requests import SAMPLE_MESSAGES
+from compute_horde.benchmarks.wire_format import benchmark
+from compute_horde.mv_protocol.validator_requests import BaseValidatorRequest, V0JobRequest
+from compute_horde.wire_format import (
+    WireFormat,
+    accepted_wire_format,
+    choose_wire_format,
+    is_msgpack,
+)
+
+SAMPLES = [
+    pytest.param(base_class, message, id=f"{base_class.__module__}.{message.message_type.value}")
+    for base_class, messages in SAMPLE_MESSAGES.items()
+    for message in messages
+]
+
+
+@pytest.mark.parametrize("base_class, message", SAMPLES)
+def test_msgpack_round_trip(base_class, message):
+    frame = message.serialize(WireFormat.msgpack)
+
+    assert isinstance(frame, bytes)
+    assert is_msgpack(frame)
+    parsed = base_class.parse(frame)
+    assert type(parsed) is type(message)
+    assert parsed == message
+
+
+@pytest.mark.parametrize("base_class, message", SAMPLES)
+def test_json_is_the_default(base_class, message):
+    assert message.serialize() == message.model_dump_json()
+    assert not is_msgpack(message.serialize())
+    assert not is_msgpack(message.serialize().encode())
+
+
+def test_inline_volume_travels_as_bytes():
+    contents = bytes(range(256)) * 4
+    request = V0JobRequest(
+        job_uuid="7b522ac1-aa4b-4e53-a0c7-1ae6a6e1b3f3",
+        docker_image_name="backenddevelopersltd/compute-horde-job:v0-latest",
+        docker_run_options_preset="none",
+        docker_run_cmd=[],
+        volume=InlineVolume(contents=base64.b64encode(contents).decode()),
+    )
+
+    frame = request.serialize(WireFormat.msgpack)
+
+    assert msgpack.unpackb(frame)["volume"]["contents"] == contents
+    assert len(frame) < len(request.serialize(WireFormat.json)) * 0.8
+    assert BaseValidatorRequest.parse(frame) == request
+
+
+@pytest.mark.parametrize("contents", ["not base64", "UEsFBg==\n", "UEsFBg"])
+def test_inline_volume_which_is_not_canonical_base64_travels_as_text(contents):
+    volume = InlineVolume(contents=contents)
+
+    dumped = volume.model_dump(context={"binary": True})
+
+    assert dumped["contents"] == contents
+    assert InlineVolume.model_validate(dumped) == volume
+
+
+@pytest.mark.parametrize(
+    "offered, chosen",
+    [
+        (None, WireFormat.json),
+        ([], WireFormat.json),
+        (["json"], WireFormat.json),
+        (["msgpack"], WireFormat.msgpack),
+        (["json", "msgpack"], WireFormat.msgpack),
+        (["cbor", "json"], WireFormat.json),
+    ],
+)
+def test_choose_wire_format(offered, chosen):
+    assert choose_wire_format(offered) == chosen
+
+
+@pytest.mark.parametrize(
+    "chosen, accepted",
+    [
+        (None, WireFormat.json),
+        ("json", WireFormat.json),
+        ("msgpack", WireFormat.msgpack),
+        ("cbor", WireFormat.json),
+    ],
+)
+def test_accepted_wire_format(chosen, accepted):
+    assert accepted_wire_format(chosen) == accepted
+
+
+@pytest.mark.parametrize(
+    "frame",
+    [
+        b"\xc1",
+        b"\x92\x01\x02",
+        b"\x81\xa1",
+        msgpack.packb({"message_type": "V0UnknownRequest"}),
+        msgpack.packb({"message_type": "V0JobRequest", "job_uuid": 1}),
+    ],
+)
+def test_parse_invalid_msgpack(frame):
+    with pytest.raises(ValidationError):
+        BaseValidatorRequest.parse(frame)
+
+
+def test_benchmark():
+    results = benchmark(iterations=1)
+
+    assert len(results) == sum(len(messages) for messages in SAMPLE_MESSAGES.values())
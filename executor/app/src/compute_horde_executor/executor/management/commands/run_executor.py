@@ -43,6 +43,7 @@ from compute_horde.miner_client.base import (
 )
 from compute_horde.transport import WSTransport
 from compute_horde.utils import MachineSpecs
+from compute_horde.wire_format import choose_wire_format
 from django.conf import settings
 from django.core.management.base import BaseCommand
 
@@ -140,7 +141,10 @@ class MinerClient(AbstractMinerClient):
             self.full_payload.set_result(msg)
 
     async def send_ready(self):
-        await self.send_model(V0ReadyRequest(job_uuid=self.job_uuid))
+        initial_msg: V0InitialJobRequest = self.initial_msg.result()
+        wire_format = choose_wire_format(initial_msg.wire_formats)
+        await self.send_model(V0ReadyRequest(job_uuid=self.job_uuid, wire_format=wire_format))
+        self.wire_format = wire_format
 
     async def send_finished(self, job_result: "JobResult"):
         if job_result.specs:
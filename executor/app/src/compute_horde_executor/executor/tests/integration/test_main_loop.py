@@ -95,6 +95,7 @@ def test_main_loop():
         {
             "message_type": "V0ReadyRequest",
             "job_uuid": job_uuid,
+            "wire_format": "json",
         },
         {
             "message_type": "V0MachineSpecsRequest",
@@ -147,6 +148,7 @@ def test_zip_url_volume(httpx_mock: HTTPXMock):
         {
             "message_type": "V0ReadyRequest",
             "job_uuid": job_uuid,
+            "wire_format": "json",
         },
         {
             "message_type": "V0MachineSpecsRequest",
@@ -201,6 +203,7 @@ def test_zip_url_too_big_volume_should_fail(httpx_mock: HTTPXMock, settings):
         {
             "message_type": "V0ReadyRequest",
             "job_uuid": job_uuid,
+            "wire_format": "json",
         },
         {
             "message_type": "V0FailedRequest",
@@ -260,6 +263,7 @@ def test_zip_url_volume_without_content_length(httpx_mock: HTTPXMock):
         {
             "message_type": "V0ReadyRequest",
             "job_uuid": job_uuid,
+            "wire_format": "json",
         },
         {
             "message_type": "V0MachineSpecsRequest",
@@ -324,6 +328,7 @@ def test_zip_url_too_big_volume_without_content_length_should_fail(httpx_mock: H
         {
             "message_type": "V0ReadyRequest",
             "job_uuid": job_uuid,
+            "wire_format": "json",
         },
         {
             "message_type": "V0FailedRequest",
@@ -384,6 +389,7 @@ def test_zip_and_http_post_output_uploader(httpx_mock: HTTPXMock, tmp_path):
         {
             "message_type": "V0ReadyRequest",
             "job_uuid": job_uuid,
+            "wire_format": "json",
         },
         {
             "message_type": "V0MachineSpecsRequest",
@@ -450,6 +456,7 @@ def test_zip_and_http_put_output_uploader(httpx_mock: HTTPXMock, tmp_path):
         {
             "message_type": "V0ReadyRequest",
             "job_uuid": job_uuid,
+            "wire_format": "json",
         },
         {
             "message_type": "V0MachineSpecsRequest",
@@ -515,6 +522,7 @@ def test_output_upload_failed(httpx_mock: HTTPXMock, tmp_path):
         {
             "message_type": "V0ReadyRequest",
             "job_uuid": job_uuid,
+            "wire_format": "json",
         },
         {
             "message_type": "V0FailedRequest",
@@ -574,6 +582,7 @@ def test_output_upload_retry(httpx_mock: HTTPXMock, tmp_path):
         {
             "message_type": "V0ReadyRequest",
             "job_uuid": job_uuid,
+            "wire_format": "json",
         },
         {
             "message_type": "V0MachineSpecsRequest",
@@ -631,6 +640,7 @@ def test_raw_script_job():
         {
             "message_type": "V0ReadyRequest",
             "job_uuid": job_uuid,
+            "wire_format": "json",
         },
         {
             "message_type": "V0MachineSpecsRequest",
@@ -715,6 +725,7 @@ def test_multi_upload_output_uploader_with_system_output(httpx_mock: HTTPXMock,
         {
             "message_type": "V0ReadyRequest",
             "job_uuid": job_uuid,
+            "wire_format": "json",
         },
         {
             "message_type": "V0MachineSpecsRequest",
@@ -803,6 +814,7 @@ def test_single_file_volume(httpx_mock: HTTPXMock, tmp_path):
         {
             "message_type": "V0ReadyRequest",
             "job_uuid": job_uuid,
+            "wire_format": "json",
         },
         {
             "message_type": "V0MachineSpecsRequest",
@@ -886,6 +898,7 @@ def test_multi_volume(httpx_mock: HTTPXMock, tmp_path):
         {
             "message_type": "V0ReadyRequest",
             "job_uuid": job_uuid,
+            "wire_format": "json",
         },
         {
             "message_type": "V0MachineSpecsRequest",
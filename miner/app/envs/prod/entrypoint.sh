@@ -8,4 +8,4 @@
 ./manage.py migrate --no-input
 ./manage.py collectstatic --no-input
 
-daphne -b 0.0.0.0 -p 8000 compute_horde_miner.asgi:application
+python -m compute_horde_miner.ws_server -b 0.0.0.0 -p 8000 compute_horde_miner.asgi:application
@@ -4,6 +4,7 @@ import logging
 
 from channels.generic.websocket import AsyncWebsocketConsumer
 from compute_horde.base_requests import BaseRequest, ValidationError
+from compute_horde.wire_format import WireFormat
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +22,11 @@ def log_errors_explicitly(f):
 
 
 class BaseConsumer(AsyncWebsocketConsumer, abc.ABC):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # JSON until the other side accepts another format, see compute_horde.wire_format
+        self.wire_format = WireFormat.json
+
     @abc.abstractmethod
     def accepted_request_type(self) -> type[BaseRequest]:
         pass
@@ -39,16 +45,23 @@ class BaseConsumer(AsyncWebsocketConsumer, abc.ABC):
     async def connect(self):
         await self.accept()
 
+    async def send_model(self, model: BaseRequest):
+        data = model.serialize(self.wire_format)
+        if isinstance(data, bytes):
+            await self.send(bytes_data=data)
+        else:
+            await self.send(text_data=data)
+
     @log_errors_explicitly
     async def receive(self, text_data=None, bytes_data=None):
         try:
-            msg = self.accepted_request_type().parse(text_data)
+            msg = self.accepted_request_type().parse(
+                text_data if text_data is not None else bytes_data
+            )
         except ValidationError as ex:
             logger.error(f"Malformed message: {str(ex)}")
-            await self.send(
-                self.outgoing_generic_error_class()(
-                    details=f"Malformed message: {str(ex)}"
-                ).model_dump_json()
+            await self.send_model(
+                self.outgoing_generic_error_class()(details=f"Malformed message: {str(ex)}")
             )
             return
 
@@ -3,6 +3,7 @@ import logging
 from compute_horde.em_protocol import executor_requests, miner_requests
 from compute_horde.em_protocol.executor_requests import BaseExecutorRequest
 from compute_horde.mv_protocol import validator_requests
+from compute_horde.wire_format import SUPPORTED_WIRE_FORMATS, accepted_wire_format
 
 from compute_horde_miner.miner.miner_consumer.base_compute_horde_consumer import (
     BaseConsumer,
@@ -38,10 +39,10 @@ class MinerExecutorConsumer(BaseConsumer, ExecutorInterfaceMixin):
             # TODO maybe one day tokens will be reused, then we will have to add filtering here
             job = await AcceptedJob.objects.aget(executor_token=self.executor_token)
         except AcceptedJob.DoesNotExist:
-            await self.send(
+            await self.send_model(
                 miner_requests.GenericError(
                     details=f"No job waiting for token {self.executor_token}"
-                ).model_dump_json()
+                )
             )
             logger.error(f"No job waiting for token {self.executor_token}")
             await self.websocket_disconnect(
@@ -50,7 +51,7 @@ class MinerExecutorConsumer(BaseConsumer, ExecutorInterfaceMixin):
             return
         if job.status != AcceptedJob.Status.WAITING_FOR_EXECUTOR:
             msg = f"Job with token {self.executor_token} is not waiting for an executor"
-            await self.send(miner_requests.GenericError(details=msg).model_dump_json())
+            await self.send_model(miner_requests.GenericError(details=msg))
             logger.error(msg)
             await self.websocket_disconnect({"code": msg})
             return
@@ -58,7 +59,7 @@ class MinerExecutorConsumer(BaseConsumer, ExecutorInterfaceMixin):
         self.job = job
         await self.group_add(self.executor_token)
         initial_job_details = validator_requests.V0InitialJobRequest(**job.initial_job_details)
-        await self.send(
+        await self.send_model(
             miner_requests.V0InitialJobRequest(
                 job_uuid=initial_job_details.job_uuid,
                 base_docker_image_name=initial_job_details.base_docker_image_name,
@@ -66,11 +67,13 @@ class MinerExecutorConsumer(BaseConsumer, ExecutorInterfaceMixin):
                 volume_type=initial_job_details.volume_type.value
                 if initial_job_details.volume_type
                 else None,
-            ).model_dump_json()
+                wire_formats=SUPPORTED_WIRE_FORMATS,
+            )
         )
 
     async def handle(self, msg: BaseExecutorRequest):
         if isinstance(msg, executor_requests.V0ReadyRequest):
+            self.wire_format = accepted_wire_format(msg.wire_format)
             self.job.status = AcceptedJob.Status.WAITING_FOR_PAYLOAD
             await self.job.asave()
             await self.send_executor_ready(self.executor_token)
@@ -110,7 +113,7 @@ class MinerExecutorConsumer(BaseConsumer, ExecutorInterfaceMixin):
             )
 
     async def _miner_job_request(self, msg: JobRequest):
-        await self.send(
+        await self.send_model(
             miner_requests.V0JobRequest(
                 job_uuid=msg.job_uuid,
                 docker_image_name=msg.docker_image_name,
@@ -119,7 +122,7 @@ class MinerExecutorConsumer(BaseConsumer, ExecutorInterfaceMixin):
                 docker_run_cmd=msg.docker_run_cmd,
                 volume=msg.volume,
                 output_upload=msg.output_upload,
-            ).model_dump_json()
+            )
         )
 
     async def disconnect(self, close_code):
@@ -4,9 +4,12 @@ import time
 import uuid
 
 import bittensor
+from channels.db import database_sync_to_async
 from compute_horde.mv_protocol import miner_requests, validator_requests
 from compute_horde.mv_protocol.validator_requests import BaseValidatorRequest
+from compute_horde.wire_format import choose_wire_format
 from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
 
 from compute_horde_miner.miner.executor_manager import current
@@ -38,11 +41,47 @@ AUTH_MESSAGE_MAX_AGE = 10
 DONT_CHECK = "DONT_CHECK"
 
 
-def get_miner_signature(msg: BaseValidatorRequest) -> str:
-    keypair = settings.BITTENSOR_WALLET().get_hotkey()
+def get_miner_signature(msg: BaseValidatorRequest, keypair: bittensor.Keypair | None = None) -> str:
+    if keypair is None:
+        keypair = settings.BITTENSOR_WALLET().get_hotkey()
     return f"0x{keypair.sign(msg.blob_for_signing()).hex()}"
 
 
+@database_sync_to_async
+def create_accepted_jobs(jobs: list[AcceptedJob]) -> None:
+    with transaction.atomic():
+        AcceptedJob.objects.bulk_create(jobs)
+
+
+@database_sync_to_async
+def update_running_jobs(jobs: list[AcceptedJob]) -> None:
+    now = timezone.now()
+    for job in jobs:
+        job.updated_at = now
+    with transaction.atomic():
+        AcceptedJob.objects.bulk_update(jobs, ["status", "full_job_details", "updated_at"])
+
+
+@database_sync_to_async
+def save_receipts(
+    job_finished_receipt_msgs: list[validator_requests.V0JobFinishedReceiptRequest],
+    job_started_receipts: list[JobStartedReceipt],
+    job_finished_receipts: list[JobFinishedReceipt],
+) -> None:
+    now = timezone.now()
+    with transaction.atomic():
+        for msg in job_finished_receipt_msgs:
+            updated = AcceptedJob.objects.filter(job_uuid=msg.payload.job_uuid).update(
+                time_took=msg.payload.time_took, score=msg.payload.score, updated_at=now
+            )
+            if not updated:
+                logger.warning(
+                    f"Received job finished receipt for unknown job {msg.payload.job_uuid}"
+                )
+        JobStartedReceipt.objects.bulk_create(job_started_receipts)
+        JobFinishedReceipt.objects.bulk_create(job_finished_receipts)
+
+
 class MinerValidatorConsumer(BaseConsumer, ValidatorInterfaceMixin):
     def __init__(self, *a, **kw):
         super().__init__(*a, **kw)
@@ -78,7 +117,7 @@ class MinerValidatorConsumer(BaseConsumer, ValidatorInterfaceMixin):
             msg = f"Inactive validator: {self.validator_key}"
             fail = True
         if fail:
-            await self.send(miner_requests.GenericError(details=msg).model_dump_json())
+            await self.send_model(miner_requests.GenericError(details=msg))
             logger.info(msg)
             await self.close(1000)
             return
@@ -180,12 +219,14 @@ class MinerValidatorConsumer(BaseConsumer, ValidatorInterfaceMixin):
                     f"Validator {self.validator_key} not authenticated due to: {error_msg}"
                 )
                 logger.info(response_msg)
-                await self.send(miner_requests.GenericError(details=response_msg).model_dump_json())
+                await self.send_model(miner_requests.GenericError(details=response_msg))
                 await self.close(1000)
                 return
         self.validator_authenticated = True
         manifest = await current.executor_manager.get_manifest()
-        await self.send(
+        # the manifest itself still goes as JSON, older validators don't negotiate
+        wire_format = choose_wire_format(msg.wire_formats)
+        await self.send_model(
             miner_requests.V0ExecutorManifestRequest(
                 manifest=miner_requests.ExecutorManifest(
                     executor_classes=[
@@ -194,33 +235,36 @@ class MinerValidatorConsumer(BaseConsumer, ValidatorInterfaceMixin):
                         )
                         for executor_class, count in manifest.items()
                     ]
-                )
-            ).model_dump_json()
+                ),
+                wire_format=wire_format,
+                batch_requests=True,
+            )
         )
+        self.wire_format = wire_format
         for msg in self.msg_queue:
             await self.handle(msg)
 
         # we should not send any messages until validator authorizes itself
         for job in await AcceptedJob.get_not_reported(self.validator):
             if job.status == AcceptedJob.Status.FINISHED:
-                await self.send(
+                await self.send_model(
                     miner_requests.V0JobFinishedRequest(
                         job_uuid=str(job.job_uuid),
                         docker_process_stdout=job.stdout,
                         docker_process_stderr=job.stderr,
-                    ).model_dump_json()
+                    )
                 )
                 logger.debug(
                     f"Job {job.job_uuid} finished reported to validator {self.validator_key}"
                 )
             else:  # job.status == AcceptedJob.Status.FAILED:
-                await self.send(
+                await self.send_model(
                     miner_requests.V0JobFailedRequest(
                         job_uuid=str(job.job_uuid),
                         docker_process_stdout=job.stdout,
                         docker_process_stderr=job.stderr,
                         docker_process_exit_status=job.exit_status,
-                    ).model_dump_json()
+                    )
                 )
                 logger.debug(
                     f"Failed job {job.job_uuid} reported to validator {self.validator_key}"
@@ -231,9 +275,7 @@ class MinerValidatorConsumer(BaseConsumer, ValidatorInterfaceMixin):
         # we should not send any messages until validator authorizes itself
         while self.defer_executor_ready:
             job = self.defer_executor_ready.pop()
-            await self.send(
-                miner_requests.V0ExecutorReadyRequest(job_uuid=str(job.job_uuid)).model_dump_json()
-            )
+            await self.send_model(miner_requests.V0ExecutorReadyRequest(job_uuid=str(job.job_uuid)))
             logger.debug(
                 f"Readiness for job {job.job_uuid} reported to validator {self.validator_key}"
             )
@@ -250,131 +292,165 @@ class MinerValidatorConsumer(BaseConsumer, ValidatorInterfaceMixin):
             self.msg_queue.append(msg)
             return
         if isinstance(msg, validator_requests.V0InitialJobRequest):
-            validator_blacklisted = await ValidatorBlacklist.objects.filter(
-                validator=self.validator
-            ).aexists()
-            if validator_blacklisted:
+            await self.handle_initial_job_requests([msg])
+        if isinstance(msg, validator_requests.V0InitialJobBatchRequest):
+            await self.handle_initial_job_requests(msg.jobs)
+
+        if isinstance(msg, validator_requests.V0JobRequest):
+            await self.handle_job_requests([msg])
+        if isinstance(msg, validator_requests.V0JobBatchRequest):
+            await self.handle_job_requests(msg.jobs)
+
+        if isinstance(msg, validator_requests.V0JobStartedReceiptRequest):
+            await self.handle_receipts([msg], [])
+        if isinstance(msg, validator_requests.V0JobFinishedReceiptRequest):
+            await self.handle_receipts([], [msg])
+        if isinstance(msg, validator_requests.V0ReceiptBatchRequest):
+            await self.handle_receipts(msg.job_started_receipts, msg.job_finished_receipts)
+
+    async def handle_initial_job_requests(self, msgs: list[validator_requests.V0InitialJobRequest]):
+        validator_blacklisted = await ValidatorBlacklist.objects.filter(
+            validator=self.validator
+        ).aexists()
+        if validator_blacklisted:
+            for msg in msgs:
                 logger.info(
                     f"Declining job {msg.job_uuid} from blacklisted validator: {self.validator_key}"
                 )
-                await self.send(
-                    miner_requests.V0DeclineJobRequest(job_uuid=msg.job_uuid).model_dump_json()
-                )
-                return
-            # TODO add rate limiting per validator key here
+                await self.send_model(miner_requests.V0DeclineJobRequest(job_uuid=msg.job_uuid))
+            return
+        # TODO add rate limiting per validator key here
+        jobs = []
+        for msg in msgs:
             token = f"{msg.job_uuid}-{uuid.uuid4()}"
             await self.group_add(token)
-            # let's create the job object before spinning up the executor, so if this process dies before getting
-            # confirmation from the executor_manager the object is there and the executor will get the job details
-            job = AcceptedJob(
-                validator=self.validator,
-                job_uuid=msg.job_uuid,
-                executor_token=token,
-                initial_job_details=msg.model_dump(),
-                status=AcceptedJob.Status.WAITING_FOR_EXECUTOR,
+            jobs.append(
+                AcceptedJob(
+                    validator=self.validator,
+                    job_uuid=msg.job_uuid,
+                    executor_token=token,
+                    initial_job_details=msg.model_dump(),
+                    status=AcceptedJob.Status.WAITING_FOR_EXECUTOR,
+                )
             )
-            await job.asave()
-            self.pending_jobs[msg.job_uuid] = job
+        # let's create the job objects before spinning up the executors, so if this process dies before getting
+        # confirmation from the executor_manager the objects are there and the executors will get the job details
+        await create_accepted_jobs(jobs)
 
+        declined_jobs = []
+        for msg, job in zip(msgs, jobs):
+            self.pending_jobs[msg.job_uuid] = job
             try:
                 await current.executor_manager.reserve_executor_class(
-                    token, msg.executor_class, msg.timeout_seconds
+                    job.executor_token, msg.executor_class, msg.timeout_seconds
                 )
             except ExecutorUnavailable:
-                await self.send(
-                    miner_requests.V0DeclineJobRequest(job_uuid=msg.job_uuid).model_dump_json()
-                )
-                await self.group_discard(token)
-                await job.adelete()
+                await self.send_model(miner_requests.V0DeclineJobRequest(job_uuid=msg.job_uuid))
+                await self.group_discard(job.executor_token)
+                declined_jobs.append(job)
                 self.pending_jobs.pop(msg.job_uuid)
-                return
-            await self.send(
-                miner_requests.V0AcceptJobRequest(job_uuid=msg.job_uuid).model_dump_json()
-            )
+                continue
+            await self.send_model(miner_requests.V0AcceptJobRequest(job_uuid=msg.job_uuid))
 
-        if isinstance(msg, validator_requests.V0JobRequest):
+        if declined_jobs:
+            await AcceptedJob.objects.filter(pk__in=[job.pk for job in declined_jobs]).adelete()
+
+    async def handle_job_requests(self, msgs: list[validator_requests.V0JobRequest]):
+        running_jobs = []
+        for msg in msgs:
             job = self.pending_jobs.get(msg.job_uuid)
             if msg.volume and not msg.volume.is_safe():
                 error_msg = f"Received JobRequest with unsafe volume: {msg.volume.contents}"
                 logger.error(error_msg)
-                await self.send(
+                await self.send_model(
                     miner_requests.GenericError(
                         details=error_msg,
-                    ).model_dump_json()
+                    )
                 )
-                return
+                continue
             if job is None:
                 error_msg = f"Received JobRequest for unknown job_uuid: {msg.job_uuid}"
                 logger.error(error_msg)
-                await self.send(
+                await self.send_model(
                     miner_requests.GenericError(
                         details=error_msg,
-                    ).model_dump_json()
+                    )
                 )
-                return
+                continue
             await self.send_job_request(job.executor_token, msg)
             logger.debug(f"Passing job details to executor consumer job_uuid: {msg.job_uuid}")
             job.status = AcceptedJob.Status.RUNNING
             job.full_job_details = msg.model_dump()
-            await job.asave()
+            running_jobs.append(job)
+
+        if running_jobs:
+            await update_running_jobs(running_jobs)
 
-        if isinstance(
-            msg, validator_requests.V0JobStartedReceiptRequest
-        ) and self.verify_receipt_msg(msg):
+    async def handle_receipts(
+        self,
+        job_started_receipts: list[validator_requests.V0JobStartedReceiptRequest],
+        job_finished_receipts: list[validator_requests.V0JobFinishedReceiptRequest],
+    ):
+        job_started_receipts = [msg for msg in job_started_receipts if self.verify_receipt_msg(msg)]
+        job_finished_receipts = [
+            msg for msg in job_finished_receipts if self.verify_receipt_msg(msg)
+        ]
+        for msg in job_started_receipts:
             logger.info(
                 f"Received job started receipt for"
                 f" job_uuid={msg.payload.job_uuid} validator_hotkey={msg.payload.validator_hotkey}"
                 f" max_timeout={msg.payload.max_timeout}"
             )
-
-            if settings.IS_LOCAL_MINER:
-                return
-
-            await JobStartedReceipt.objects.acreate(
-                validator_signature=msg.signature,
-                miner_signature=get_miner_signature(msg),
-                job_uuid=msg.payload.job_uuid,
-                miner_hotkey=msg.payload.miner_hotkey,
-                validator_hotkey=msg.payload.validator_hotkey,
-                executor_class=msg.payload.executor_class,
-                time_accepted=msg.payload.time_accepted,
-                max_timeout=msg.payload.max_timeout,
-            )
-
-        if isinstance(
-            msg, validator_requests.V0JobFinishedReceiptRequest
-        ) and self.verify_receipt_msg(msg):
+        for msg in job_finished_receipts:
             logger.info(
                 f"Received job finished receipt for"
                 f" job_uuid={msg.payload.job_uuid} validator_hotkey={msg.payload.validator_hotkey}"
                 f" time_took={msg.payload.time_took} score={msg.payload.score}"
             )
-            job = await AcceptedJob.objects.aget(job_uuid=msg.payload.job_uuid)
-            job.time_took = msg.payload.time_took
-            job.score = msg.payload.score
-            await job.asave()
+        if not job_started_receipts and not job_finished_receipts:
+            return
 
-            if settings.IS_LOCAL_MINER:
-                return
+        if settings.IS_LOCAL_MINER:
+            await save_receipts(job_finished_receipts, [], [])
+            return
 
-            await JobFinishedReceipt.objects.acreate(
-                validator_signature=msg.signature,
-                miner_signature=get_miner_signature(msg),
-                job_uuid=msg.payload.job_uuid,
-                miner_hotkey=msg.payload.miner_hotkey,
-                validator_hotkey=msg.payload.validator_hotkey,
-                time_started=msg.payload.time_started,
-                time_took_us=msg.payload.time_took_us,
-                score_str=msg.payload.score_str,
-            )
+        keypair = settings.BITTENSOR_WALLET().get_hotkey()
+        await save_receipts(
+            job_finished_receipts,
+            [
+                JobStartedReceipt(
+                    validator_signature=msg.signature,
+                    miner_signature=get_miner_signature(msg, keypair),
+                    job_uuid=msg.payload.job_uuid,
+                    miner_hotkey=msg.payload.miner_hotkey,
+                    validator_hotkey=msg.payload.validator_hotkey,
+                    executor_class=msg.payload.executor_class,
+                    time_accepted=msg.payload.time_accepted,
+                    max_timeout=msg.payload.max_timeout,
+                )
+                for msg in job_started_receipts
+            ],
+            [
+                JobFinishedReceipt(
+                    validator_signature=msg.signature,
+                    miner_signature=get_miner_signature(msg, keypair),
+                    job_uuid=msg.payload.job_uuid,
+                    miner_hotkey=msg.payload.miner_hotkey,
+                    validator_hotkey=msg.payload.validator_hotkey,
+                    time_started=msg.payload.time_started,
+                    time_took_us=msg.payload.time_took_us,
+                    score_str=msg.payload.score_str,
+                )
+                for msg in job_finished_receipts
+            ],
+        )
+        if job_finished_receipts:
             prepare_receipts.delay()
 
     async def _executor_ready(self, msg: ExecutorReady):
         job = await AcceptedJob.objects.aget(executor_token=msg.executor_token)
         self.pending_jobs[job.job_uuid] = job
-        await self.send(
-            miner_requests.V0ExecutorReadyRequest(job_uuid=str(job.job_uuid)).model_dump_json()
-        )
+        await self.send_model(miner_requests.V0ExecutorReadyRequest(job_uuid=str(job.job_uuid)))
         logger.debug(f"Readiness for job {job.job_uuid} reported to validator {self.validator_key}")
 
     async def _executor_failed_to_prepare(self, msg: ExecutorFailedToPrepare):
@@ -387,20 +463,18 @@ class MinerValidatorConsumer(BaseConsumer, ValidatorInterfaceMixin):
         self.pending_jobs = {
             k: v for k, v in self.pending_jobs.items() if v.executor_token != msg.executor_token
         }
-        await self.send(
-            miner_requests.V0ExecutorFailedRequest(job_uuid=job.job_uuid).model_dump_json()
-        )
+        await self.send_model(miner_requests.V0ExecutorFailedRequest(job_uuid=job.job_uuid))
         logger.debug(
             f"Failure in preparation for job {job.job_uuid} reported to validator {self.validator_key}"
         )
 
     async def _executor_finished(self, msg: ExecutorFinished):
-        await self.send(
+        await self.send_model(
             miner_requests.V0JobFinishedRequest(
                 job_uuid=msg.job_uuid,
                 docker_process_stdout=msg.docker_process_stdout,
                 docker_process_stderr=msg.docker_process_stderr,
-            ).model_dump_json()
+            )
         )
         logger.debug(f"Finished job {msg.job_uuid} reported to validator {self.validator_key}")
         job = self.pending_jobs.pop(msg.job_uuid)
@@ -409,24 +483,24 @@ class MinerValidatorConsumer(BaseConsumer, ValidatorInterfaceMixin):
         await job.asave()
 
     async def _executor_specs(self, msg: validator_requests.V0MachineSpecsRequest):
-        await self.send(
+        await self.send_model(
             miner_requests.V0MachineSpecsRequest(
                 job_uuid=msg.job_uuid,
                 specs=msg.specs,
-            ).model_dump_json()
+            )
         )
         logger.debug(
             f"Reported specs for job {msg.job_uuid}: {msg.specs} to validator {self.validator_key}"
         )
 
     async def _executor_failed(self, msg: ExecutorFailed):
-        await self.send(
+        await self.send_model(
             miner_requests.V0JobFailedRequest(
                 job_uuid=msg.job_uuid,
                 docker_process_stdout=msg.docker_process_stdout,
                 docker_process_stderr=msg.docker_process_stderr,
                 docker_process_exit_status=msg.docker_process_exit_status,
-            ).model_dump_json()
+            )
         )
         logger.debug(f"Failed job {msg.job_uuid} reported to validator {self.validator_key}")
         job = self.pending_jobs.pop(msg.job_uuid)
@@ -6,11 +6,14 @@ from unittest.mock import MagicMock
 import pytest
 import pytest_asyncio
 from channels.testing import WebsocketCommunicator
+from compute_horde.base.volume import VolumeType
 from compute_horde.executor_class import DEFAULT_EXECUTOR_CLASS
+from compute_horde.mv_protocol import miner_requests, validator_requests
+from compute_horde.wire_format import WireFormat
 from pytest_mock import MockerFixture
 
 from compute_horde_miner import asgi
-from compute_horde_miner.miner.models import Validator
+from compute_horde_miner.miner.models import AcceptedJob, Validator
 from compute_horde_miner.miner.tests.executor_manager import StubExecutorManager, fake_executor
 
 pytestmark = [pytest.mark.asyncio, pytest.mark.django_db(transaction=True)]
@@ -83,6 +86,8 @@ async def run_regular_flow_test(validator_key: str, job_uuid: str):
             "manifest": {
                 "executor_classes": [{"count": 1, "executor_class": DEFAULT_EXECUTOR_CLASS}]
             },
+            "wire_format": "json",
+            "batch_requests": True,
         }
         await communicator.send_json_to(
             {
@@ -163,3 +168,101 @@ async def test_local_miner_unknown_validator(mock_keypair: MagicMock, settings):
             "message_type": "GenericError",
             "details": f"Unknown validator: {validator_key}",
         }
+
+
+async def test_msgpack_wire_format(validator: Validator, job_uuid: str):
+    async with make_communicator(validator.public_key) as communicator:
+        await communicator.send_json_to(
+            {
+                "message_type": "V0AuthenticateRequest",
+                "payload": {
+                    "validator_hotkey": validator.public_key,
+                    "miner_hotkey": "some key",
+                    "timestamp": int(time.time()),
+                },
+                "signature": "gibberish",
+                "wire_formats": ["msgpack", "json"],
+            }
+        )
+        response = await communicator.receive_json_from(timeout=WEBSOCKET_TIMEOUT)
+        assert response["message_type"] == "V0ExecutorManifestRequest"
+        assert response["wire_format"] == "msgpack"
+
+        await communicator.send_to(
+            bytes_data=validator_requests.V0InitialJobRequest(
+                job_uuid=job_uuid,
+                executor_class=DEFAULT_EXECUTOR_CLASS,
+                base_docker_image_name="it's teeeeests",
+                timeout_seconds=60,
+                volume_type=VolumeType.inline,
+            ).serialize(WireFormat.msgpack)
+        )
+        for message_type in (
+            miner_requests.V0AcceptJobRequest,
+            miner_requests.V0ExecutorReadyRequest,
+        ):
+            response = await communicator.receive_from(timeout=WEBSOCKET_TIMEOUT)
+            assert isinstance(response, bytes)
+            assert miner_requests.BaseMinerRequest.parse(response) == message_type(
+                job_uuid=job_uuid
+            )
+
+
+async def test_batch_requests(validator: Validator, job_uuid: str):
+    async with make_communicator(validator.public_key) as communicator:
+        await communicator.send_json_to(
+            {
+                "message_type": "V0AuthenticateRequest",
+                "payload": {
+                    "validator_hotkey": validator.public_key,
+                    "miner_hotkey": "some key",
+                    "timestamp": int(time.time()),
+                },
+                "signature": "gibberish",
+            }
+        )
+        response = await communicator.receive_json_from(timeout=WEBSOCKET_TIMEOUT)
+        assert response["batch_requests"] is True
+
+        await communicator.send_to(
+            text_data=validator_requests.V0InitialJobBatchRequest(
+                jobs=[
+                    validator_requests.V0InitialJobRequest(
+                        job_uuid=job_uuid,
+                        executor_class=DEFAULT_EXECUTOR_CLASS,
+                        base_docker_image_name="it's teeeeests",
+                        timeout_seconds=60,
+                        volume_type=VolumeType.inline,
+                    )
+                ]
+            ).model_dump_json()
+        )
+        response = await communicator.receive_json_from(timeout=WEBSOCKET_TIMEOUT)
+        assert response == {"message_type": "V0AcceptJobRequest", "job_uuid": job_uuid}
+        response = await communicator.receive_json_from(timeout=WEBSOCKET_TIMEOUT)
+        assert response == {"message_type": "V0ExecutorReadyRequest", "job_uuid": job_uuid}
+
+        await communicator.send_to(
+            text_data=validator_requests.V0JobBatchRequest(
+                jobs=[
+                    validator_requests.V0JobRequest(
+                        job_uuid=job_uuid,
+                        executor_class=DEFAULT_EXECUTOR_CLASS,
+                        docker_image_name="it's teeeeests again",
+                        docker_run_cmd=[],
+                        docker_run_options_preset="none",
+                        volume={"volume_type": "inline", "contents": "nonsense"},
+                    )
+                ]
+            ).model_dump_json()
+        )
+        response = await communicator.receive_json_from(timeout=WEBSOCKET_TIMEOUT)
+        assert response == {
+            "message_type": "V0JobFinishedRequest",
+            "job_uuid": job_uuid,
+            "docker_process_stdout": "some stdout",
+            "docker_process_stderr": "some stderr",
+        }
+
+    job = await AcceptedJob.objects.aget(job_uuid=job_uuid)
+    assert job.status == AcceptedJob.Status.FINISHED
@@ -0,0 +1,29 @@
+from autobahn.websocket.compress import PerMessageDeflateOffer, PerMessageDeflateOfferAccept
+from daphne.ws_protocol import WebSocketProtocol
+from pytest_mock import MockerFixture
+
+from compute_horde_miner.ws_server import (
+    ThresholdCompressionWebSocketProtocol,
+    accept_permessage_deflate,
+)
+
+
+def test_accept_permessage_deflate():
+    offer = PerMessageDeflateOffer()
+
+    accept = accept_permessage_deflate([offer])
+
+    assert isinstance(accept, PerMessageDeflateOfferAccept)
+    assert accept.offer is offer
+    assert accept_permessage_deflate([]) is None
+
+
+def test_messages_below_threshold_are_not_compressed(settings, mocker: MockerFixture):
+    settings.WS_COMPRESSION_THRESHOLD = 16
+    send_message = mocker.patch.object(WebSocketProtocol, "sendMessage")
+    protocol = ThresholdCompressionWebSocketProtocol()
+
+    protocol.sendMessage(b"x" * 15)
+    protocol.sendMessage(b"x" * 16, isBinary=True)
+
+    assert [call.args[-1] for call in send_message.call_args_list] == [True, False]
@@ -193,7 +193,7 @@ TEMPLATES = [
 ASGI_APPLICATION = "compute_horde_miner.asgi.application"
 
 DATABASES = {}
-default_db = f'postgres://postgres:{env("POSTGRES_PASSWORD")}@db:5432/postgres'
+default_db = f"postgres://postgres:{env('POSTGRES_PASSWORD')}@db:5432/postgres"
 if env(
     "DATABASE_POOL_URL", default=""
 ):  # DB transaction-based connection pool, such as one provided PgBouncer
@@ -348,6 +348,11 @@ LOGGING = {
     },
 }
 
+# permessage-deflate of the websocket connections served by compute_horde_miner.ws_server,
+# messages shorter than the threshold (in bytes) are sent uncompressed
+WS_COMPRESSION = env.bool("WS_COMPRESSION", default=True)
+WS_COMPRESSION_THRESHOLD = env.int("WS_COMPRESSION_THRESHOLD", default=1024)
+
 EXECUTOR_MANAGER_CLASS_PATH = env.str(
     "EXECUTOR_MANAGER_CLASS_PATH",
     default="compute_horde_miner.miner.executor_manager.v1:DockerExecutorManager",
@@ -0,0 +1,48 @@
+"""
+daphne, with permessage-deflate on the websocket connections.
+
+    python -m compute_horde_miner.ws_server -b 0.0.0.0 -p 8000 compute_horde_miner.asgi:application
+
+daphne doesn't accept the compression the clients offer. With WS_COMPRESSION it does, and
+the messages shorter than WS_COMPRESSION_THRESHOLD are sent uncompressed.
+"""
+
+from autobahn.websocket.compress import PerMessageDeflateOffer, PerMessageDeflateOfferAccept
+from daphne.cli import CommandLineInterface
+from daphne.server import Server
+from daphne.ws_protocol import WebSocketProtocol
+from django.conf import settings
+
+
+def accept_permessage_deflate(offers):
+    for offer in offers:
+        if isinstance(offer, PerMessageDeflateOffer):
+            return PerMessageDeflateOfferAccept(offer)
+    return None
+
+
+class ThresholdCompressionWebSocketProtocol(WebSocketProtocol):
+    def sendMessage(
+        self, payload, isBinary=False, fragmentSize=None, sync=False, doNotCompress=False
+    ):
+        doNotCompress = doNotCompress or len(payload) < settings.WS_COMPRESSION_THRESHOLD
+        super().sendMessage(payload, isBinary, fragmentSize, sync, doNotCompress)
+
+
+class CompressionServer(Server):
+    def listen_success(self, port):
+        # the websocket factory is created in run(), before the endpoints start listening
+        super().listen_success(port)
+        if settings.WS_COMPRESSION:
+            self.ws_factory.protocol = ThresholdCompressionWebSocketProtocol
+            self.ws_factory.setProtocolOptions(
+                perMessageCompressionAccept=accept_permessage_deflate
+            )
+
+
+class CompressionCommandLineInterface(CommandLineInterface):
+    server_class = CompressionServer
+
+
+if __name__ == "__main__":
+    CompressionCommandLineInterface.entrypoint()
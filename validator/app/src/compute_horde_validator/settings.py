@@ -4,6 +4,7 @@ Django settings for compute_horde_validator project.
 
 import inspect
 import logging
+import os
 import pathlib
 from datetime import timedelta
 from functools import wraps
@@ -226,6 +227,33 @@ CONSTANCE_CONFIG = {
         "Number of prompts to generate in a single batch",
         int,
     ),
+    "DYNAMIC_SYNTHETIC_JOB_BANK_SIZE": (
+        1000,
+        "How many pre-generated synthetic jobs to keep ready for the next batch",
+        int,
+    ),
+    "DYNAMIC_SYNTHETIC_JOB_BANK_TTL": (
+        24 * 60 * 60,
+        "In seconds. Pre-generated synthetic jobs older than this are discarded",
+        int,
+    ),
+    "DYNAMIC_SYNTHETIC_JOBS_BATCH_SHARDS": (
+        1,
+        "Number of processes to split a synthetic jobs batch into, 1 runs it in the worker itself",
+        int,
+    ),
+    "DYNAMIC_SYNTHETIC_JOBS_UNREACHABLE_MINER_FAILURES": (
+        3,
+        "After failing to send the manifest in this many batches in a row, a miner only gets a single "
+        "short connection attempt in a batch until it is reachable again, 0 disables it",
+        int,
+    ),
+    "DYNAMIC_SYNTHETIC_JOBS_PREWARM_BLOCKS": (
+        0,
+        "How many blocks before a synthetic jobs batch to connect to the miners and get their manifests, "
+        "0 disables it, at most DYNAMIC_SYNTHETIC_JOBS_PLANNER_WAIT_IN_ADVANCE_BLOCKS",
+        int,
+    ),
 }
 DYNAMIC_CONFIG_CACHE_TIMEOUT = 300
 
@@ -387,6 +415,16 @@ CELERY_BEAT_SCHEDULE = {  # type: ignore
         "schedule": timedelta(minutes=5),
         "options": {},
     },
+    "refill_synthetic_job_bank": {
+        "task": "compute_horde_validator.validator.tasks.refill_synthetic_job_bank",
+        "schedule": timedelta(minutes=5),
+        "options": {},
+    },
+    "probe_unreachable_miners": {
+        "task": "compute_horde_validator.validator.tasks.probe_unreachable_miners",
+        "schedule": timedelta(minutes=10),
+        "options": {},
+    },
     "fetch_dynamic_config": {
         "task": "compute_horde_validator.validator.tasks.fetch_dynamic_config",
         "schedule": timedelta(minutes=5),
@@ -474,6 +512,10 @@ DEBUG_MINER_PORT = env.int("DEBUG_MINER_PORT", default=0)
 DEBUG_MINER_COUNT = env.int("DEBUG_MINER_COUNT", default=1)
 # if you don't want to wait for your celery beat job to sleep on staging:
 DEBUG_DONT_STAGGER_VALIDATORS = env.bool("DEBUG_DONT_STAGGER_VALIDATORS", default=False)
+# permessage-deflate of the websocket connections to the miners and the facilitator,
+# messages shorter than the threshold (in bytes) are sent uncompressed
+WS_COMPRESSION = env.bool("WS_COMPRESSION", default=True)
+WS_COMPRESSION_THRESHOLD = env.int("WS_COMPRESSION_THRESHOLD", default=1024)
 
 HORDE_SCORE_AVG_PARAM = 0
 HORDE_SCORE_SIZE_PARAM = 0
@@ -486,6 +528,11 @@ HORDE_SCORE_SIZE_PARAM = 0
 # non integer number - like 4.5 (all hordes smaller than 5 will get 0 weights)
 HORDE_SCORE_CENTRAL_SIZE_PARAM = 1
 
+# number of processes generating synthetic jobs for the job bank, 1 generates them in-process
+SYNTHETIC_JOB_GENERATION_PROCESSES = env.int(
+    "SYNTHETIC_JOB_GENERATION_PROCESSES", default=os.cpu_count() or 1
+)
+
 DEBUG_OVERRIDE_WEIGHTS_VERSION = env.int("DEBUG_OVERRIDE_WEIGHTS_VERSION", default=None)
 DEBUG_OVERRIDE_SYNTHETIC_JOBS_FLOW_VERSION = env.int(
     "DEBUG_OVERRIDE_SYNTHETIC_JOBS_FLOW_VERSION", default=None
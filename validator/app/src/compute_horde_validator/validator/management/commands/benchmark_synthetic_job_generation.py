@@ -0,0 +1,59 @@
+import contextlib
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from compute_horde_validator.validator.dynamic_config import get_weights_version
+from compute_horde_validator.validator.synthetic_jobs.parallel_generation import (
+    hash_job_process_pool,
+    precompute_hash_jobs,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure how many synthetic jobs per second can be generated with different process counts"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=1000, help="jobs to generate per run")
+        parser.add_argument("--weights-version", type=int, default=None)
+        parser.add_argument(
+            "--processes",
+            type=int,
+            nargs="+",
+            default=None,
+            help="process counts to measure, by default powers of two up to the core count",
+        )
+
+    def handle(self, *args, count, weights_version, processes, **options):
+        if weights_version is None:
+            weights_version = get_weights_version()
+        if processes is None:
+            cpu_count = os.cpu_count() or 1
+            processes = [2**i for i in range(cpu_count.bit_length())]
+            if processes[-1] != cpu_count:
+                processes.append(cpu_count)
+
+        self.stdout.write(f"weights_version={weights_version} count={count} cores={os.cpu_count()}")
+        baseline = None
+        for process_count in processes:
+            with (
+                hash_job_process_pool(process_count)
+                if process_count > 1
+                else contextlib.nullcontext()
+            ) as executor:
+                if executor is not None:
+                    # don't count spawning the workers
+                    precompute_hash_jobs(weights_version, process_count, executor, process_count)
+                start = time.monotonic()
+                precompute_hash_jobs(weights_version, count, executor, process_count)
+                took = time.monotonic() - start
+
+            jobs_per_second = count / took
+            baseline = baseline or jobs_per_second
+            self.stdout.write(
+                f"processes={process_count:<4} {jobs_per_second:10.1f} jobs/s"
+                f"  speedup={jobs_per_second / baseline:.2f}x"
+            )
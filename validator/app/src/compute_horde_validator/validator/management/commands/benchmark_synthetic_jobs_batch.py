@@ -0,0 +1,230 @@
+import math
+from collections import defaultdict
+from datetime import datetime
+
+import bittensor
+import uvloop
+from asgiref.sync import async_to_sync, sync_to_async
+from compute_horde.executor_class import DEFAULT_EXECUTOR_CLASS, ExecutorClass
+from django.core.management.base import BaseCommand
+from django.utils.timezone import now
+
+from compute_horde_validator.validator.models import Miner, SystemEvent
+from compute_horde_validator.validator.synthetic_jobs.batch_run import (
+    execute_synthetic_batch_run,
+)
+from compute_horde_validator.validator.synthetic_jobs.fake_miners import (
+    FAKE_MINER_HOST,
+    FakeMinerFleet,
+    SentMessage,
+    fake_miner_fleet_configs,
+)
+
+# job telemetry field with the time the validator recorded a miner message
+_RESPONSE_TIME_FIELDS = {
+    "V0AcceptJobRequest": "accept_response_time",
+    "V0DeclineJobRequest": "accept_response_time",
+    "V0ExecutorReadyRequest": "executor_response_time",
+    "V0JobFinishedRequest": "job_response_time",
+}
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    # nearest-rank
+    ordered = sorted(values)
+    return ordered[max(math.ceil(percent / 100 * len(ordered)) - 1, 0)]
+
+
+def _stage_report(batch_data: dict) -> list[tuple[str, float, float | None, int | None]]:
+    """
+    (stage, duration, cpu time, peak RSS at the end) for each stage of the batch.
+    """
+    start_times = {
+        stage: datetime.fromisoformat(dt) for stage, dt in batch_data["stage_start_time"].items()
+    }
+    cpu_times = batch_data.get("stage_cpu_time", {})
+    max_rss = batch_data.get("stage_max_rss", {})
+    stages = sorted(start_times, key=start_times.__getitem__)
+    report = []
+    for stage, next_stage in zip(stages, stages[1:]):
+        duration = (start_times[next_stage] - start_times[stage]).total_seconds()
+        cpu_time = None
+        if stage in cpu_times and next_stage in cpu_times:
+            cpu_time = cpu_times[next_stage] - cpu_times[stage]
+        report.append((stage, duration, cpu_time, max_rss.get(next_stage)))
+    return report
+
+
+def _response_time_errors(job_data: list[dict], sent: list[SentMessage]) -> dict[str, list[float]]:
+    """
+    How much later than the fake miner sent it the validator recorded each response.
+    """
+    jobs = {data["job_uuid"]: data for data in job_data}
+    errors: dict[str, list[float]] = defaultdict(list)
+    for message in sent:
+        field = _RESPONSE_TIME_FIELDS.get(message.message_type)
+        job = jobs.get(message.job_uuid)
+        if field is None or job is None or job.get(field) is None:
+            continue
+        recorded = datetime.fromisoformat(job[field]).timestamp()
+        errors[message.message_type].append(recorded - message.timestamp)
+    return errors
+
+
+def _initial_send_skew(job_data: list[dict]) -> dict[str, float]:
+    """
+    Time between the first and the last initial job request, per executor class.
+    Jobs of an executor class are sent together, after their stagger wait interval.
+    """
+    send_times: dict[str, list[float]] = defaultdict(list)
+    for data in job_data:
+        if data.get("accept_before_sent_time") is not None:
+            send_times[data["executor_class"]].append(
+                datetime.fromisoformat(data["accept_before_sent_time"]).timestamp()
+            )
+    return {executor_class: max(times) - min(times) for executor_class, times in send_times.items()}
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a synthetic jobs batch against a fleet of local fake miners and report "
+        "how it scales. For dev environments only, the batch is persisted like a real one."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--miners", type=int, default=100)
+        parser.add_argument("--executors", type=int, default=1, help="executors per miner")
+        parser.add_argument(
+            "--executor-class",
+            type=ExecutorClass,
+            default=DEFAULT_EXECUTOR_CLASS,
+            choices=list(ExecutorClass),
+        )
+        parser.add_argument("--accept-ratio", type=float, default=1.0)
+        parser.add_argument(
+            "--latency", type=float, default=0.01, help="median response latency in seconds"
+        )
+        parser.add_argument(
+            "--latency-sigma", type=float, default=0.5, help="sigma of the log-normal latency"
+        )
+        parser.add_argument("--job-time", type=float, default=0.5, help="in seconds")
+        parser.add_argument("--slow-ratio", type=float, default=0.0)
+        parser.add_argument("--slow-factor", type=float, default=10.0)
+        parser.add_argument(
+            "--misbehaving-ratio",
+            type=float,
+            default=0.0,
+            help="fraction of miners which stay silent, disconnect or send garbage",
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=0,
+            help="processes to run the fake miners in, 0 runs them in the validator's event loop",
+        )
+        parser.add_argument("--base-port", type=int, default=18000)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        uvloop.install()
+        async_to_sync(self._run)(**options)
+
+    async def _run(
+        self,
+        *,
+        miners,
+        executors,
+        executor_class,
+        accept_ratio,
+        latency,
+        latency_sigma,
+        job_time,
+        slow_ratio,
+        slow_factor,
+        misbehaving_ratio,
+        processes,
+        base_port,
+        seed,
+        **options,
+    ):
+        configs = fake_miner_fleet_configs(
+            miners,
+            base_port,
+            executor_class=executor_class,
+            executor_count=executors,
+            accept_ratio=accept_ratio,
+            latency_median=latency,
+            latency_sigma=latency_sigma,
+            job_time=job_time,
+            slow_ratio=slow_ratio,
+            slow_factor=slow_factor,
+            misbehaving_ratio=misbehaving_ratio,
+            seed=seed,
+        )
+        serving_miners = [
+            (await Miner.objects.aget_or_create(hotkey=config.hotkey))[0] for config in configs
+        ]
+        axons = {
+            config.hotkey: bittensor.AxonInfo(
+                version=4,
+                ip=FAKE_MINER_HOST,
+                ip_type=4,
+                port=config.port,
+                hotkey=config.hotkey,
+                coldkey=config.hotkey,
+            )
+            for config in configs
+        }
+
+        fleet = FakeMinerFleet(configs, processes=processes)
+        await fleet.start()
+        started_at = now()
+        try:
+            await execute_synthetic_batch_run(axons, serving_miners)
+        finally:
+            sent = await fleet.stop()
+
+        await sync_to_async(self._report)(started_at, sent)
+
+    def _report(self, started_at, sent: list[SentMessage]) -> None:
+        batch_event = (
+            SystemEvent.objects.filter(
+                type=SystemEvent.EventType.VALIDATOR_TELEMETRY,
+                subtype=SystemEvent.EventSubType.SYNTHETIC_BATCH,
+                timestamp__gte=started_at,
+                data__stage_start_time__isnull=False,
+            )
+            .order_by("-timestamp")
+            .first()
+        )
+        if batch_event is None:
+            self.stderr.write("No batch telemetry found, the batch failed")
+            return
+        batch_data = batch_event.data
+        job_data = list(
+            SystemEvent.objects.filter(
+                type=SystemEvent.EventType.VALIDATOR_TELEMETRY,
+                subtype=SystemEvent.EventSubType.SYNTHETIC_JOB,
+                data__batch_uuid=batch_data["batch_uuid"],
+            ).values_list("data", flat=True)
+        )
+
+        self.stdout.write(f"batch {batch_data['batch_uuid']}: {batch_data['counts']}")
+        self.stdout.write(f"{'stage':<40} {'wall':>9} {'cpu':>9} {'peak rss':>12}")
+        for stage, duration, cpu_time, max_rss in _stage_report(batch_data):
+            cpu = f"{cpu_time:8.3f}s" if cpu_time is not None else f"{'-':>9}"
+            rss = f"{max_rss / 1024:9.1f}MiB" if max_rss is not None else f"{'-':>12}"
+            self.stdout.write(f"{stage:<40} {duration:8.3f}s {cpu} {rss}")
+
+        for executor_class, skew in sorted(_initial_send_skew(job_data).items()):
+            self.stdout.write(f"initial job request send skew {executor_class}: {skew:.6f}s")
+        if batch_data.get("job_send_skew") is not None:
+            self.stdout.write(f"job request send skew: {batch_data['job_send_skew']:.6f}s")
+
+        for message_type, errors in sorted(_response_time_errors(job_data, sent).items()):
+            self.stdout.write(
+                f"{message_type} timestamp error: n={len(errors)}"
+                f" p50={_percentile(errors, 50) * 1000:.3f}ms"
+                f" p99={_percentile(errors, 99) * 1000:.3f}ms"
+                f" max={max(errors) * 1000:.3f}ms"
+            )
@@ -17,6 +17,73 @@ class RecursiveMultiProcessCollector(multiprocess.MultiProcessCollector):
 
 ENV_VAR_NAME = "PROMETHEUS_MULTIPROC_DIR"
 
+# synthetic jobs batch, fed from BatchContext checkpoints and from Job timestamps.
+# in multiprocess mode every process (celery worker, batch shard) writes its
+# own files, which are merged by RecursiveMultiProcessCollector
+
+_SYNTHETIC_JOB_LATENCY_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    30,
+    60,
+    120,
+    300,
+)
+
+VALIDATOR_SYNTHETIC_JOB_SEND_DELAY = prometheus_client.Histogram(
+    "validator_synthetic_job_send_delay_seconds",
+    "Time from the start barrier to sending a request, including the stagger wait",
+    ["request", "executor_class"],
+    buckets=_SYNTHETIC_JOB_LATENCY_BUCKETS,
+)
+VALIDATOR_SYNTHETIC_JOB_SEND_DURATION = prometheus_client.Histogram(
+    "validator_synthetic_job_send_duration_seconds",
+    "Time it took to send a request",
+    ["request", "executor_class"],
+    buckets=_SYNTHETIC_JOB_LATENCY_BUCKETS,
+)
+VALIDATOR_SYNTHETIC_JOB_RESPONSE_LATENCY = prometheus_client.Histogram(
+    "validator_synthetic_job_response_latency_seconds",
+    "Time from sending a request to receiving the response",
+    ["response", "executor_class"],
+    buckets=_SYNTHETIC_JOB_LATENCY_BUCKETS,
+)
+VALIDATOR_SYNTHETIC_JOBS = prometheus_client.Counter(
+    "validator_synthetic_jobs",
+    "Synthetic jobs run",
+    ["executor_class", "outcome"],
+)
+VALIDATOR_SYNTHETIC_BATCH_STAGE_DURATION = prometheus_client.Histogram(
+    "validator_synthetic_batch_stage_duration_seconds",
+    "Duration of each stage of a synthetic jobs batch",
+    ["stage"],
+    buckets=_SYNTHETIC_JOB_LATENCY_BUCKETS,
+)
+VALIDATOR_SYNTHETIC_BATCH_SYSTEM_EVENTS = prometheus_client.Counter(
+    "validator_synthetic_batch_system_events",
+    "System events written to the database during synthetic jobs batches",
+)
+VALIDATOR_MINER_TRANSPORT_FLUSH_LATENCY = prometheus_client.Histogram(
+    "validator_miner_transport_flush_latency_seconds",
+    "Time the oldest of the messages written together to a miner waited in the send queue",
+    buckets=_SYNTHETIC_JOB_LATENCY_BUCKETS,
+)
+VALIDATOR_MINER_TRANSPORT_FLUSH_MESSAGES = prometheus_client.Histogram(
+    "validator_miner_transport_flush_messages",
+    "Number of messages written together to a miner",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250),
+)
+
 
 def metrics_view(request):
     """Exports metrics as a Django view"""
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.30 on 2026-10-17 06:30
+
+import uuid
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("validator", "0037_alter_promptseries_generator_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SyntheticJobBankEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("job_uuid", models.UUIDField(default=uuid.uuid4, unique=True)),
+                ("weights_version", models.IntegerField()),
+                (
+                    "hash_job",
+                    models.BinaryField(help_text="pickled hash job, including the passwords"),
+                ),
+                ("expected_answer", models.TextField()),
+                ("volume_contents", models.TextField()),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["weights_version", "created_at"],
+                        name="validator_s_weights_dad858_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.30 on 2026-10-17 07:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("validator", "0038_syntheticjobbankentry"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MinerReachability",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "consecutive_failures",
+                    models.IntegerField(
+                        default=0,
+                        help_text="Batches in a row in which the manifest could not be fetched",
+                    ),
+                ),
+                ("last_success_at", models.DateTimeField(null=True)),
+                ("last_failure_at", models.DateTimeField(null=True)),
+                (
+                    "miner",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="reachability",
+                        to="validator.miner",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Miner reachability",
+            },
+        ),
+    ]
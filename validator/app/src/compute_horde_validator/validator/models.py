@@ -116,6 +116,25 @@ class MinerBlacklist(models.Model):
         return f"hotkey: {self.miner.hotkey}"
 
 
+class MinerReachability(models.Model):
+    """
+    Whether the miner could be connected to and sent its manifest, over the past batches.
+    """
+
+    miner = models.OneToOneField(Miner, on_delete=models.CASCADE, related_name="reachability")
+    consecutive_failures = models.IntegerField(
+        default=0, help_text="Batches in a row in which the manifest could not be fetched"
+    )
+    last_success_at = models.DateTimeField(null=True)
+    last_failure_at = models.DateTimeField(null=True)
+
+    class Meta:
+        verbose_name_plural = "Miner reachability"
+
+    def __str__(self):
+        return f"hotkey: {self.miner.hotkey}, consecutive failures: {self.consecutive_failures}"
+
+
 class Cycle(models.Model):
     start = models.BigIntegerField()
     stop = models.BigIntegerField()
@@ -196,6 +215,27 @@ class SyntheticJob(JobBase):
     score = models.FloatField(default=0)
 
 
+class SyntheticJobBankEntry(models.Model):
+    """
+    A synthetic job generated ahead of time, waiting to be claimed by a batch run.
+    """
+
+    job_uuid = models.UUIDField(default=uuid.uuid4, unique=True)
+    weights_version = models.IntegerField()
+    hash_job = models.BinaryField(help_text="pickled hash job, including the passwords")
+    expected_answer = models.TextField()
+    volume_contents = models.TextField()
+    created_at = models.DateTimeField(default=now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["weights_version", "created_at"]),
+        ]
+
+    def __str__(self):
+        return f"uuid: {self.job_uuid} - weights_version: {self.weights_version}"
+
+
 class OrganicJob(JobBase):
     stdout = models.TextField(blank=True, default="")
     stderr = models.TextField(blank=True, default="")
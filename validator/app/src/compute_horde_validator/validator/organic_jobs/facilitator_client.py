@@ -9,6 +9,7 @@ import pydantic
 import tenacity
 import websockets
 from channels.layers import get_channel_layer
+from compute_horde.serialization import model_dumps
 from django.conf import settings
 from pydantic import BaseModel
 
@@ -27,7 +28,7 @@ from compute_horde_validator.validator.organic_jobs.facilitator_api import (
 )
 from compute_horde_validator.validator.organic_jobs.miner_client import MinerClient
 from compute_horde_validator.validator.organic_jobs.miner_driver import execute_organic_job
-from compute_horde_validator.validator.utils import MACHINE_SPEC_CHANNEL
+from compute_horde_validator.validator.utils import MACHINE_SPEC_CHANNEL, ws_compression_policy
 
 logger = logging.getLogger(__name__)
 
@@ -69,7 +70,11 @@ class FacilitatorClient:
             "X-Validator-Runner-Version": os.environ.get("VALIDATOR_RUNNER_VERSION", "unknown"),
             "X-Validator-Version": os.environ.get("VALIDATOR_VERSION", "unknown"),
         }
-        return websockets.connect(self.facilitator_uri, extra_headers=extra_headers)
+        return websockets.connect(
+            self.facilitator_uri,
+            extra_headers=extra_headers,
+            **ws_compression_policy().connect_kwargs(),
+        )
 
     async def miner_driver_awaiter(self):
         """avoid memory leak by awaiting miner driver tasks"""
@@ -129,7 +134,7 @@ class FacilitatorClient:
 
     async def handle_connection(self, ws: websockets.WebSocketClientProtocol):
         """handle a single websocket connection"""
-        await ws.send(AuthenticationRequest.from_keypair(self.keypair).model_dump_json())
+        await ws.send(model_dumps(AuthenticationRequest.from_keypair(self.keypair)))
 
         raw_msg = await ws.recv()
         try:
@@ -212,7 +217,7 @@ class FacilitatorClient:
     async def send_model(self, msg: BaseModel):
         if self.ws is None:
             raise websockets.ConnectionClosed(rcvd=None, sent=None)
-        await self.ws.send(msg.model_dump_json())
+        await self.ws.send(model_dumps(msg))
         # Summary: https://github.com/python-websockets/websockets/issues/867
         # Longer discussion: https://github.com/python-websockets/websockets/issues/865
         await asyncio.sleep(0)
@@ -262,6 +267,7 @@ class FacilitatorClient:
             miner_port=miner_axon_info.port,
             job_uuid=job_request.uuid,
             my_keypair=self.keypair,
+            compression=ws_compression_policy(),
         )
         await execute_organic_job(
             miner_client,
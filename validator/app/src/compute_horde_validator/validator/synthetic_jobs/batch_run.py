@@ -1,11 +1,13 @@
 import asyncio
 import logging
 import random
+import resource
 import statistics
+import threading
 import time
 import uuid
 from collections import defaultdict
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable, Iterator
 from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
 from typing import Any
@@ -41,22 +43,29 @@ from compute_horde.mv_protocol.validator_requests import (
     JobFinishedReceiptPayload,
     JobStartedReceiptPayload,
     V0AuthenticateRequest,
+    V0InitialJobBatchRequest,
     V0InitialJobRequest,
+    V0JobBatchRequest,
     V0JobFinishedReceiptRequest,
     V0JobRequest,
     V0JobStartedReceiptRequest,
+    V0ReceiptBatchRequest,
     VolumeType,
 )
 from compute_horde.transport import AbstractTransport, WSTransport
+from compute_horde.wire_format import SUPPORTED_WIRE_FORMATS, accepted_wire_format
+from constance import config
 from django.conf import settings
 from django.db import transaction
 from pydantic import BaseModel
 
+from compute_horde_validator.validator import metrics
 from compute_horde_validator.validator.models import (
     JobFinishedReceipt,
     JobStartedReceipt,
     Miner,
     MinerManifest,
+    MinerReachability,
     SyntheticJob,
     SyntheticJobBatch,
     SystemEvent,
@@ -65,8 +74,12 @@ from compute_horde_validator.validator.synthetic_jobs.generator import current
 from compute_horde_validator.validator.synthetic_jobs.generator.base import (
     BaseSyntheticJobGenerator,
 )
+from compute_horde_validator.validator.synthetic_jobs.persister import (
+    BatchPersister,
+    group_by_model,
+)
 from compute_horde_validator.validator.synthetic_jobs.scoring import get_manifest_multiplier
-from compute_horde_validator.validator.utils import MACHINE_SPEC_CHANNEL
+from compute_horde_validator.validator.utils import MACHINE_SPEC_CHANNEL, ws_compression_policy
 
 logger = logging.getLogger(__name__)
 
@@ -93,11 +106,30 @@ _JOB_RESPONSE_EXTRA_TIMEOUT = 2 * 60
 _GET_MANIFEST_TIMEOUT = 35
 _MAX_MINER_CLIENT_DEBOUNCE_COUNT = 4  # approximately 32 seconds
 
+# miners which failed to send their manifest in the past batches get a single
+# connection attempt, so they don't keep retrying next to the healthy ones
+_UNREACHABLE_MINER_GET_MANIFEST_TIMEOUT = 5
+
+# pre-warmed connections are pinged while waiting for the batch to start,
+# the ones which don't answer in time are closed and reconnected by the batch
+_PREWARM_PING_INTERVAL = 10
+_PREWARM_PING_TIMEOUT = 5
+
+# how long a batch shard waits for the other shards at a sync point, see BatchShardSync
+_SHARD_SYNC_TIMEOUT = 10 * 60
+# margin for all shards to see the agreed start time before it passes
+_SHARD_START_DELAY = 0.5
+
 # Celery job timeouts
 SYNTHETIC_JOBS_SOFT_LIMIT = 20 * 60
 SYNTHETIC_JOBS_HARD_LIMIT = SYNTHETIC_JOBS_SOFT_LIMIT + 10
 
 
+def _observe_transport_flush(messages: int, latency: float) -> None:
+    metrics.VALIDATOR_MINER_TRANSPORT_FLUSH_MESSAGES.observe(messages)
+    metrics.VALIDATOR_MINER_TRANSPORT_FLUSH_LATENCY.observe(latency)
+
+
 class MinerClient(AbstractMinerClient):
     def __init__(
         self,
@@ -116,9 +148,17 @@ class MinerClient(AbstractMinerClient):
 
         name = ctx.names[miner_hotkey]
         transport = transport or WSTransport(
-            name, self.miner_url(), max_retries=_MAX_MINER_CLIENT_DEBOUNCE_COUNT
+            name,
+            self.miner_url(),
+            max_retries=_MAX_MINER_CLIENT_DEBOUNCE_COUNT,
+            on_flush=_observe_transport_flush,
+            # the job requests are sent after the start barriers, compressing
+            # them would add to the send skew, see compute_horde.benchmarks.compression
+            compression=ws_compression_policy(compress_sent=False),
         )
         super().__init__(name, transport)
+        # the miner takes the requests of many jobs in one message, see V0InitialJobBatchRequest
+        self.batch_requests = False
 
     def miner_url(self) -> str:
         return f"ws://{self.miner_address}:{self.miner_port}/v0.1/validator_interface/{self.own_hotkey}"
@@ -168,6 +208,8 @@ class MinerClient(AbstractMinerClient):
         if isinstance(msg, V0ExecutorManifestRequest):
             if self.ctx.manifests[self.miner_hotkey] is None:
                 self.ctx.manifests[self.miner_hotkey] = msg.manifest
+                self.wire_format = accepted_wire_format(msg.wire_format)
+                self.batch_requests = msg.batch_requests
                 self.ctx.manifest_events[self.miner_hotkey].set()
             else:
                 logger.warning("%s duplicate message: %s", self.miner_name, msg.message_type)
@@ -193,11 +235,12 @@ class MinerClient(AbstractMinerClient):
         return V0AuthenticateRequest(
             payload=payload,
             signature=f"0x{self.own_keypair.sign(payload.blob_for_signing()).hex()}",
+            wire_formats=SUPPORTED_WIRE_FORMATS,
         )
 
     async def connect(self) -> None:
         await super().connect()
-        await self.transport.send(self.generate_authentication_message().model_dump_json())
+        await self.transport.send(self.generate_authentication_message().serialize())
 
     async def send_check(self, data: str | bytes) -> None:
         await self.send(data, error_event_callback=self._handle_send_error_event)
@@ -220,6 +263,65 @@ class ExceptionInfo:
     stage: str
 
 
+@dataclass
+class BatchShardSync:
+    """
+    Synchronizes the shards of a batch running in separate processes, see sharding.py.
+
+    `barrier` and `shared` are either a `multiprocessing` manager `Barrier` and `dict`
+    or, when shards run in threads (tests), a `threading.Barrier` and a plain `dict`.
+    """
+
+    index: int
+    count: int
+    batch_uuid: str
+    barrier: Any
+    shared: Any
+
+    def _wait(self) -> int:
+        return self.barrier.wait(_SHARD_SYNC_TIMEOUT)
+
+    async def synchronize(self, stage: str, max_spin_up_time: int = 0) -> int:
+        """
+        Wait until all shards reach `stage` and sleep until the common start time.
+        Returns the max spin-up time across all shards.
+
+        If a shard fails or times out the barrier is broken, and the rest of the
+        shards carry on unsynchronized rather than fail the whole batch.
+        """
+        self.shared[f"{stage}:{self.index}"] = max_spin_up_time
+        try:
+            if await asyncio.to_thread(self._wait) == 0:
+                self.shared[f"{stage}:start_at"] = time.time() + _SHARD_START_DELAY
+            await asyncio.to_thread(self._wait)
+        except threading.BrokenBarrierError:
+            logger.warning("Batch shard %d: %s sync failed, continuing", self.index, stage)
+            return max_spin_up_time
+
+        delay = self.shared[f"{stage}:start_at"] - time.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return max(self.shared[f"{stage}:{index}"] for index in range(self.count))
+
+    def abort(self) -> None:
+        # let the other shards carry on if this one can't reach a sync point
+        self.barrier.abort()
+
+
+@dataclass
+class BatchShardResult:
+    """
+    What a batch shard sends back to the parent process to be merged and persisted.
+    """
+
+    index: int
+    manifests: dict[str, ExecutorManifest | None]
+    online_executor_count: dict[str, int]
+    jobs: dict[str, "Job"]
+    stage_start_time: dict[str, datetime]
+    reachable: dict[str, bool] = field(default_factory=dict)
+
+
 @dataclass
 class Job:
     ctx: "BatchContext"
@@ -232,6 +334,15 @@ class Job:
     job_generator: BaseSyntheticJobGenerator
     volume_contents: str
 
+    # requests serialized in advance by _prepare_frames, in the wire format
+    # of the miner, so after the start barriers we only need to do the raw sends
+    initial_job_request_frame: str | bytes | None = None
+    job_request_frame: str | bytes | None = None
+    # for the miners taking batch requests, the job requests of all their
+    # ready jobs are sent together, see _multi_send_job_request
+    job_request: V0JobRequest | None = None
+    job_request_batch: "SharedFrame | None" = None
+
     # responses
 
     exception: BaseException | None = None
@@ -262,6 +373,8 @@ class Job:
     # receipts
     job_started_receipt: V0JobStartedReceiptRequest | None = None
     job_finished_receipt: V0JobFinishedReceiptRequest | None = None
+    # the job and its receipts were queued to ctx.persister
+    streamed: bool = False
 
     # scoring
 
@@ -278,6 +391,21 @@ class Job:
     score_manifest_multiplier: float | None = None
     average_job_send_time_bonus: timedelta | None = None
 
+    # jobs are pickled to send them from a batch shard process to the parent,
+    # the context and the events are bound to the shard's event loop
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        state["ctx"] = None
+        for key in ("accept_response_event", "executor_response_event", "job_response_event"):
+            del state[key]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.accept_response_event = asyncio.Event()
+        self.executor_response_event = asyncio.Event()
+        self.job_response_event = asyncio.Event()
+
     def handle_message(self, msg: BaseRequest) -> None:
         # !!! it is very important to not allow a newer message of a
         #     certain kind to override a previously received message
@@ -291,6 +419,7 @@ class Job:
                     self.accept_response = msg
                     self.accept_response_time = datetime.now(tz=UTC)
                     self.accept_response_event.set()
+                    self.ctx.initial_response_queue.put_nowait(self.uuid)
                 else:
                     duplicate = True
 
@@ -299,6 +428,7 @@ class Job:
                     self.executor_response = msg
                     self.executor_response_time = datetime.now(tz=UTC)
                     self.executor_response_event.set()
+                    self.ctx.initial_response_queue.put_nowait(self.uuid)
                 else:
                     duplicate = True
 
@@ -422,7 +552,41 @@ class BatchContext:
     event_count: int
 
     stage_start_time: dict[str, datetime]
+    # the stage being executed, its duration is observed when the next one starts
+    current_stage: str | None = None
+    # process CPU time (seconds) and peak RSS (KiB) when each stage started,
+    # the difference to the next stage is what the stage took
+    stage_cpu_time: dict[str, float] = field(default_factory=dict)
+    stage_max_rss: dict[str, int] = field(default_factory=dict)
     average_job_send_time: timedelta | None = None
+    # time spent serializing requests before the start barriers, the
+    # send skew this would have added if done after the barriers
+    frame_preparation_time: timedelta | None = None
+    # (miner hotkey, executor class) -> the initial job requests of all the jobs,
+    # for the miners taking batch requests
+    initial_job_batch_frames: dict[tuple[str, ExecutorClass], str | bytes] = field(
+        default_factory=dict
+    )
+    # time between the first and the last job request sent
+    job_send_skew: timedelta | None = None
+    # miners still connected with a cached manifest when the batch started,
+    # None if the connections were not pre-warmed
+    prewarmed_miners: int | None = None
+    # hotkeys of the miners which failed to send their manifest in the past
+    # batches, see MinerReachability
+    unreachable_hotkeys: set[str] = field(default_factory=set)
+    # whether the manifest was fetched in this batch, for the miners it was tried
+    reachable: dict[str, bool] = field(default_factory=dict)
+
+    # job.uuid of jobs with a new accept or executor response, or which failed
+    # to send the initial job request, see _multi_send_initial_job_request
+    initial_response_queue: asyncio.Queue[str] = field(default_factory=asyncio.Queue)
+
+    # set when running as one of the shards of a batch, see sharding.py
+    shard: BatchShardSync | None = None
+
+    # writes the finished jobs while the batch is still running, see persister.py
+    persister: BatchPersister | None = None
 
     # for tests
     _loop: asyncio.AbstractEventLoop | None = None
@@ -481,7 +645,14 @@ class BatchContext:
             if dt is None:
                 dt = datetime.now(tz=UTC)
             logger.info("STAGE: %s", stage)
+            if self.current_stage is not None:
+                metrics.VALIDATOR_SYNTHETIC_BATCH_STAGE_DURATION.labels(
+                    stage=self.current_stage
+                ).observe((dt - self.stage_start_time[self.current_stage]).total_seconds())
+            self.current_stage = stage
             self.stage_start_time[stage] = dt
+            self.stage_cpu_time[stage] = time.process_time()
+            self.stage_max_rss[stage] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
 
             event = self.system_event(
                 type=SystemEvent.EventType.VALIDATOR_TELEMETRY,
@@ -495,6 +666,7 @@ class BatchContext:
             )
             if event is not None:
                 event.save()
+                metrics.VALIDATOR_SYNTHETIC_BATCH_SYSTEM_EVENTS.inc()
         except Exception as exc:
             logger.error("Failed to checkpoint system event: %r", exc)
 
@@ -528,6 +700,13 @@ class BatchContext:
             jobs=job_count,
             system_events=self.event_count,
         )
+        if self.prewarmed_miners is not None:
+            counts["prewarmed_miners"] = self.prewarmed_miners
+        if self.unreachable_hotkeys:
+            counts["unreachable_miners"] = len(self.unreachable_hotkeys)
+            counts["recovered_miners"] = sum(
+                1 for hotkey in self.unreachable_hotkeys if self.reachable.get(hotkey)
+            )
 
         manifests = {}
         for miner_hotkey, manifest in self.manifests.items():
@@ -545,10 +724,16 @@ class BatchContext:
             stage_start_time={
                 stage: _datetime_dump(dt) for stage, dt in self.stage_start_time.items()
             },
+            stage_cpu_time=self.stage_cpu_time,
+            stage_max_rss=self.stage_max_rss,
             average_job_send_time=_timedelta_dump(self.average_job_send_time),
+            frame_preparation_time=_timedelta_dump(self.frame_preparation_time),
+            job_send_skew=_timedelta_dump(self.job_send_skew),
             counts=counts,
             manifests=manifests,
         )
+        if self.shard is not None:
+            data["shard"] = dict(index=self.shard.index, count=self.shard.count)
         return self.system_event(
             type=SystemEvent.EventType.VALIDATOR_TELEMETRY,
             subtype=SystemEvent.EventSubType.SYNTHETIC_BATCH,
@@ -601,6 +786,7 @@ def _init_context(
     serving_miners: list[Miner],
     batch_id: int | None = None,
     create_miner_client: Callable | None = None,
+    shard: BatchShardSync | None = None,
 ) -> BatchContext:
     own_wallet = settings.BITTENSOR_WALLET()
     own_keypair = own_wallet.get_hotkey()
@@ -608,7 +794,8 @@ def _init_context(
 
     ctx = BatchContext(
         batch_id=batch_id,
-        uuid=str(uuid.uuid4()),
+        # shards share the uuid of the batch, so their system events can be correlated
+        uuid=shard.batch_uuid if shard is not None else str(uuid.uuid4()),
         own_keypair=own_keypair,
         hotkeys=[],
         axons={},
@@ -626,6 +813,7 @@ def _init_context(
         events=[],
         event_count=0,
         stage_start_time={},
+        shard=shard,
         _loop=asyncio.get_running_loop(),
     )
 
@@ -720,11 +908,16 @@ async def _get_miner_manifest(
 ) -> None:
     await start_barrier.wait()
 
-    client = ctx.clients[miner_hotkey]
-
-    async with asyncio.timeout(_GET_MANIFEST_TIMEOUT):
+    # pre-warmed connections already have the manifest
+    if ctx.manifests[miner_hotkey] is None:
+        timeout = _GET_MANIFEST_TIMEOUT
+        if miner_hotkey in ctx.unreachable_hotkeys:
+            timeout = _UNREACHABLE_MINER_GET_MANIFEST_TIMEOUT
+            transport = ctx.clients[miner_hotkey].transport
+            if isinstance(transport, WSTransport):
+                transport.max_retries = 1
         try:
-            await client.connect()
+            await _connect_and_get_manifest(ctx, miner_hotkey, timeout)
         except TransportConnectionError as exc:
             name = ctx.names[miner_hotkey]
             logger.warning("%s connection error: %r", name, exc)
@@ -737,8 +930,6 @@ async def _get_miner_manifest(
             )
             return
 
-        await ctx.manifest_events[miner_hotkey].wait()
-
     manifest = ctx.manifests[miner_hotkey]
     assert manifest is not None
 
@@ -753,6 +944,97 @@ async def _get_miner_manifest(
             executors[executor_class] += executor_class_manifest.count
 
 
+async def _connect_and_get_manifest(
+    ctx: BatchContext, miner_hotkey: str, timeout: float = _GET_MANIFEST_TIMEOUT
+) -> None:
+    client = ctx.clients[miner_hotkey]
+
+    async with asyncio.timeout(timeout):
+        await client.connect()
+        await ctx.manifest_events[miner_hotkey].wait()
+
+
+async def _prewarm_miner_connection(
+    ctx: BatchContext, miner_hotkey: str, connections: dict[str, Any]
+) -> None:
+    try:
+        await _connect_and_get_manifest(ctx, miner_hotkey)
+    except (Exception, asyncio.CancelledError) as exc:
+        # the batch tries again and reports the failure
+        logger.info("%s failed to pre-warm connection: %r", ctx.names[miner_hotkey], exc)
+        return
+
+    transport = ctx.clients[miner_hotkey].transport
+    if isinstance(transport, WSTransport):
+        connections[miner_hotkey] = transport.ws
+
+
+async def _drop_prewarmed_connection(ctx: BatchContext, miner_hotkey: str) -> None:
+    # forget the manifest, so the batch connects again and gets a fresh one
+    ctx.manifests[miner_hotkey] = None
+    ctx.manifest_events[miner_hotkey].clear()
+    try:
+        await _close_client(ctx, miner_hotkey)
+    except (Exception, asyncio.CancelledError) as exc:
+        logger.info("%s failed to close client: %r", ctx.names[miner_hotkey], exc)
+
+
+async def _ping_miner(ctx: BatchContext, miner_hotkey: str, connections: dict[str, Any]) -> None:
+    transport = ctx.clients[miner_hotkey].transport
+    connection = connections[miner_hotkey]
+    try:
+        # the transport reconnects on its own when the connection drops,
+        # but the new connection is not authenticated
+        if transport.ws is not connection:
+            raise TransportConnectionError("reconnected")
+        pong_waiter = await connection.ping()
+        async with asyncio.timeout(_PREWARM_PING_TIMEOUT):
+            await pong_waiter
+    except Exception as exc:
+        logger.info("%s pre-warmed connection lost: %r", ctx.names[miner_hotkey], exc)
+        del connections[miner_hotkey]
+        await _drop_prewarmed_connection(ctx, miner_hotkey)
+
+
+async def _keep_miner_connections_alive(ctx: BatchContext, connections: dict[str, Any]) -> None:
+    while True:
+        await asyncio.sleep(_PREWARM_PING_INTERVAL)
+        await asyncio.gather(
+            *[_ping_miner(ctx, miner_hotkey, connections) for miner_hotkey in list(connections)]
+        )
+
+
+async def _prewarm_miner_connections(
+    ctx: BatchContext, wait_until: Callable[[], Awaitable[None]]
+) -> None:
+    """
+    Connect and authenticate to all the miners and get their manifests while waiting
+    for the batch to start, so the batch itself doesn't spend any time connecting.
+    The connections are pinged until then, the ones lost are left for the batch to
+    connect again.
+    """
+    # the websocket each pre-warmed miner was authenticated on
+    connections: dict[str, Any] = {}
+    prewarm_tasks = [
+        asyncio.create_task(
+            _prewarm_miner_connection(ctx, miner_hotkey, connections),
+            name=f"{miner_hotkey}._prewarm_miner_connection",
+        )
+        for miner_hotkey in ctx.hotkeys
+    ]
+    keepalive_task = asyncio.create_task(_keep_miner_connections_alive(ctx, connections))
+    try:
+        await wait_until()
+    finally:
+        # the batch starts now, whatever is not connected yet is left to it
+        for task in [*prewarm_tasks, keepalive_task]:
+            task.cancel()
+        await asyncio.gather(*prewarm_tasks, keepalive_task, return_exceptions=True)
+
+    ctx.prewarmed_miners = sum(1 for manifest in ctx.manifests.values() if manifest is not None)
+    logger.info("Pre-warmed connections to %d miners", ctx.prewarmed_miners)
+
+
 async def _close_client(ctx: BatchContext, miner_hotkey: str) -> None:
     client = ctx.clients[miner_hotkey]
 
@@ -764,12 +1046,27 @@ async def _generate_jobs(ctx: BatchContext) -> None:
     start_time = time.time()
     generated_job_count = 0
 
+    # create all the generators of an executor class at once, so the
+    # factory can hand out pre-generated jobs from the job bank.
+    # NOTE: this changes the order in which generators are handed out - all
+    # generators of the first executor class go first (to miners in order),
+    # then the next executor class, etc. - instead of miner by miner
+    total_executor_class_count: dict[ExecutorClass, int] = defaultdict(int)
+    for executors in ctx.executors.values():
+        for executor_class, count in executors.items():
+            total_executor_class_count[executor_class] += count
+    created_job_generators: dict[ExecutorClass, Iterator[BaseSyntheticJobGenerator]] = {}
+    for executor_class, count in total_executor_class_count.items():
+        created_job_generators[executor_class] = iter(
+            await current.synthetic_job_generator_factory.create_many(executor_class, count)
+        )
+
     for hotkey, executors in ctx.executors.items():
         miner_name = ctx.names[hotkey]
         for executor_class, count in executors.items():
             job_generators = []
             for _ in range(count):
-                job_generator = await current.synthetic_job_generator_factory.create(executor_class)
+                job_generator = next(created_job_generators[executor_class])
                 await job_generator.ainit()
                 job_uuid = str(job_generator.uuid())
                 ctx.jobs[job_uuid] = Job(
@@ -790,63 +1087,174 @@ async def _generate_jobs(ctx: BatchContext) -> None:
     logger.info("Generated %d jobs in %.2f seconds", generated_job_count, duration)
 
 
-async def _send_initial_job_request(
-    ctx: BatchContext, start_barrier: asyncio.Barrier, max_spin_up_time: int, job_uuid: str
-) -> None:
-    await start_barrier.wait()
-    barrier_time = datetime.now(tz=UTC)
+def _prepare_frames(ctx: BatchContext) -> None:
+    start_time = time.time()
 
-    job = ctx.jobs[job_uuid]
-    job.accept_barrier_time = barrier_time
-    client = ctx.clients[job.miner_hotkey]
+    initial_job_batches: dict[tuple[str, ExecutorClass], list[V0InitialJobRequest]] = defaultdict(
+        list
+    )
+    frame_count = 0
+    for job in ctx.jobs.values():
+        client = ctx.clients[job.miner_hotkey]
+        initial_job_request = V0InitialJobRequest(
+            job_uuid=job.uuid,
+            executor_class=job.executor_class,
+            base_docker_image_name=job.job_generator.base_docker_image_name(),
+            timeout_seconds=job.job_generator.timeout_seconds(),
+            volume_type=VolumeType.inline,
+        )
+        job.job_request = V0JobRequest(
+            job_uuid=job.uuid,
+            executor_class=job.executor_class,
+            docker_image_name=job.job_generator.docker_image_name(),
+            docker_run_options_preset=job.job_generator.docker_run_options_preset(),
+            docker_run_cmd=job.job_generator.docker_run_cmd(),
+            raw_script=job.job_generator.raw_script(),
+            volume=InlineVolume(contents=job.volume_contents),
+            output_upload=None,
+        )
+        if client.batch_requests:
+            initial_job_batches[(job.miner_hotkey, job.executor_class)].append(initial_job_request)
+        else:
+            job.initial_job_request_frame = initial_job_request.serialize(client.wire_format)
+            job.job_request_frame = job.job_request.serialize(client.wire_format)
+            frame_count += 2
+
+    # the jobs of an executor class are sent at the same stagger wait interval
+    for (miner_hotkey, executor_class), initial_job_requests in initial_job_batches.items():
+        client = ctx.clients[miner_hotkey]
+        ctx.initial_job_batch_frames[(miner_hotkey, executor_class)] = V0InitialJobBatchRequest(
+            jobs=initial_job_requests
+        ).serialize(client.wire_format)
+        frame_count += 1
+
+    duration = time.time() - start_time
+    ctx.frame_preparation_time = timedelta(seconds=duration)
+    logger.info(
+        "Prepared %d frames in %.2f seconds (send skew removed from after the start barriers)",
+        frame_count,
+        duration,
+    )
 
-    spin_up_time = EXECUTOR_CLASS[job.executor_class].spin_up_time
+
+def _get_stagger_wait_interval(max_spin_up_time: int, executor_class: ExecutorClass) -> int:
+    spin_up_time = EXECUTOR_CLASS[executor_class].spin_up_time
     assert spin_up_time is not None
     spin_up_time = max(spin_up_time, _MIN_SPIN_UP_TIME)
     stagger_wait_interval = max_spin_up_time - spin_up_time
     assert stagger_wait_interval >= 0
+    return stagger_wait_interval
+
+
+async def _send_initial_job_requests(ctx: BatchContext, job_uuids: list[str]) -> None:
+    """Send the prepared initial job requests of a single miner, one after another"""
+    jobs = [ctx.jobs[job_uuid] for job_uuid in job_uuids]
+    client = ctx.clients[jobs[0].miner_hotkey]
+    if client.batch_requests:
+        jobs_by_executor_class: dict[ExecutorClass, list[Job]] = defaultdict(list)
+        for job in jobs:
+            jobs_by_executor_class[job.executor_class].append(job)
+        for executor_class, batch_jobs in jobs_by_executor_class.items():
+            frame = ctx.initial_job_batch_frames[(client.miner_hotkey, executor_class)]
+            await _send_initial_job_frame(ctx, client, frame, batch_jobs)
+    else:
+        for job in jobs:
+            assert job.initial_job_request_frame is not None
+            await _send_initial_job_frame(ctx, client, job.initial_job_request_frame, [job])
 
-    request = V0InitialJobRequest(
-        job_uuid=job.uuid,
-        executor_class=job.executor_class,
-        base_docker_image_name=job.job_generator.base_docker_image_name(),
-        timeout_seconds=job.job_generator.timeout_seconds(),
-        volume_type=VolumeType.inline,
-    )
-    request_json = request.model_dump_json()
-
-    async with asyncio.timeout(max_spin_up_time):
-        if stagger_wait_interval > 0:
-            await asyncio.sleep(stagger_wait_interval)
 
+async def _send_initial_job_frame(
+    ctx: BatchContext, client: MinerClient, frame: str | bytes, jobs: list[Job]
+) -> None:
+    try:
         # send can block, so take a timestamp
         # on both sides to detect long send times
-        job.accept_before_sent_time = datetime.now(tz=UTC)
-        await client.send_check(request_json)
-        job.accept_after_sent_time = datetime.now(tz=UTC)
+        before_sent_time = datetime.now(tz=UTC)
+        for job in jobs:
+            job.accept_before_sent_time = before_sent_time
+        await client.send_check(frame)
+        after_sent_time = datetime.now(tz=UTC)
+        for job in jobs:
+            job.accept_after_sent_time = after_sent_time
+    except Exception as exc:
+        for job in jobs:
+            job.exception = exc
+            job.exception_time = datetime.now(tz=UTC)
+            job.exception_stage = "_send_initial_job_request"
+            # wake up _multi_send_initial_job_request, the job is done
+            ctx.initial_response_queue.put_nowait(job.uuid)
 
-        await job.accept_response_event.wait()
-        if isinstance(job.accept_response, V0AcceptJobRequest):
-            await job.executor_response_event.wait()
 
-    # send the receipt from outside the timeout
-    if isinstance(job.executor_response, V0ExecutorReadyRequest):
+async def _send_job_started_receipt(ctx: BatchContext, job: Job) -> None:
+    # the receipt contains the time the executor became
+    # ready, so unlike the requests it can't be prepared in advance
+    client = ctx.clients[job.miner_hotkey]
+    _generate_job_started_receipt(ctx, job)
+    assert job.job_started_receipt is not None
+    try:
+        receipt_frame = job.job_started_receipt.serialize(client.wire_format)
+        async with asyncio.timeout(_SEND_RECEIPT_TIMEOUT):
+            await client.send_check(receipt_frame)
+    except (Exception, asyncio.CancelledError) as exc:
+        logger.warning("%s failed to send job started receipt: %r", job.name, exc)
+        job.system_event(
+            type=SystemEvent.EventType.RECEIPT_FAILURE,
+            subtype=SystemEvent.EventSubType.RECEIPT_SEND_ERROR,
+            description=repr(exc),
+            func="_send_initial_job_request",
+        )
+
+
+async def _send_job_started_receipt_batch(ctx: BatchContext, jobs: list[Job]) -> None:
+    for job in jobs:
         _generate_job_started_receipt(ctx, job)
-        assert job.job_started_receipt is not None
-        try:
-            receipt_json = job.job_started_receipt.model_dump_json()
-            async with asyncio.timeout(_SEND_RECEIPT_TIMEOUT):
-                await client.send_check(receipt_json)
-        except (Exception, asyncio.CancelledError) as exc:
-            logger.warning("%s failed to send job started receipt: %r", job.name, exc)
+    await _send_receipt_batch(
+        ctx,
+        jobs,
+        V0ReceiptBatchRequest(
+            job_started_receipts=[
+                job.job_started_receipt for job in jobs if job.job_started_receipt
+            ]
+        ),
+        func="_send_initial_job_request",
+    )
+
+
+async def _send_receipt_batch(
+    ctx: BatchContext, jobs: list[Job], request: V0ReceiptBatchRequest, func: str
+) -> None:
+    client = ctx.clients[jobs[0].miner_hotkey]
+    try:
+        frame = request.serialize(client.wire_format)
+        async with asyncio.timeout(_SEND_RECEIPT_TIMEOUT):
+            await client.send_check(frame)
+    except (Exception, asyncio.CancelledError) as exc:
+        logger.warning("%s failed to send %d receipts: %r", client.miner_name, len(jobs), exc)
+        for job in jobs:
             job.system_event(
                 type=SystemEvent.EventType.RECEIPT_FAILURE,
                 subtype=SystemEvent.EventSubType.RECEIPT_SEND_ERROR,
                 description=repr(exc),
-                func="_send_initial_job_request",
+                func=func,
             )
 
 
+class SharedFrame:
+    """
+    A message with the requests of several jobs, sent once by whichever job gets to it first.
+    """
+
+    def __init__(self, frame: str | bytes):
+        self.frame = frame
+        self._send_task: asyncio.Task | None = None
+
+    async def send(self, client: MinerClient) -> None:
+        if self._send_task is None:
+            self._send_task = asyncio.create_task(client.send_check(self.frame))
+        # a job timing out doesn't cancel the send for the other jobs
+        await asyncio.shield(self._send_task)
+
+
 async def _send_job_request(
     ctx: BatchContext, start_barrier: asyncio.Barrier, job_uuid: str
 ) -> None:
@@ -857,30 +1265,26 @@ async def _send_job_request(
     job.job_barrier_time = barrier_time
     client = ctx.clients[job.miner_hotkey]
 
-    request = V0JobRequest(
-        job_uuid=job.uuid,
-        executor_class=job.executor_class,
-        docker_image_name=job.job_generator.docker_image_name(),
-        docker_run_options_preset=job.job_generator.docker_run_options_preset(),
-        docker_run_cmd=job.job_generator.docker_run_cmd(),
-        raw_script=job.job_generator.raw_script(),
-        volume=InlineVolume(contents=job.volume_contents),
-        output_upload=None,
-    )
-    request_json = request.model_dump_json()
+    request_frame = job.job_request_frame
+    assert request_frame is not None or job.job_request_batch is not None
 
     timeout = job.job_generator.timeout_seconds() + _JOB_RESPONSE_EXTRA_TIMEOUT
     async with asyncio.timeout(timeout):
         # send can block, so take a timestamp
         # on both sides to detect long send times
         job.job_before_sent_time = datetime.now(tz=UTC)
-        await client.send_check(request_json)
+        if job.job_request_batch is not None:
+            await job.job_request_batch.send(client)
+        else:
+            await client.send_check(request_frame)
         job.job_after_sent_time = datetime.now(tz=UTC)
 
         await job.job_response_event.wait()
 
 
 async def _send_job_finished_receipts(ctx: BatchContext) -> None:
+    # miner hotkey -> jobs, for the miners taking batch requests
+    receipt_batches: dict[str, list[Job]] = defaultdict(list)
     for job in ctx.jobs.values():
         # generate job finished receipts for all jobs
         # which returned a response, even if they failed
@@ -890,9 +1294,12 @@ async def _send_job_finished_receipts(ctx: BatchContext) -> None:
                 _generate_job_finished_receipt(ctx, job)
                 assert job.job_finished_receipt is not None
 
-                receipt_json = job.job_finished_receipt.model_dump_json()
-                async with asyncio.timeout(_SEND_RECEIPT_TIMEOUT):
-                    await client.send_check(receipt_json)
+                if client.batch_requests:
+                    receipt_batches[job.miner_hotkey].append(job)
+                else:
+                    receipt_frame = job.job_finished_receipt.serialize(client.wire_format)
+                    async with asyncio.timeout(_SEND_RECEIPT_TIMEOUT):
+                        await client.send_check(receipt_frame)
 
             except (Exception, asyncio.CancelledError) as exc:
                 logger.warning("%s failed to send job finished receipt: %r", job.name, exc)
@@ -903,6 +1310,28 @@ async def _send_job_finished_receipts(ctx: BatchContext) -> None:
                     func="_send_job_finished_receipts",
                 )
 
+        # the job is final once its receipt is generated, it's written
+        # while the receipts of the remaining jobs are being sent
+        if ctx.persister is not None:
+            try:
+                await ctx.persister.add(*_job_rows(ctx, job))
+                job.streamed = True
+            except Exception as exc:
+                # not streamed jobs are written by _db_persist
+                logger.warning("%s failed to stream: %r", job.name, exc)
+
+    for jobs in receipt_batches.values():
+        await _send_receipt_batch(
+            ctx,
+            jobs,
+            V0ReceiptBatchRequest(
+                job_finished_receipts=[
+                    job.job_finished_receipt for job in jobs if job.job_finished_receipt
+                ]
+            ),
+            func="_send_job_finished_receipts",
+        )
+
 
 def _emit_decline_or_failure_events(ctx: BatchContext) -> None:
     for job in ctx.jobs.values():
@@ -935,6 +1364,66 @@ def _emit_telemetry_events(ctx: BatchContext) -> None:
     for job in ctx.jobs.values():
         job.emit_telemetry_event()
 
+    _observe_job_metrics(ctx)
+
+
+def _observe_latency(
+    histogram, start: datetime | None, end: datetime | None, **labels: str
+) -> None:
+    if start is not None and end is not None:
+        histogram.labels(**labels).observe((end - start).total_seconds())
+
+
+def _observe_job_metrics(ctx: BatchContext) -> None:
+    for job in ctx.jobs.values():
+        executor_class = job.executor_class.value
+        for request, barrier_time, before_sent_time, after_sent_time in (
+            (
+                "initial_job_request",
+                job.accept_barrier_time,
+                job.accept_before_sent_time,
+                job.accept_after_sent_time,
+            ),
+            (
+                "job_request",
+                job.job_barrier_time,
+                job.job_before_sent_time,
+                job.job_after_sent_time,
+            ),
+        ):
+            _observe_latency(
+                metrics.VALIDATOR_SYNTHETIC_JOB_SEND_DELAY,
+                barrier_time,
+                before_sent_time,
+                request=request,
+                executor_class=executor_class,
+            )
+            _observe_latency(
+                metrics.VALIDATOR_SYNTHETIC_JOB_SEND_DURATION,
+                before_sent_time,
+                after_sent_time,
+                request=request,
+                executor_class=executor_class,
+            )
+
+        for response, sent_time, response_time in (
+            ("accept", job.accept_after_sent_time, job.accept_response_time),
+            ("executor_ready", job.accept_after_sent_time, job.executor_response_time),
+            ("job", job.job_after_sent_time, job.job_response_time),
+        ):
+            _observe_latency(
+                metrics.VALIDATOR_SYNTHETIC_JOB_RESPONSE_LATENCY,
+                sent_time,
+                response_time,
+                response=response,
+                executor_class=executor_class,
+            )
+
+        metrics.VALIDATOR_SYNTHETIC_JOBS.labels(
+            executor_class=executor_class,
+            outcome="success" if job.success else "failure",
+        ).inc()
+
 
 async def _send_machine_specs(ctx: BatchContext) -> None:
     channel_layer = get_channel_layer()
@@ -1007,6 +1496,10 @@ async def _multi_get_miner_manifest(ctx: BatchContext) -> None:
         else:
             assert result is None
 
+    ctx.reachable = {
+        miner_hotkey: ctx.manifests[miner_hotkey] is not None for miner_hotkey in ctx.hotkeys
+    }
+
 
 async def _multi_close_client(ctx: BatchContext) -> None:
     tasks = [
@@ -1029,29 +1522,105 @@ async def _multi_close_client(ctx: BatchContext) -> None:
 
 
 async def _multi_send_initial_job_request(ctx: BatchContext) -> None:
+    """
+    Send the initial job requests, staggered so all executors are ready at the same time.
+
+    Instead of a task and a timer for every job, jobs are grouped by their stagger wait
+    interval and a single scheduler fires each group at its offset, with one sending task
+    per miner connection. The responses are collected from `ctx.initial_response_queue`.
+    """
     max_spin_up_time = _get_max_spin_up_time(ctx)
+    if ctx.shard is not None:
+        # all shards start at the same time and stagger against the same spin-up time
+        max_spin_up_time = await ctx.shard.synchronize(
+            "_multi_send_initial_job_request", max_spin_up_time
+        )
     logger.debug("Max spin-up time: %d seconds", max_spin_up_time)
 
     logger.info("Sending initial job requests for %d jobs", len(ctx.job_uuids))
-    start_barrier = asyncio.Barrier(len(ctx.job_uuids))
-    tasks = [
-        asyncio.create_task(
-            _send_initial_job_request(ctx, start_barrier, max_spin_up_time, job_uuid),
-            name=f"{job_uuid}._send_initial_job_request",
-        )
-        for job_uuid in ctx.job_uuids
-    ]
 
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    # stagger wait interval -> miner hotkey -> job uuids (in the randomized order)
+    schedule: dict[int, dict[str, list[str]]] = defaultdict(lambda: defaultdict(list))
+    barrier_time = datetime.now(tz=UTC)
+    for job_uuid in ctx.job_uuids:
+        job = ctx.jobs[job_uuid]
+        job.accept_barrier_time = barrier_time
+        stagger_wait_interval = _get_stagger_wait_interval(max_spin_up_time, job.executor_class)
+        schedule[stagger_wait_interval][job.miner_hotkey].append(job_uuid)
+
+    send_tasks: list[asyncio.Task] = []
+    receipt_tasks: list[asyncio.Task] = []
+    # miner hotkey -> ready jobs, for the miners taking batch requests
+    receipt_batches: dict[str, list[Job]] = defaultdict(list)
+
+    async def _fire_scheduled_sends() -> None:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for stagger_wait_interval in sorted(schedule):
+            delay = start + stagger_wait_interval - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            for miner_hotkey, job_uuids in schedule[stagger_wait_interval].items():
+                send_tasks.append(
+                    asyncio.create_task(
+                        _send_initial_job_requests(ctx, job_uuids),
+                        name=f"{miner_hotkey}._send_initial_job_requests",
+                    )
+                )
 
-    exceptions: list[ExceptionInfo] = []
-    for i, result in enumerate(results):
-        if isinstance(result, BaseException):
-            job_uuid = ctx.job_uuids[i]
+    pending = set(ctx.job_uuids)
+    scheduler_task = asyncio.create_task(_fire_scheduled_sends(), name="_fire_scheduled_sends")
+    try:
+        async with asyncio.timeout(max_spin_up_time):
+            while pending:
+                job_uuid = await ctx.initial_response_queue.get()
+                if job_uuid not in pending:
+                    continue
+                job = ctx.jobs[job_uuid]
+                if job.exception is not None:
+                    pending.remove(job_uuid)
+                elif isinstance(job.accept_response, V0DeclineJobRequest):
+                    pending.remove(job_uuid)
+                elif (
+                    isinstance(job.accept_response, V0AcceptJobRequest)
+                    and job.executor_response is not None
+                ):
+                    pending.remove(job_uuid)
+                    if isinstance(job.executor_response, V0ExecutorReadyRequest):
+                        if ctx.clients[job.miner_hotkey].batch_requests:
+                            receipt_batches[job.miner_hotkey].append(job)
+                            continue
+                        receipt_tasks.append(
+                            asyncio.create_task(
+                                _send_job_started_receipt(ctx, job),
+                                name=f"{job_uuid}._send_job_started_receipt",
+                            )
+                        )
+    except TimeoutError:
+        for job_uuid in pending:
             job = ctx.jobs[job_uuid]
-            job.exception = result
+            job.exception = TimeoutError()
             job.exception_time = datetime.now(tz=UTC)
             job.exception_stage = "_send_initial_job_request"
+    finally:
+        for task in [scheduler_task, *send_tasks]:
+            task.cancel()
+        await asyncio.gather(scheduler_task, *send_tasks, return_exceptions=True)
+
+    # receipts are sent outside the timeout
+    for miner_hotkey, jobs in receipt_batches.items():
+        receipt_tasks.append(
+            asyncio.create_task(
+                _send_job_started_receipt_batch(ctx, jobs),
+                name=f"{miner_hotkey}._send_job_started_receipt_batch",
+            )
+        )
+    await asyncio.gather(*receipt_tasks, return_exceptions=True)
+
+    exceptions: list[ExceptionInfo] = []
+    for job_uuid in ctx.job_uuids:
+        job = ctx.jobs[job_uuid]
+        if job.exception is not None and job.exception_stage == "_send_initial_job_request":
             exceptions.append(
                 ExceptionInfo(
                     exception=job.exception,
@@ -1060,8 +1629,6 @@ async def _multi_send_initial_job_request(ctx: BatchContext) -> None:
                     stage=job.exception_stage,
                 )
             )
-        else:
-            assert result is None
     _handle_exceptions(ctx, exceptions)
 
 
@@ -1076,6 +1643,20 @@ async def _multi_send_job_request(ctx: BatchContext) -> None:
         and job.job_response is None
     ]
     logger.info("Sending job requests for %d ready jobs", len(executor_ready_job_uuids))
+
+    # the ready jobs of a miner taking batch requests share a single message
+    batch_jobs: dict[str, list[Job]] = defaultdict(list)
+    for job_uuid in executor_ready_job_uuids:
+        job = ctx.jobs[job_uuid]
+        if ctx.clients[job.miner_hotkey].batch_requests:
+            batch_jobs[job.miner_hotkey].append(job)
+    for miner_hotkey, jobs in batch_jobs.items():
+        client = ctx.clients[miner_hotkey]
+        request = V0JobBatchRequest(jobs=[job.job_request for job in jobs if job.job_request])
+        shared_frame = SharedFrame(request.serialize(client.wire_format))
+        for job in jobs:
+            job.job_request_batch = shared_frame
+
     start_barrier = asyncio.Barrier(len(executor_ready_job_uuids))
     tasks = [
         asyncio.create_task(
@@ -1127,6 +1708,17 @@ def _compute_average_send_time(ctx: BatchContext) -> None:
     ctx.average_job_send_time = timedelta(seconds=average_duration_sec)
     logger.info("Average job send time: %.6f seconds", average_duration_sec)
 
+    before_sent_times = [
+        job.job_before_sent_time for job in ctx.jobs.values() if job.job_before_sent_time
+    ]
+    if before_sent_times:
+        ctx.job_send_skew = max(before_sent_times) - min(before_sent_times)
+        logger.info(
+            "Job send skew: %.6f seconds (%.6f seconds of frame preparation done in advance)",
+            ctx.job_send_skew.total_seconds(),
+            _timedelta_dump(ctx.frame_preparation_time) or 0,
+        )
+
 
 async def _score_job(ctx: BatchContext, job: Job) -> None:
     job.score = 0
@@ -1278,6 +1870,53 @@ def _db_get_previous_online_executor_count(ctx: BatchContext) -> None:
             )
 
 
+# sync_to_async is needed since we use the sync Django ORM
+@sync_to_async
+def _db_get_unreachable_miners(ctx: BatchContext) -> None:
+    min_failures = config.DYNAMIC_SYNTHETIC_JOBS_UNREACHABLE_MINER_FAILURES
+    if min_failures <= 0:
+        return
+
+    ctx.unreachable_hotkeys = set(
+        MinerReachability.objects.filter(
+            miner__hotkey__in=ctx.hotkeys,
+            consecutive_failures__gte=min_failures,
+        ).values_list("miner__hotkey", flat=True)
+    )
+    if ctx.unreachable_hotkeys:
+        logger.info(
+            "%d miners failed to send their manifest in the past batches",
+            len(ctx.unreachable_hotkeys),
+        )
+
+
+def db_record_miner_reachability(miners: list[Miner], reachable: dict[str, bool]) -> None:
+    timestamp = datetime.now(tz=UTC)
+    existing = {
+        reachability.miner_id: reachability
+        for reachability in MinerReachability.objects.filter(miner__in=miners)
+    }
+    reachabilities = []
+    for miner in miners:
+        if miner.hotkey not in reachable:
+            continue
+        reachability = existing.get(miner.id) or MinerReachability(miner=miner)
+        if reachable[miner.hotkey]:
+            reachability.consecutive_failures = 0
+            reachability.last_success_at = timestamp
+        else:
+            reachability.consecutive_failures += 1
+            reachability.last_failure_at = timestamp
+        reachabilities.append(reachability)
+
+    MinerReachability.objects.bulk_create(
+        reachabilities,
+        update_conflicts=True,
+        unique_fields=["miner"],
+        update_fields=["consecutive_failures", "last_success_at", "last_failure_at"],
+    )
+
+
 # sync_to_async is needed since we use the sync Django ORM
 @sync_to_async
 def _db_persist_system_events(ctx: BatchContext) -> None:
@@ -1290,6 +1929,7 @@ def _db_persist_system_events(ctx: BatchContext) -> None:
         # a previous call, but the operation failed before clearing
         # the events list, so ignore insert conflicts
         SystemEvent.objects.bulk_create(ctx.events, ignore_conflicts=True)
+        metrics.VALIDATOR_SYNTHETIC_BATCH_SYSTEM_EVENTS.inc(len(ctx.events))
         # we call this function multiple times during a batch,
         # clear the list to avoid persisting the same event
         # multiple times
@@ -1298,96 +1938,119 @@ def _db_persist_system_events(ctx: BatchContext) -> None:
         logger.error("Failed to persist system events: %r", exc)
 
 
+# sync_to_async is needed since we use the sync Django ORM
+@sync_to_async
+def _db_create_batch(ctx: BatchContext) -> None:
+    # the streamed jobs need the batch, it's only marked as finished by _db_persist
+    if ctx.batch_id is None:
+        batch = SyntheticJobBatch.objects.create(started_at=ctx.stage_start_time["BATCH_BEGIN"])
+        ctx.batch_id = batch.id
+
+
+def _job_rows(
+    ctx: BatchContext, job: Job
+) -> list[SyntheticJob | JobStartedReceipt | JobFinishedReceipt]:
+    axon = ctx.axons[job.miner_hotkey]
+    rows: list[SyntheticJob | JobStartedReceipt | JobFinishedReceipt] = [
+        SyntheticJob(
+            job_uuid=job.uuid,
+            batch_id=ctx.batch_id,
+            miner=ctx.miners[job.miner_hotkey],
+            miner_address=axon.ip,
+            miner_address_ip_version=axon.ip_type,
+            miner_port=axon.port,
+            executor_class=job.executor_class,
+            status=SyntheticJob.Status.COMPLETED if job.success else SyntheticJob.Status.FAILED,
+            comment=job.comment,
+            job_description=job.job_generator.job_description(),
+            score=job.score,
+        )
+    ]
+
+    if job.job_started_receipt is not None:
+        started_payload = job.job_started_receipt.payload
+        rows.append(
+            JobStartedReceipt(
+                job_uuid=started_payload.job_uuid,
+                miner_hotkey=started_payload.miner_hotkey,
+                validator_hotkey=started_payload.validator_hotkey,
+                executor_class=started_payload.executor_class,
+                time_accepted=started_payload.time_accepted,
+                max_timeout=started_payload.max_timeout,
+            )
+        )
+
+    if job.job_finished_receipt is not None:
+        finished_payload = job.job_finished_receipt.payload
+        rows.append(
+            JobFinishedReceipt(
+                job_uuid=finished_payload.job_uuid,
+                miner_hotkey=finished_payload.miner_hotkey,
+                validator_hotkey=finished_payload.validator_hotkey,
+                time_started=finished_payload.time_started,
+                time_took_us=finished_payload.time_took_us,
+                score_str=finished_payload.score_str,
+            )
+        )
+
+    return rows
+
+
 # sync_to_async is needed since we use the sync Django ORM
 @sync_to_async
 def _db_persist(ctx: BatchContext) -> None:
     start_time = time.time()
 
-    # persist the batch and the jobs in the same transaction, to
-    # prevent a situation where because of a crash only some of
-    # the jobs are saved, which would generate incorrect weights
+    # the jobs streamed by ctx.persister are already written, write the rest and
+    # mark the batch as finished in the same transaction. the scoring skips the
+    # batches which are not finished, so a crash leaving only some of the jobs
+    # written can't generate incorrect weights
     with transaction.atomic():
         if ctx.batch_id is not None:
             batch = SyntheticJobBatch.objects.get(id=ctx.batch_id)
         else:
-            batch = SyntheticJobBatch(
+            batch = SyntheticJobBatch.objects.create(
                 started_at=ctx.stage_start_time["BATCH_BEGIN"],
             )
-        # accepting_results_until is not used anywhere, it doesn't
-        # matter that we pick a somewhat arbitrary time for it
-        now = datetime.now(tz=UTC)
-        batch.accepting_results_until = ctx.stage_start_time.get("_multi_send_job_request", now)
-        batch.save()
+            ctx.batch_id = batch.id
 
-        synthetic_jobs: list[SyntheticJob] = []
+        rows: list[Any] = []
         for job in ctx.jobs.values():
-            axon = ctx.axons[job.miner_hotkey]
-            miner = ctx.miners[job.miner_hotkey]
-            status = SyntheticJob.Status.COMPLETED if job.success else SyntheticJob.Status.FAILED
-            synthetic_job = SyntheticJob(
-                job_uuid=job.uuid,
-                batch=batch,
-                miner=miner,
-                miner_address=axon.ip,
-                miner_address_ip_version=axon.ip_type,
-                miner_port=axon.port,
-                executor_class=job.executor_class,
-                status=status,
-                comment=job.comment,
-                job_description=job.job_generator.job_description(),
-                score=job.score,
-            )
-            synthetic_jobs.append(synthetic_job)
-        SyntheticJob.objects.bulk_create(synthetic_jobs)
-
-    miner_manifests: list[MinerManifest] = []
-    for miner in ctx.miners.values():
-        manifest = ctx.manifests[miner.hotkey]
-        if manifest is not None:
-            miner_manifests.append(
-                MinerManifest(
-                    miner=miner,
-                    batch=batch,
-                    executor_count=manifest.total_count,
-                    online_executor_count=ctx.online_executor_count[miner.hotkey],
+            if not job.streamed:
+                rows.extend(_job_rows(ctx, job))
+        if ctx.persister is not None:
+            rows.extend(ctx.persister.failed)
+        for model, model_rows in group_by_model(rows).items():
+            model.objects.bulk_create(model_rows)
+
+        miner_manifests: list[MinerManifest] = []
+        for miner in ctx.miners.values():
+            manifest = ctx.manifests[miner.hotkey]
+            if manifest is not None:
+                miner_manifests.append(
+                    MinerManifest(
+                        miner=miner,
+                        batch=batch,
+                        executor_count=manifest.total_count,
+                        online_executor_count=ctx.online_executor_count[miner.hotkey],
+                    )
                 )
-            )
-    MinerManifest.objects.bulk_create(miner_manifests)
+        MinerManifest.objects.bulk_create(miner_manifests)
 
-    job_started_receipts: list[JobStartedReceipt] = []
-    for job in ctx.jobs.values():
-        if job.job_started_receipt is not None:
-            payload = job.job_started_receipt.payload
-            job_started_receipts.append(
-                JobStartedReceipt(
-                    job_uuid=payload.job_uuid,
-                    miner_hotkey=payload.miner_hotkey,
-                    validator_hotkey=payload.validator_hotkey,
-                    executor_class=payload.executor_class,
-                    time_accepted=payload.time_accepted,
-                    max_timeout=payload.max_timeout,
-                )
-            )
-    JobStartedReceipt.objects.bulk_create(job_started_receipts)
+        # the scoring only picks up batches no longer accepting results
+        now = datetime.now(tz=UTC)
+        batch.accepting_results_until = ctx.stage_start_time.get("_multi_send_job_request", now)
+        batch.save()
 
-    job_finished_receipts: list[JobFinishedReceipt] = []
-    for job in ctx.jobs.values():
-        if job.job_finished_receipt is not None:
-            payload = job.job_finished_receipt.payload
-            job_finished_receipts.append(
-                JobFinishedReceipt(
-                    job_uuid=payload.job_uuid,
-                    miner_hotkey=payload.miner_hotkey,
-                    validator_hotkey=payload.validator_hotkey,
-                    time_started=payload.time_started,
-                    time_took_us=payload.time_took_us,
-                    score_str=payload.score_str,
-                )
-            )
-    JobFinishedReceipt.objects.bulk_create(job_finished_receipts)
+    db_record_miner_reachability(list(ctx.miners.values()), ctx.reachable)
 
     duration = time.time() - start_time
-    logger.info("Persisted to database in %.2f seconds", duration)
+    streamed = ctx.persister.written if ctx.persister is not None else 0
+    logger.info(
+        "Persisted to database in %.2f seconds, %d rows were streamed before",
+        duration,
+        streamed,
+    )
 
 
 async def execute_synthetic_batch_run(
@@ -1395,10 +2058,21 @@ async def execute_synthetic_batch_run(
     serving_miners: list[Miner],
     batch_id: int | None = None,
     create_miner_client: Callable | None = None,
-) -> None:
+    shard: BatchShardSync | None = None,
+    wait_until: Callable[[], Awaitable[None]] | None = None,
+) -> BatchShardResult | None:
+    """
+    Run a synthetic jobs batch and persist the results.
+
+    With `shard`, run a single shard of a batch instead, see sharding.py. The results
+    are returned to be merged with the other shards and persisted by the caller.
+
+    With `wait_until`, the connections to the miners are opened while awaiting it and
+    the jobs start when it returns.
+    """
     if not axons or not serving_miners:
         logger.warning("No miners provided")
-        return
+        return None
 
     start_time = datetime.now(tz=UTC)
     logger.info("Executing synthetic jobs batch for %d miners", len(serving_miners))
@@ -1406,13 +2080,25 @@ async def execute_synthetic_batch_run(
     # randomize the order of miners each batch to avoid systemic bias
     random.shuffle(serving_miners)
 
-    ctx = _init_context(axons, serving_miners, batch_id, create_miner_client)
+    ctx = _init_context(axons, serving_miners, batch_id, create_miner_client, shard)
     await ctx.checkpoint_system_event("BATCH_BEGIN", dt=start_time)
 
     try:
         await ctx.checkpoint_system_event("_db_get_previous_online_executor_count")
         await _db_get_previous_online_executor_count(ctx)
 
+        await ctx.checkpoint_system_event("_db_get_unreachable_miners")
+        await _db_get_unreachable_miners(ctx)
+
+        if ctx.shard is None:
+            await ctx.checkpoint_system_event("_db_create_batch")
+            await _db_create_batch(ctx)
+            ctx.persister = BatchPersister()
+
+        if wait_until is not None:
+            await ctx.checkpoint_system_event("_prewarm_miner_connections")
+            await _prewarm_miner_connections(ctx, wait_until)
+
         await ctx.checkpoint_system_event("_multi_get_miner_manifest")
         await _multi_get_miner_manifest(ctx)
 
@@ -1423,12 +2109,19 @@ async def execute_synthetic_batch_run(
             await ctx.checkpoint_system_event("_generate_jobs")
             await _generate_jobs(ctx)
 
+            await ctx.checkpoint_system_event("_prepare_frames")
+            _prepare_frames(ctx)
+
             # randomize the order of jobs each batch to avoid systemic bias
             random.shuffle(ctx.job_uuids)
 
             await ctx.checkpoint_system_event("_multi_send_initial_job_request")
             await _multi_send_initial_job_request(ctx)
 
+            if ctx.shard is not None:
+                # all shards send the job requests at the same time
+                await ctx.shard.synchronize("_multi_send_job_request")
+
             if any(
                 isinstance(job.accept_response, V0AcceptJobRequest) for job in ctx.jobs.values()
             ):
@@ -1461,6 +2154,10 @@ async def execute_synthetic_batch_run(
 
         else:
             logger.warning("No executors available")
+            if ctx.shard is not None:
+                # still go through the sync points, the other shards wait for us
+                await ctx.shard.synchronize("_multi_send_initial_job_request")
+                await ctx.shard.synchronize("_multi_send_job_request")
 
     except (Exception, asyncio.CancelledError) as exc:
         logger.error("Synthetic jobs batch failure: %r", exc)
@@ -1470,6 +2167,8 @@ async def execute_synthetic_batch_run(
             description=repr(exc),
             func="execute_synthetic_batch_run",
         )
+        if ctx.shard is not None:
+            ctx.shard.abort()
 
     await _db_persist_system_events(ctx)
 
@@ -1499,7 +2198,20 @@ async def execute_synthetic_batch_run(
 
     await _db_persist_system_events(ctx)
 
+    if ctx.shard is not None:
+        await ctx.checkpoint_system_event("BATCH_SHARD_END")
+        return BatchShardResult(
+            index=ctx.shard.index,
+            manifests=ctx.manifests,
+            online_executor_count=ctx.online_executor_count,
+            jobs=ctx.jobs,
+            stage_start_time=ctx.stage_start_time,
+            reachable=ctx.reachable,
+        )
+
     await ctx.checkpoint_system_event("_db_persist")
+    if ctx.persister is not None:
+        await ctx.persister.close()
     await _db_persist(ctx)
 
     # send the machine specs after the batch is done, it can fail or take a long time
@@ -1512,3 +2224,4 @@ async def execute_synthetic_batch_run(
     await _db_persist_system_events(ctx)
 
     await ctx.checkpoint_system_event("BATCH_END")
+    return None
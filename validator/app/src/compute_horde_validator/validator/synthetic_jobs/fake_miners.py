@@ -0,0 +1,294 @@
+"""
+A fleet of fake miners speaking the validator interface over real websockets on localhost,
+for load testing `execute_synthetic_batch_run` offline, see the
+`benchmark_synthetic_jobs_batch` management command.
+
+Fake miners don't run anything, they answer after a configurable latency. Every response
+is timestamped right before it is written to the socket, so the times recorded by the
+validator can be checked against it. This module does not touch Django, so the fleet can
+run in `spawn`ed processes, away from the event loop being measured.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import multiprocessing
+import random
+import time
+from dataclasses import dataclass, field
+
+import websockets
+from compute_horde.executor_class import DEFAULT_EXECUTOR_CLASS, ExecutorClass
+from compute_horde.mv_protocol import miner_requests
+from compute_horde.wire_format import WireFormat, choose_wire_format, is_msgpack, msgpack_loads
+
+logger = logging.getLogger(__name__)
+
+FAKE_MINER_HOST = "127.0.0.1"
+
+# ways a fake miner can misbehave after accepting a connection
+MISBEHAVIOURS = (
+    # never answers the initial job requests
+    "silent",
+    # drops the connection when it gets an initial job request
+    "disconnect",
+    # answers the initial job requests with something that isn't a message
+    "garbage",
+)
+
+
+@dataclass
+class FakeMinerConfig:
+    hotkey: str
+    port: int
+    executor_class: ExecutorClass = DEFAULT_EXECUTOR_CLASS
+    executor_count: int = 1
+    accept_ratio: float = 1.0
+    # response latency is log-normal, the median is in seconds
+    latency_median: float = 0.01
+    latency_sigma: float = 0.5
+    # extra time between accepting a job and the executor being ready
+    executor_ready_delay: float = 0.0
+    job_time: float = 0.5
+    misbehaviour: str | None = None
+    seed: int | None = None
+    # speaks only JSON and ignores the wire format negotiation, like the older miners
+    json_only: bool = False
+    # takes the requests of many jobs in one message, see V0InitialJobBatchRequest
+    batch_requests: bool = False
+
+
+@dataclass
+class SentMessage:
+    miner_hotkey: str
+    job_uuid: str | None
+    message_type: str
+    # time.time() right before the message was written to the socket
+    timestamp: float
+
+
+def fake_miner_fleet_configs(
+    count: int,
+    base_port: int,
+    *,
+    executor_class: ExecutorClass = DEFAULT_EXECUTOR_CLASS,
+    executor_count: int = 1,
+    accept_ratio: float = 1.0,
+    latency_median: float = 0.01,
+    latency_sigma: float = 0.5,
+    job_time: float = 0.5,
+    slow_ratio: float = 0.0,
+    slow_factor: float = 10.0,
+    misbehaving_ratio: float = 0.0,
+    seed: int = 0,
+) -> list[FakeMinerConfig]:
+    """
+    Configs for `count` fake miners on consecutive ports. A `slow_ratio` fraction of them
+    has its latency and job time multiplied by `slow_factor`, a `misbehaving_ratio`
+    fraction gets one of `MISBEHAVIOURS`. The same seed gives the same fleet.
+    """
+    rng = random.Random(seed)
+    configs = []
+    for index in range(count):
+        slow = rng.random() < slow_ratio
+        factor = slow_factor if slow else 1.0
+        misbehaviour = rng.choice(MISBEHAVIOURS) if rng.random() < misbehaving_ratio else None
+        configs.append(
+            FakeMinerConfig(
+                hotkey=f"fake_miner_{index:05}",
+                port=base_port + index,
+                executor_class=executor_class,
+                executor_count=executor_count,
+                accept_ratio=accept_ratio,
+                latency_median=latency_median * factor,
+                latency_sigma=latency_sigma,
+                job_time=job_time * factor,
+                misbehaviour=misbehaviour,
+                seed=seed * 1_000_003 + index,
+            )
+        )
+    return configs
+
+
+class FakeMiner:
+    def __init__(self, config: FakeMinerConfig):
+        self.config = config
+        self.sent: list[SentMessage] = []
+        self._rng = random.Random(config.seed)
+        self._tasks: set[asyncio.Task] = set()
+        self._wire_format = WireFormat.json
+
+    def _latency(self) -> float:
+        return self._rng.lognormvariate(
+            math.log(self.config.latency_median), self.config.latency_sigma
+        )
+
+    async def _send(self, ws, msg: miner_requests.BaseMinerRequest) -> None:
+        data = msg.serialize(self._wire_format)
+        self.sent.append(
+            SentMessage(
+                miner_hotkey=self.config.hotkey,
+                job_uuid=getattr(msg, "job_uuid", None),
+                message_type=msg.message_type.value,
+                timestamp=time.time(),
+            )
+        )
+        await ws.send(data)
+
+    async def _initial_job_request(self, ws, job_uuid: str) -> None:
+        await asyncio.sleep(self._latency())
+        match self.config.misbehaviour:
+            case "silent":
+                return
+            case "disconnect":
+                await ws.close()
+                return
+            case "garbage":
+                await ws.send("\x00 not a message")
+                return
+
+        if self._rng.random() >= self.config.accept_ratio:
+            await self._send(ws, miner_requests.V0DeclineJobRequest(job_uuid=job_uuid))
+            return
+        await self._send(ws, miner_requests.V0AcceptJobRequest(job_uuid=job_uuid))
+        await asyncio.sleep(self.config.executor_ready_delay + self._latency())
+        await self._send(ws, miner_requests.V0ExecutorReadyRequest(job_uuid=job_uuid))
+
+    async def _job_request(self, ws, job_uuid: str) -> None:
+        await asyncio.sleep(self.config.job_time + self._latency())
+        await self._send(
+            ws,
+            miner_requests.V0JobFinishedRequest(
+                job_uuid=job_uuid,
+                docker_process_stdout="",
+                docker_process_stderr="",
+            ),
+        )
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def handle(self, ws) -> None:
+        try:
+            async for raw in ws:
+                data = msgpack_loads(raw) if is_msgpack(raw) else json.loads(raw)
+                match data.get("message_type"):
+                    case "V0AuthenticateRequest":
+                        wire_format = (
+                            WireFormat.json
+                            if self.config.json_only
+                            else choose_wire_format(data.get("wire_formats"))
+                        )
+                        manifest = miner_requests.ExecutorManifest(
+                            executor_classes=[
+                                miner_requests.ExecutorClassManifest(
+                                    executor_class=self.config.executor_class,
+                                    count=self.config.executor_count,
+                                )
+                            ]
+                        )
+                        await self._send(
+                            ws,
+                            miner_requests.V0ExecutorManifestRequest(
+                                manifest=manifest,
+                                wire_format=None if self.config.json_only else wire_format,
+                                batch_requests=self.config.batch_requests,
+                            ),
+                        )
+                        self._wire_format = wire_format
+                    case "V0InitialJobRequest":
+                        self._spawn(self._initial_job_request(ws, data["job_uuid"]))
+                    case "V0JobRequest":
+                        self._spawn(self._job_request(ws, data["job_uuid"]))
+                    case "V0InitialJobBatchRequest":
+                        for job in data["jobs"]:
+                            self._spawn(self._initial_job_request(ws, job["job_uuid"]))
+                    case "V0JobBatchRequest":
+                        for job in data["jobs"]:
+                            self._spawn(self._job_request(ws, job["job_uuid"]))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            for task in list(self._tasks):
+                task.cancel()
+
+
+async def _serve(configs: list[FakeMinerConfig]) -> tuple[list[FakeMiner], list]:
+    miners = [FakeMiner(config) for config in configs]
+    servers = [
+        await websockets.serve(miner.handle, FAKE_MINER_HOST, miner.config.port, max_size=None)
+        for miner in miners
+    ]
+    return miners, servers
+
+
+async def _close(servers: list) -> None:
+    for server in servers:
+        server.close()
+    await asyncio.gather(*(server.wait_closed() for server in servers))
+
+
+def _run_fleet_process(configs: list[FakeMinerConfig], ready, stop, results) -> None:
+    async def _main() -> None:
+        miners, servers = await _serve(configs)
+        ready.set()
+        await asyncio.to_thread(stop.wait)
+        await _close(servers)
+        results.put([message for miner in miners for message in miner.sent])
+
+    asyncio.run(_main())
+
+
+@dataclass
+class FakeMinerFleet:
+    """
+    Serves `configs` in the current event loop, or split between `processes` processes.
+    """
+
+    configs: list[FakeMinerConfig]
+    processes: int = 0
+
+    _miners: list[FakeMiner] = field(default_factory=list)
+    _servers: list = field(default_factory=list)
+    _workers: list = field(default_factory=list)
+
+    async def start(self) -> None:
+        if self.processes <= 0:
+            self._miners, self._servers = await _serve(self.configs)
+            return
+
+        mp_context = multiprocessing.get_context("spawn")
+        for index in range(self.processes):
+            configs = self.configs[index :: self.processes]
+            if not configs:
+                continue
+            ready, stop, results = mp_context.Event(), mp_context.Event(), mp_context.Queue()
+            process = mp_context.Process(
+                target=_run_fleet_process,
+                args=(configs, ready, stop, results),
+                daemon=True,
+            )
+            process.start()
+            self._workers.append((process, ready, stop, results))
+        for _, ready, _, _ in self._workers:
+            if not await asyncio.to_thread(ready.wait, 60):
+                raise RuntimeError("Fake miner process did not start")
+
+    async def stop(self) -> list[SentMessage]:
+        """
+        Stop serving and return all the messages sent by the fake miners.
+        """
+        if self.processes <= 0:
+            await _close(self._servers)
+            return [message for miner in self._miners for message in miner.sent]
+
+        sent: list[SentMessage] = []
+        for process, _, stop, results in self._workers:
+            stop.set()
+            sent.extend(await asyncio.to_thread(results.get))
+            await asyncio.to_thread(process.join)
+        self._workers.clear()
+        return sent
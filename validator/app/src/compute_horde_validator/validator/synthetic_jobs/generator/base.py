@@ -49,3 +49,9 @@ class BaseSyntheticJobGenerator(abc.ABC):
 class BaseSyntheticJobGeneratorFactory(abc.ABC):
     @abc.abstractmethod
     async def create(self, executor_class: ExecutorClass) -> BaseSyntheticJobGenerator: ...
+
+    async def create_many(
+        self, executor_class: ExecutorClass, count: int
+    ) -> list[BaseSyntheticJobGenerator]:
+        """Create generators for a whole batch at once, factories can override it to do it faster"""
+        return [await self.create(executor_class) for _ in range(count)]
@@ -1,5 +1,9 @@
+import logging
+
+from asgiref.sync import sync_to_async
 from compute_horde.executor_class import ExecutorClass
 
+from compute_horde_validator.validator.dynamic_config import aget_weights_version
 from compute_horde_validator.validator.synthetic_jobs.generator.base import (
     BaseSyntheticJobGenerator,
     BaseSyntheticJobGeneratorFactory,
@@ -7,8 +11,31 @@ from compute_horde_validator.validator.synthetic_jobs.generator.base import (
 from compute_horde_validator.validator.synthetic_jobs.generator.gpu_hashcat import (
     GPUHashcatSyntheticJobGenerator,
 )
+from compute_horde_validator.validator.synthetic_jobs.job_bank import claim_job_bank_entries
+
+logger = logging.getLogger(__name__)
 
 
 class DefaultSyntheticJobGeneratorFactory(BaseSyntheticJobGeneratorFactory):
     async def create(self, executor_class: ExecutorClass) -> BaseSyntheticJobGenerator:
         return GPUHashcatSyntheticJobGenerator()
+
+    async def create_many(
+        self, executor_class: ExecutorClass, count: int
+    ) -> list[BaseSyntheticJobGenerator]:
+        # read the weights version once, so jobs claimed from the bank and
+        # the ones generated on the spot can't end up with different versions
+        weights_version = await aget_weights_version()
+        generators: list[BaseSyntheticJobGenerator] = []
+        try:
+            generators.extend(await sync_to_async(claim_job_bank_entries)(weights_version, count))
+        except Exception as exc:
+            logger.warning("Failed to claim jobs from the job bank: %r", exc)
+
+        missing = count - len(generators)
+        if missing > 0:
+            logger.info("Job bank is short of %d jobs for %s", missing, executor_class)
+            generators.extend(
+                [GPUHashcatSyntheticJobGenerator(weights_version) for _ in range(missing)]
+            )
+        return generators
@@ -1,3 +1,6 @@
+import uuid
+from typing import Self
+
 from asgiref.sync import sync_to_async
 from compute_horde.mv_protocol.miner_requests import V0JobFinishedRequest
 
@@ -5,44 +8,54 @@ from compute_horde_validator.validator.dynamic_config import aget_weights_versio
 from compute_horde_validator.validator.synthetic_jobs.generator.base import (
     BaseSyntheticJobGenerator,
 )
-from compute_horde_validator.validator.synthetic_jobs.synthetic_job import (
-    HASHJOB_PARAMS,
-    Algorithm,
+from compute_horde_validator.validator.synthetic_jobs.parallel_generation import (
+    generate_hash_job,
+    hash_job_volume_contents,
 )
-from compute_horde_validator.validator.synthetic_jobs.v0_synthetic_job import V0SyntheticJob
-from compute_horde_validator.validator.synthetic_jobs.v1_synthetic_job import V1SyntheticJob
-from compute_horde_validator.validator.utils import single_file_zip
+from compute_horde_validator.validator.synthetic_jobs.synthetic_job import SyntheticJob
 
 MAX_SCORE = 2
 
 
 class GPUHashcatSyntheticJobGenerator(BaseSyntheticJobGenerator):
-    def __init__(self):
+    def __init__(self, weights_version: int | None = None):
         super().__init__()
         # set synthetic_jobs based on subnet weights_version
-        self.weights_version = None
+        self.weights_version = weights_version
         self.hash_job = None
         self.expected_answer = None
+        self._volume_contents: str | None = None
+
+    @classmethod
+    def from_precomputed(
+        cls,
+        job_uuid: uuid.UUID,
+        weights_version: int,
+        hash_job: SyntheticJob,
+        expected_answer: str,
+        volume_contents: str,
+    ) -> Self:
+        """Create an already initialized generator, e.g. from a job bank entry"""
+        generator = cls()
+        generator._uuid = job_uuid
+        generator.weights_version = weights_version
+        generator.hash_job = hash_job
+        generator.expected_answer = expected_answer
+        generator._volume_contents = volume_contents
+        return generator
 
     async def ainit(self):
         """Allow to initialize generator in asyncio and non blocking"""
-        self.weights_version = await aget_weights_version()
+        if self.hash_job is not None:
+            # precomputed generator, nothing to do
+            return
+        if self.weights_version is None:
+            self.weights_version = await aget_weights_version()
         self.hash_job, self.expected_answer = await self._get_hash_job()
 
     @sync_to_async(thread_sensitive=False)
     def _get_hash_job(self):
-        if self.weights_version == 0:
-            algorithm = Algorithm.get_random_algorithm()
-            hash_job = V0SyntheticJob.generate(
-                algorithm, HASHJOB_PARAMS[self.weights_version][algorithm]
-            )
-        elif self.weights_version in [1, 2, 3]:
-            algorithms = Algorithm.get_all_algorithms()
-            params = [HASHJOB_PARAMS[self.weights_version][algorithm] for algorithm in algorithms]
-            hash_job = V1SyntheticJob.generate(algorithms, params)
-        else:
-            raise RuntimeError(f"No SyntheticJob for weights_version: {self.weights_version}")
-
+        hash_job = generate_hash_job(self.weights_version)
         # precompute anwer when already in thread
         return hash_job, hash_job.answer
 
@@ -72,9 +85,12 @@ class GPUHashcatSyntheticJobGenerator(BaseSyntheticJobGenerator):
     def raw_script(self) -> str | None:
         return self.hash_job.raw_script()
 
-    @sync_to_async(thread_sensitive=False)
-    def volume_contents(self) -> str:
-        return single_file_zip("payload.txt", self.hash_job.payload)
+    async def volume_contents(self) -> str:
+        if self._volume_contents is None:
+            self._volume_contents = await sync_to_async(
+                hash_job_volume_contents, thread_sensitive=False
+            )(self.hash_job)
+        return self._volume_contents
 
     def score(self, time_took: float) -> float:
         if self.weights_version == 0:
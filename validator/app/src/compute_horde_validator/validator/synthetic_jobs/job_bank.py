@@ -0,0 +1,134 @@
+"""
+Bank of synthetic jobs generated ahead of time.
+
+Generating hashcat jobs (passwords, hashes, encrypted payloads and zipped volumes)
+takes a noticeable amount of CPU time. Doing it inside a batch run delays sending
+the initial job requests, so the jobs are generated in the background between
+batches, and a batch run only claims the ready ones.
+"""
+
+import contextlib
+import logging
+import pickle
+from datetime import timedelta
+
+from constance import config
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils.timezone import now
+
+from compute_horde_validator.validator.dynamic_config import get_weights_version
+from compute_horde_validator.validator.models import SyntheticJobBankEntry
+from compute_horde_validator.validator.synthetic_jobs.generator.gpu_hashcat import (
+    GPUHashcatSyntheticJobGenerator,
+)
+from compute_horde_validator.validator.synthetic_jobs.parallel_generation import (
+    PrecomputedHashJob,
+    hash_job_process_pool,
+    precompute_hash_job,
+    precompute_hash_jobs,
+)
+
+logger = logging.getLogger(__name__)
+
+# how many entries to generate (per generating process) before inserting them into the database
+REFILL_CHUNK_SIZE = 100
+
+# Celery job timeouts, the refill runs every 5 minutes and shouldn't pile up
+JOB_BANK_REFILL_SOFT_LIMIT = 4 * 60
+JOB_BANK_REFILL_HARD_LIMIT = JOB_BANK_REFILL_SOFT_LIMIT + 10
+
+
+def _ttl() -> timedelta:
+    return timedelta(seconds=config.DYNAMIC_SYNTHETIC_JOB_BANK_TTL)
+
+
+def job_bank_entry(weights_version: int, job: PrecomputedHashJob) -> SyntheticJobBankEntry:
+    return SyntheticJobBankEntry(
+        weights_version=weights_version,
+        hash_job=pickle.dumps(job.hash_job),
+        expected_answer=job.expected_answer,
+        volume_contents=job.volume_contents,
+    )
+
+
+def generate_job_bank_entry(weights_version: int) -> SyntheticJobBankEntry:
+    return job_bank_entry(weights_version, precompute_hash_job(weights_version))
+
+
+def purge_job_bank(weights_version: int) -> int:
+    """Drop entries that are expired or were generated for a different weights version"""
+    deleted, _ = SyntheticJobBankEntry.objects.filter(
+        ~Q(weights_version=weights_version) | Q(created_at__lt=now() - _ttl())
+    ).delete()
+    return deleted
+
+
+def _missing_entries(weights_version: int) -> int:
+    return (
+        config.DYNAMIC_SYNTHETIC_JOB_BANK_SIZE
+        - SyntheticJobBankEntry.objects.filter(weights_version=weights_version).count()
+    )
+
+
+def refill_job_bank() -> int:
+    """Top up the bank to the configured size for the current weights version"""
+    weights_version = get_weights_version()
+    purged = purge_job_bank(weights_version)
+    if purged:
+        logger.info("Dropped %d stale job bank entries", purged)
+
+    if _missing_entries(weights_version) <= 0:
+        return 0
+
+    processes = settings.SYNTHETIC_JOB_GENERATION_PROCESSES
+    chunk_size = REFILL_CHUNK_SIZE * processes
+    created = 0
+    with (
+        hash_job_process_pool(processes) if processes > 1 else contextlib.nullcontext()
+    ) as executor:
+        while True:
+            # re-check before every chunk, so overlapping refills (or batch runs claiming
+            # jobs in the meantime) don't overfill the bank by more than a single chunk
+            missing = _missing_entries(weights_version)
+            if missing <= 0:
+                return created
+            jobs = precompute_hash_jobs(
+                weights_version, min(chunk_size, missing), executor=executor, workers=processes
+            )
+            SyntheticJobBankEntry.objects.bulk_create(
+                [job_bank_entry(weights_version, job) for job in jobs]
+            )
+            created += len(jobs)
+
+
+def claim_job_bank_entries(
+    weights_version: int, count: int
+) -> list[GPUHashcatSyntheticJobGenerator]:
+    """
+    Take up to `count` ready jobs out of the bank. Claimed entries are deleted,
+    so every job is sent out at most once, even with concurrent batch runs.
+    Entries are unpickled before the transaction is committed - if that fails
+    (e.g. the job classes changed in a deploy), nothing is deleted.
+    """
+    if count <= 0:
+        return []
+    with transaction.atomic():
+        entries = list(
+            SyntheticJobBankEntry.objects.select_for_update(skip_locked=True)
+            .filter(weights_version=weights_version, created_at__gte=now() - _ttl())
+            .order_by("created_at")[:count]
+        )
+        generators = [
+            GPUHashcatSyntheticJobGenerator.from_precomputed(
+                job_uuid=entry.job_uuid,
+                weights_version=entry.weights_version,
+                hash_job=pickle.loads(entry.hash_job),
+                expected_answer=entry.expected_answer,
+                volume_contents=entry.volume_contents,
+            )
+            for entry in entries
+        ]
+        SyntheticJobBankEntry.objects.filter(pk__in=[entry.pk for entry in entries]).delete()
+    return generators
@@ -0,0 +1,98 @@
+"""
+Generating hashcat synthetic jobs in bulk, spread across processes.
+
+Generating a job (random passwords, hashing, Fernet encryption of the payload chain,
+zipping the volume) is pure python CPU work, so threads don't help because of the GIL.
+This module does not touch Django, so it is cheap to import in `spawn`ed workers.
+"""
+
+import math
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+
+from compute_horde_validator.validator.synthetic_jobs.synthetic_job import (
+    HASHJOB_PARAMS,
+    Algorithm,
+    SyntheticJob,
+)
+from compute_horde_validator.validator.synthetic_jobs.v0_synthetic_job import V0SyntheticJob
+from compute_horde_validator.validator.synthetic_jobs.v1_synthetic_job import V1SyntheticJob
+from compute_horde_validator.validator.utils import single_file_zip
+
+# how many jobs a worker generates per submitted task, to keep the IPC overhead low
+# while still spreading the work evenly across processes
+CHUNKS_PER_WORKER = 4
+
+
+@dataclass
+class PrecomputedHashJob:
+    hash_job: SyntheticJob
+    expected_answer: str
+    volume_contents: str
+
+
+def generate_hash_job(weights_version: int) -> SyntheticJob:
+    if weights_version == 0:
+        algorithm = Algorithm.get_random_algorithm()
+        return V0SyntheticJob.generate(algorithm, HASHJOB_PARAMS[weights_version][algorithm])
+    elif weights_version in [1, 2, 3]:
+        algorithms = Algorithm.get_all_algorithms()
+        params = [HASHJOB_PARAMS[weights_version][algorithm] for algorithm in algorithms]
+        return V1SyntheticJob.generate(algorithms, params)
+    else:
+        raise RuntimeError(f"No SyntheticJob for weights_version: {weights_version}")
+
+
+def hash_job_volume_contents(hash_job: SyntheticJob) -> str:
+    return single_file_zip("payload.txt", hash_job.payload)
+
+
+def precompute_hash_job(weights_version: int) -> PrecomputedHashJob:
+    hash_job = generate_hash_job(weights_version)
+    return PrecomputedHashJob(
+        hash_job=hash_job,
+        expected_answer=hash_job.answer,
+        volume_contents=hash_job_volume_contents(hash_job),
+    )
+
+
+def _precompute_hash_jobs_chunk(weights_version: int, count: int) -> list[PrecomputedHashJob]:
+    return [precompute_hash_job(weights_version) for _ in range(count)]
+
+
+def hash_job_process_pool(max_workers: int | None = None) -> ProcessPoolExecutor:
+    """
+    Process pool for `precompute_hash_jobs`. Workers are spawned, not forked - forking a
+    process with running threads (asyncio, db connections) is unsafe, and forked workers
+    would all inherit the same `random` state, generating the same passwords.
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def precompute_hash_jobs(
+    weights_version: int,
+    count: int,
+    executor: Executor | None = None,
+    workers: int = 1,
+) -> list[PrecomputedHashJob]:
+    """
+    Generate `count` jobs, in `executor` if given (split into chunks for `workers` processes),
+    otherwise in the current process. The jobs are the same as generated one by one.
+    """
+    if count <= 0:
+        return []
+    if executor is None:
+        return _precompute_hash_jobs_chunk(weights_version, count)
+
+    chunk_size = math.ceil(count / (max(workers, 1) * CHUNKS_PER_WORKER))
+    futures = [
+        executor.submit(
+            _precompute_hash_jobs_chunk, weights_version, min(chunk_size, count - start)
+        )
+        for start in range(0, count, chunk_size)
+    ]
+    return [job for future in futures for job in future.result()]
@@ -0,0 +1,94 @@
+"""
+Write-behind persistence of synthetic jobs batch results.
+
+The rows are written by a separate thread in bounded chunks while the batch is still
+running, instead of in one go at the end of the batch. The batch is only marked as
+finished, which is what makes the scoring pick up its jobs, by `_db_persist` in
+batch_run.py once the streamed rows are all written.
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+from collections import defaultdict
+
+from django.db import connection, models, transaction
+
+logger = logging.getLogger(__name__)
+
+PERSIST_CHUNK_SIZE = 500
+# how many chunks can be waiting for the writer thread before `add` blocks
+PERSIST_MAX_PENDING_CHUNKS = 4
+
+
+class BatchPersister:
+    def __init__(
+        self,
+        chunk_size: int = PERSIST_CHUNK_SIZE,
+        max_pending_chunks: int = PERSIST_MAX_PENDING_CHUNKS,
+    ):
+        self.chunk_size = chunk_size
+        self.written = 0
+        # rows from the chunks which failed to be written, for the caller to retry
+        self.failed: list[models.Model] = []
+
+        self._chunk: list[models.Model] = []
+        self._queue: queue.Queue[list[models.Model] | None] = queue.Queue(max_pending_chunks)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="batch-persister", daemon=True)
+        self._thread.start()
+
+    async def add(self, *rows: models.Model) -> None:
+        """
+        Queue the rows to be written. Waits if the writer thread is too far behind.
+        """
+        assert not self._closed
+        self._chunk.extend(rows)
+        if len(self._chunk) >= self.chunk_size:
+            await self._put(self._chunk)
+            self._chunk = []
+
+    async def close(self) -> None:
+        """
+        Write the remaining rows and wait for the writer thread to finish.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._chunk:
+            await self._put(self._chunk)
+            self._chunk = []
+        await self._put(None)
+        await asyncio.to_thread(self._thread.join)
+
+    async def _put(self, chunk: list[models.Model] | None) -> None:
+        try:
+            self._queue.put_nowait(chunk)
+        except queue.Full:
+            await asyncio.to_thread(self._queue.put, chunk)
+
+    def _run(self) -> None:
+        try:
+            while (chunk := self._queue.get()) is not None:
+                self._write(chunk)
+        finally:
+            # the thread has its own database connection
+            connection.close()
+
+    def _write(self, chunk: list[models.Model]) -> None:
+        try:
+            with transaction.atomic():
+                for model, rows in group_by_model(chunk).items():
+                    model.objects.bulk_create(rows)
+            self.written += len(chunk)
+        except Exception as exc:
+            logger.warning("Failed to persist %d rows: %r", len(chunk), exc)
+            self.failed.extend(chunk)
+
+
+def group_by_model(rows: list[models.Model]) -> dict[type[models.Model], list[models.Model]]:
+    grouped: dict[type[models.Model], list[models.Model]] = defaultdict(list)
+    for row in rows:
+        grouped[type(row)].append(row)
+    return grouped
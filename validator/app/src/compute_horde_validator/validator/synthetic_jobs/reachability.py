@@ -0,0 +1,57 @@
+"""
+Connecting to the miners which failed to send their manifest in the past batches.
+
+In a batch such miners only get a single short connection attempt, see
+`_db_get_unreachable_miners` in batch_run.py. They are probed here between the batches,
+with the usual retries, so the ones which are back are treated as healthy again.
+"""
+
+import asyncio
+import logging
+
+import bittensor
+from asgiref.sync import sync_to_async
+
+from compute_horde_validator.validator.models import Miner
+from compute_horde_validator.validator.synthetic_jobs.batch_run import (
+    _connect_and_get_manifest,
+    _init_context,
+    _multi_close_client,
+    db_record_miner_reachability,
+)
+
+logger = logging.getLogger(__name__)
+
+REACHABILITY_PROBE_SOFT_LIMIT = 2 * 60
+REACHABILITY_PROBE_HARD_LIMIT = REACHABILITY_PROBE_SOFT_LIMIT + 10
+
+
+async def probe_miners(
+    axons: dict[str, bittensor.AxonInfo], miners: list[Miner]
+) -> dict[str, bool]:
+    """
+    Whether each of the miners could be connected to and sent its manifest.
+    """
+    ctx = _init_context(axons, miners)
+    try:
+        await asyncio.gather(
+            *[_connect_and_get_manifest(ctx, miner.hotkey) for miner in miners],
+            return_exceptions=True,
+        )
+    finally:
+        await _multi_close_client(ctx)
+    return {miner.hotkey: ctx.manifests[miner.hotkey] is not None for miner in miners}
+
+
+async def recover_unreachable_miners(
+    axons: dict[str, bittensor.AxonInfo], miners: list[Miner]
+) -> int:
+    """
+    Probe the miners and record the ones which answered as reachable. The failures are
+    not recorded, they are counted by the batches. Returns the number of recovered miners.
+    """
+    reachable = await probe_miners(axons, miners)
+    recovered = {hotkey: True for hotkey, is_reachable in reachable.items() if is_reachable}
+    await sync_to_async(db_record_miner_reachability)(miners, recovered)
+    logger.info("%d out of %d unreachable miners recovered", len(recovered), len(miners))
+    return len(recovered)
@@ -0,0 +1,202 @@
+"""
+Running a synthetic jobs batch split into shards, each with its own event loop in its
+own process.
+
+With thousands of executors a single event loop becomes the bottleneck: the CPU time
+spent on websocket frames, (de)serialization and scoring adds skew between the first
+and the last request of each stage. Miners are split between the shards, which meet at
+a cross-process barrier before sending the initial job requests and the job requests,
+so all of them start each stage at the same time. Each shard scores its own jobs, the
+parent merges the results and persists the batch in a single transaction.
+"""
+
+import asyncio
+import contextlib
+import logging
+import multiprocessing
+import random
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import UTC, datetime
+
+import bittensor
+import django
+import uvloop
+
+from compute_horde_validator.validator.models import Miner, SystemEvent
+from compute_horde_validator.validator.synthetic_jobs.batch_run import (
+    BatchContext,
+    BatchShardResult,
+    BatchShardSync,
+    _datetime_dump,
+    _db_persist,
+    _db_persist_system_events,
+    _init_context,
+    _send_machine_specs,
+    execute_synthetic_batch_run,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def run_batch_shard(
+    axons: dict[str, bittensor.AxonInfo],
+    serving_miners: list[Miner],
+    batch_id: int | None,
+    shard: BatchShardSync,
+) -> BatchShardResult | None:
+    """
+    Entrypoint of a shard process (or thread, in tests).
+    """
+    return uvloop.run(execute_synthetic_batch_run(axons, serving_miners, batch_id, shard=shard))
+
+
+def split_miners(serving_miners: list[Miner], shard_count: int) -> list[list[Miner]]:
+    # round-robin, so the shards get a similar mix of big and small miners
+    return [serving_miners[index::shard_count] for index in range(shard_count)]
+
+
+def _merge_shard_results(
+    ctx: BatchContext, shard_miners: list[list[Miner]], results: list
+) -> list[dict]:
+    shards = []
+    for index, (miners, result) in enumerate(zip(shard_miners, results)):
+        if not isinstance(result, BatchShardResult):
+            # the jobs of the miners in this shard are lost, same as when a miner
+            # fails, but the other shards can still be persisted
+            logger.error("Synthetic jobs batch shard %d failure: %r", index, result)
+            ctx.system_event(
+                type=SystemEvent.EventType.VALIDATOR_FAILURE,
+                subtype=SystemEvent.EventSubType.GENERIC_ERROR,
+                description=f"shard {index}: {result!r}",
+                func="run_batch_shard",
+            )
+            shards.append(dict(index=index, miners=len(miners), failed=True))
+            continue
+
+        ctx.manifests.update(result.manifests)
+        ctx.online_executor_count.update(result.online_executor_count)
+        ctx.reachable.update(result.reachable)
+        for job_uuid, job in result.jobs.items():
+            job.ctx = ctx
+            ctx.jobs[job_uuid] = job
+            ctx.job_uuids.append(job_uuid)
+
+        # the earliest shard defines when the batch stopped accepting results
+        job_request_time = result.stage_start_time.get("_multi_send_job_request")
+        if job_request_time is not None:
+            ctx.stage_start_time["_multi_send_job_request"] = min(
+                ctx.stage_start_time.get("_multi_send_job_request", job_request_time),
+                job_request_time,
+            )
+
+        shards.append(
+            dict(
+                index=index,
+                miners=len(miners),
+                jobs=len(result.jobs),
+                stage_start_time={
+                    stage: _datetime_dump(dt) for stage, dt in result.stage_start_time.items()
+                },
+            )
+        )
+    return shards
+
+
+async def execute_sharded_synthetic_batch_run(
+    axons: dict[str, bittensor.AxonInfo],
+    serving_miners: list[Miner],
+    shard_count: int,
+    batch_id: int | None = None,
+    executor: Executor | None = None,
+) -> None:
+    """
+    Like `execute_synthetic_batch_run`, but split into `shard_count` processes.
+
+    `executor` is for tests, to run the shards in threads instead of processes.
+    """
+    shard_count = min(shard_count, len(serving_miners))
+    if shard_count <= 1:
+        await execute_synthetic_batch_run(axons, serving_miners, batch_id)
+        return
+
+    start_time = datetime.now(tz=UTC)
+    logger.info(
+        "Executing synthetic jobs batch for %d miners in %d shards",
+        len(serving_miners),
+        shard_count,
+    )
+
+    random.shuffle(serving_miners)
+    shard_miners = split_miners(serving_miners, shard_count)
+
+    # the merged context is only used for persisting, no connections are made from it
+    ctx = _init_context(axons, serving_miners, batch_id)
+    await ctx.checkpoint_system_event("BATCH_BEGIN", dt=start_time)
+
+    await ctx.checkpoint_system_event("_run_batch_shards")
+    with contextlib.ExitStack() as stack:
+        if executor is None:
+            # spawn, not fork: the parent has a running event loop and db connections
+            mp_context = multiprocessing.get_context("spawn")
+            manager = stack.enter_context(mp_context.Manager())
+            barrier, shared = manager.Barrier(shard_count), manager.dict()
+            executor = stack.enter_context(
+                ProcessPoolExecutor(
+                    max_workers=shard_count,
+                    mp_context=mp_context,
+                    # apps must be loaded before the Miner arguments are unpickled
+                    initializer=django.setup,
+                )
+            )
+        else:
+            barrier, shared = threading.Barrier(shard_count), {}
+
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *[
+                loop.run_in_executor(
+                    executor,
+                    run_batch_shard,
+                    {miner.hotkey: axons[miner.hotkey] for miner in miners},
+                    miners,
+                    batch_id,
+                    BatchShardSync(
+                        index=index,
+                        count=shard_count,
+                        batch_uuid=ctx.uuid,
+                        barrier=barrier,
+                        shared=shared,
+                    ),
+                )
+                for index, miners in enumerate(shard_miners)
+            ],
+            return_exceptions=True,
+        )
+
+    await ctx.checkpoint_system_event("_merge_shard_results")
+    shards = _merge_shard_results(ctx, shard_miners, results)
+    ctx.system_event(
+        type=SystemEvent.EventType.VALIDATOR_TELEMETRY,
+        subtype=SystemEvent.EventSubType.SYNTHETIC_BATCH,
+        description="sharded batch telemetry",
+        data=dict(
+            validator_hotkey=ctx.own_keypair.ss58_address,
+            shards=shards,
+        ),
+    )
+    await _db_persist_system_events(ctx)
+
+    await ctx.checkpoint_system_event("_db_persist")
+    await _db_persist(ctx)
+
+    # send the machine specs after the batch is done, it can fail or take a long time
+    await ctx.checkpoint_system_event("_send_machine_specs")
+    try:
+        await _send_machine_specs(ctx)
+    except (Exception, asyncio.CancelledError) as exc:
+        logger.error("Synthetic jobs batch failure: %r", exc)
+
+    await _db_persist_system_events(ctx)
+
+    await ctx.checkpoint_system_event("BATCH_END")
@@ -43,8 +43,12 @@ class Algorithm(enum.Enum):
             },
         }
 
+    @property
+    def hash_function(self):
+        return self.params[self]["hash_function"]
+
     def hash(self, *args, **kwargs):
-        return self.params[self]["hash_function"](*args, **kwargs)
+        return self.hash_function(*args, **kwargs)
 
     @property
     def type(self):
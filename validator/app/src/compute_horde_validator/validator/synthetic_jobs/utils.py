@@ -1,13 +1,18 @@
+import asyncio
 import logging
 import time
 
 import bittensor
 import uvloop
 from asgiref.sync import async_to_sync
+from constance import config
 from django.conf import settings
 
 from compute_horde_validator.validator.models import Miner, SystemEvent
 from compute_horde_validator.validator.synthetic_jobs.batch_run import execute_synthetic_batch_run
+from compute_horde_validator.validator.synthetic_jobs.sharding import (
+    execute_sharded_synthetic_batch_run,
+)
 
 # new synchronized flow waits longer for job responses
 SYNTHETIC_JOBS_SOFT_LIMIT = 20 * 60
@@ -28,7 +33,30 @@ def try_to_get_metagraph(netuid, network, tries=3):
             time.sleep(try_number + 1)
 
 
-def create_and_run_synthetic_job_batch(netuid, network, synthetic_jobs_batch_id: int | None = None):
+def wait_for_block(network: str, block: int, poll_interval: float, timeout: float) -> None:
+    subtensor = bittensor.subtensor(network=network)
+    deadline = time.monotonic() + timeout
+    while (current_block := subtensor.get_current_block()) < block:
+        if time.monotonic() > deadline:
+            logger.warning(
+                "Failed to wait for block %s, current block is %s, starting anyway",
+                block,
+                current_block,
+            )
+            return
+        time.sleep(poll_interval)
+
+
+def create_and_run_synthetic_job_batch(
+    netuid,
+    network,
+    synthetic_jobs_batch_id: int | None = None,
+    start_block: int | None = None,
+):
+    """
+    With `start_block`, wait for it before running the jobs, pre-warming
+    the miner connections in the meantime.
+    """
     uvloop.install()
 
     if settings.DEBUG_MINER_KEY:
@@ -70,7 +98,31 @@ def create_and_run_synthetic_job_batch(netuid, network, synthetic_jobs_batch_id:
             if miner.hotkey in axons_by_key and axons_by_key[miner.hotkey].is_serving
         ]
 
-    async_to_sync(execute_synthetic_batch_run)(axons_by_key, miners, synthetic_jobs_batch_id)
+    wait_for_start_block = None
+    if start_block is not None:
+        poll_interval = config.DYNAMIC_SYNTHETIC_JOBS_PLANNER_POLL_INTERVAL
+        # same margin as when waiting for the block in run_synthetic_jobs
+        timeout = (
+            config.DYNAMIC_SYNTHETIC_JOBS_PREWARM_BLOCKS
+            * settings.BITTENSOR_APPROXIMATE_BLOCK_DURATION.total_seconds()
+            * 2
+        )
+
+        async def wait_for_start_block():
+            await asyncio.to_thread(wait_for_block, network, start_block, poll_interval, timeout)
+
+    shard_count = config.DYNAMIC_SYNTHETIC_JOBS_BATCH_SHARDS
+    if shard_count > 1:
+        # every shard has its own connections, they are not pre-warmed
+        if start_block is not None:
+            wait_for_block(network, start_block, poll_interval, timeout)
+        async_to_sync(execute_sharded_synthetic_batch_run)(
+            axons_by_key, miners, shard_count, synthetic_jobs_batch_id
+        )
+    else:
+        async_to_sync(execute_synthetic_batch_run)(
+            axons_by_key, miners, synthetic_jobs_batch_id, wait_until=wait_for_start_block
+        )
 
 
 def get_miners(metagraph) -> list[Miner]:
@@ -65,8 +65,11 @@ class V1SyntheticJob(SyntheticJob):
         return ["?1" * params.num_letters + "?d" * params.num_digits for params in self.params]
 
     def hash_hexes(self, i) -> list[str]:
+        # look up the hash function and salt once, not for every password
+        hash_function = self.algorithms[i].hash_function
+        salt = self.salts[i]
         return [
-            self.algorithms[i].hash(password.encode("ascii") + self.salts[i]).hexdigest()
+            hash_function(password.encode("ascii") + salt).hexdigest()
             for password in self.passwords[i]
         ]
 
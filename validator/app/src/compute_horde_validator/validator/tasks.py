@@ -41,6 +41,7 @@ from compute_horde_validator.validator.models import (
     Cycle,
     JobFinishedReceipt,
     JobStartedReceipt,
+    Miner,
     OrganicJob,
     Prompt,
     PromptSample,
@@ -57,6 +58,16 @@ from compute_horde_validator.validator.synthetic_jobs.batch_run import (
     SYNTHETIC_JOBS_HARD_LIMIT,
     SYNTHETIC_JOBS_SOFT_LIMIT,
 )
+from compute_horde_validator.validator.synthetic_jobs.job_bank import (
+    JOB_BANK_REFILL_HARD_LIMIT,
+    JOB_BANK_REFILL_SOFT_LIMIT,
+    refill_job_bank,
+)
+from compute_horde_validator.validator.synthetic_jobs.reachability import (
+    REACHABILITY_PROBE_HARD_LIMIT,
+    REACHABILITY_PROBE_SOFT_LIMIT,
+    recover_unreachable_miners,
+)
 from compute_horde_validator.validator.synthetic_jobs.utils import (
     create_and_run_synthetic_job_batch,
 )
@@ -236,7 +247,7 @@ def schedule_synthetic_jobs() -> None:
     soft_time_limit=SYNTHETIC_JOBS_SOFT_LIMIT,
     time_limit=SYNTHETIC_JOBS_HARD_LIMIT,
 )
-def _run_synthetic_jobs(synthetic_jobs_batch_id: int) -> None:
+def _run_synthetic_jobs(synthetic_jobs_batch_id: int, start_block: int | None = None) -> None:
     try:
         # metagraph will be refetched and that's fine, after sleeping
         # for e.g. 30 minutes we should refetch the miner list
@@ -244,6 +255,7 @@ def _run_synthetic_jobs(synthetic_jobs_batch_id: int) -> None:
             settings.BITTENSOR_NETUID,
             settings.BITTENSOR_NETWORK,
             synthetic_jobs_batch_id=synthetic_jobs_batch_id,
+            start_block=start_block,
         )
     except billiard.exceptions.SoftTimeLimitExceeded:
         logger.info("Running synthetic jobs timed out")
@@ -261,6 +273,9 @@ def run_synthetic_jobs(
 
     If `settings.DEBUG_DONT_STAGGER_VALIDATORS` is set, we will run
     synthetic jobs immediately.
+
+    With `DYNAMIC_SYNTHETIC_JOBS_PREWARM_BLOCKS`, the batch run is started that many
+    blocks early, to connect to the miners and wait for the block itself.
     """
 
     if not config.SERVING:
@@ -278,6 +293,7 @@ def run_synthetic_jobs(
     poll_interval = poll_interval or timedelta(
         seconds=config.DYNAMIC_SYNTHETIC_JOBS_PLANNER_POLL_INTERVAL
     )
+    prewarm_blocks = config.DYNAMIC_SYNTHETIC_JOBS_PREWARM_BLOCKS
 
     subtensor_ = get_subtensor(network=settings.BITTENSOR_NETWORK)
     current_block = subtensor_.get_current_block()
@@ -330,21 +346,28 @@ def run_synthetic_jobs(
                 batch.id,
                 batch.block,
             )
+        elif blocks_to_wait <= prewarm_blocks:
+            logger.info(
+                "Woke up in time to pre-warm batch, batch_id: %s, should_run_at_block: %s",
+                batch.id,
+                batch.block,
+            )
         else:
+            wake_up_block = target_block - prewarm_blocks
             for _ in range(
                 ceil(
-                    blocks_to_wait
+                    (wake_up_block - current_block)
                     * settings.BITTENSOR_APPROXIMATE_BLOCK_DURATION
                     * 2
                     / poll_interval
                 )
             ):
                 current_block = subtensor_.get_current_block()
-                if current_block >= target_block:
+                if current_block >= wake_up_block:
                     break
                 logger.debug(
                     "Waiting for block %s, current block is %s, sleeping for %s",
-                    target_block,
+                    wake_up_block,
                     current_block,
                     poll_interval,
                 )
@@ -352,7 +375,7 @@ def run_synthetic_jobs(
             else:
                 logger.error(
                     "Failed to wait for target block %s, current block is %s",
-                    target_block,
+                    wake_up_block,
                     current_block,
                 )
                 SystemEvent.objects.using(settings.DEFAULT_DB_ALIAS).create(
@@ -371,7 +394,12 @@ def run_synthetic_jobs(
         batch.started_at = now()
         batch.save()
 
-    _run_synthetic_jobs.apply_async(kwargs={"synthetic_jobs_batch_id": batch.id})
+    if prewarm_blocks > 0:
+        _run_synthetic_jobs.apply_async(
+            kwargs={"synthetic_jobs_batch_id": batch.id, "start_block": target_block}
+        )
+    else:
+        _run_synthetic_jobs.apply_async(kwargs={"synthetic_jobs_batch_id": batch.id})
 
 
 @app.task()
@@ -1023,6 +1051,50 @@ def send_events_to_facilitator():
         logger.error(f"Failed to send system events to facilitator: {response}")
 
 
+@app.task(
+    soft_time_limit=JOB_BANK_REFILL_SOFT_LIMIT,
+    time_limit=JOB_BANK_REFILL_HARD_LIMIT,
+)
+def refill_synthetic_job_bank() -> None:
+    try:
+        created = refill_job_bank()
+    except billiard.exceptions.SoftTimeLimitExceeded:
+        logger.info("Refilling the synthetic job bank timed out")
+        return
+    if created:
+        logger.info("Generated %d synthetic jobs for the job bank", created)
+
+
+@app.task(
+    soft_time_limit=REACHABILITY_PROBE_SOFT_LIMIT,
+    time_limit=REACHABILITY_PROBE_HARD_LIMIT,
+)
+def probe_unreachable_miners() -> None:
+    min_failures = config.DYNAMIC_SYNTHETIC_JOBS_UNREACHABLE_MINER_FAILURES
+    if min_failures <= 0:
+        return
+
+    miners = list(Miner.objects.filter(reachability__consecutive_failures__gte=min_failures))
+    if not miners:
+        return
+
+    subtensor = get_subtensor(network=settings.BITTENSOR_NETWORK)
+    metagraph = get_metagraph(subtensor, netuid=settings.BITTENSOR_NETUID)
+    axons = {
+        neuron.hotkey: neuron.axon_info
+        for neuron in metagraph.neurons
+        if neuron.axon_info.is_serving
+    }
+    miners = [miner for miner in miners if miner.hotkey in axons]
+    if not miners:
+        return
+
+    try:
+        async_to_sync(recover_unreachable_miners)(axons, miners)
+    except billiard.exceptions.SoftTimeLimitExceeded:
+        logger.info("Probing unreachable miners timed out")
+
+
 @app.task
 def fetch_dynamic_config() -> None:
     sync_dynamic_config(
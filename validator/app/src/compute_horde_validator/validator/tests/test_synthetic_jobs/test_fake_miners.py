@@ -0,0 +1,162 @@
+import io
+import random
+import uuid
+
+import bittensor
+import prometheus_client
+import pytest
+from asgiref.sync import sync_to_async
+from django.core.management import call_command
+from pytest_mock import MockerFixture
+
+from compute_horde_validator.validator.models import Miner, SyntheticJob
+from compute_horde_validator.validator.synthetic_jobs.batch_run import execute_synthetic_batch_run
+from compute_horde_validator.validator.synthetic_jobs.fake_miners import (
+    FAKE_MINER_HOST,
+    FakeMinerFleet,
+    fake_miner_fleet_configs,
+)
+
+from .mock_generator import MockSyntheticJobGeneratorFactory
+
+pytestmark = [
+    pytest.mark.django_db(databases=["default", "default_alias"], transaction=True),
+]
+
+
+@pytest.fixture
+def base_port():
+    return random.randrange(20000, 60000, 100)
+
+
+def test_fake_miner_fleet_configs_are_reproducible():
+    configs = fake_miner_fleet_configs(100, 18000, slow_ratio=0.2, misbehaving_ratio=0.1, seed=3)
+
+    assert configs == fake_miner_fleet_configs(
+        100, 18000, slow_ratio=0.2, misbehaving_ratio=0.1, seed=3
+    )
+    assert [config.port for config in configs] == list(range(18000, 18100))
+    assert len({config.hotkey for config in configs}) == 100
+    assert 5 < sum(config.job_time > 0.5 for config in configs) < 40
+    assert 0 < sum(config.misbehaviour is not None for config in configs) < 25
+
+
+def _flush_count() -> float:
+    return (
+        prometheus_client.REGISTRY.get_sample_value(
+            "validator_miner_transport_flush_messages_count"
+        )
+        or 0
+    )
+
+
+@pytest.mark.asyncio
+async def test_batch_run_against_fake_miners(
+    mocker: MockerFixture, base_port: int, small_spin_up_times
+):
+    configs = fake_miner_fleet_configs(3, base_port, job_time=0.05)
+    configs[1].accept_ratio = 0
+    configs[2].misbehaviour = "disconnect"
+    job_uuids = [uuid.uuid4() for _ in configs]
+    mocker.patch(
+        "compute_horde_validator.validator.synthetic_jobs.generator.current.synthetic_job_generator_factory",
+        MockSyntheticJobGeneratorFactory(uuids=list(job_uuids)),
+    )
+    miners = [await Miner.objects.acreate(hotkey=config.hotkey) for config in configs]
+    axons = {
+        config.hotkey: bittensor.AxonInfo(
+            version=4,
+            ip=FAKE_MINER_HOST,
+            ip_type=4,
+            port=config.port,
+            hotkey=config.hotkey,
+            coldkey=config.hotkey,
+        )
+        for config in configs
+    }
+
+    flushes_before = _flush_count()
+    fleet = FakeMinerFleet(configs)
+    await fleet.start()
+    try:
+        await execute_synthetic_batch_run(axons, miners)
+    finally:
+        sent = await fleet.stop()
+
+    statuses = {
+        job.miner.hotkey: job.status
+        async for job in SyntheticJob.objects.select_related("miner").all()
+    }
+    assert statuses == {
+        configs[0].hotkey: SyntheticJob.Status.COMPLETED,
+        configs[1].hotkey: SyntheticJob.Status.FAILED,
+        configs[2].hotkey: SyntheticJob.Status.FAILED,
+    }
+    sent_types = {(message.miner_hotkey, message.message_type) for message in sent}
+    assert (configs[0].hotkey, "V0JobFinishedRequest") in sent_types
+    assert (configs[1].hotkey, "V0DeclineJobRequest") in sent_types
+    assert {message.miner_hotkey for message in sent} == {config.hotkey for config in configs}
+    # the auth messages at least went through the send queues of the transports
+    assert _flush_count() >= flushes_before + len(configs)
+
+
+@pytest.mark.asyncio
+async def test_batch_run_against_fake_miners_taking_batch_requests(
+    mocker: MockerFixture, base_port: int, small_spin_up_times
+):
+    configs = fake_miner_fleet_configs(2, base_port, executor_count=3, job_time=0.05)
+    configs[0].batch_requests = True
+    mocker.patch(
+        "compute_horde_validator.validator.synthetic_jobs.generator.current.synthetic_job_generator_factory",
+        MockSyntheticJobGeneratorFactory(uuids=[uuid.uuid4() for _ in range(6)]),
+    )
+    miners = [await Miner.objects.acreate(hotkey=config.hotkey) for config in configs]
+    axons = {
+        config.hotkey: bittensor.AxonInfo(
+            version=4,
+            ip=FAKE_MINER_HOST,
+            ip_type=4,
+            port=config.port,
+            hotkey=config.hotkey,
+            coldkey=config.hotkey,
+        )
+        for config in configs
+    }
+
+    fleet = FakeMinerFleet(configs)
+    await fleet.start()
+    try:
+        await execute_synthetic_batch_run(axons, miners)
+    finally:
+        sent = await fleet.stop()
+
+    statuses = [
+        (job.miner.hotkey, job.status)
+        async for job in SyntheticJob.objects.select_related("miner").order_by("miner__hotkey")
+    ]
+    assert statuses == [
+        (config.hotkey, SyntheticJob.Status.COMPLETED) for config in configs for _ in range(3)
+    ]
+    finished = [message for message in sent if message.message_type == "V0JobFinishedRequest"]
+    assert len(finished) == 6
+
+
+@pytest.mark.asyncio
+async def test_benchmark_synthetic_jobs_batch_command(mocker: MockerFixture, base_port: int):
+    mocker.patch(
+        "compute_horde_validator.validator.synthetic_jobs.generator.current.synthetic_job_generator_factory",
+        MockSyntheticJobGeneratorFactory(uuids=[uuid.uuid4() for _ in range(2)]),
+    )
+    stdout = io.StringIO()
+
+    await sync_to_async(call_command)(
+        "benchmark_synthetic_jobs_batch",
+        miners=2,
+        job_time=0.05,
+        base_port=base_port,
+        stdout=stdout,
+    )
+
+    output = stdout.getvalue()
+    assert "_multi_send_job_request" in output
+    assert "V0JobFinishedRequest timestamp error: n=2" in output
@@ -0,0 +1,122 @@
+import asyncio
+import json
+import uuid
+from collections.abc import Callable
+
+import bittensor
+import pytest
+from compute_horde.executor_class import EXECUTOR_CLASS, ExecutorClass
+from compute_horde.mv_protocol import miner_requests
+from pytest_mock import MockerFixture
+
+from compute_horde_validator.validator.models import Miner
+from compute_horde_validator.validator.synthetic_jobs.batch_run import (
+    _generate_jobs,
+    _init_context,
+    _multi_send_initial_job_request,
+    _prepare_frames,
+)
+from compute_horde_validator.validator.tests.transport import MinerSimulationTransport
+
+from .mock_generator import MockSyntheticJobGeneratorFactory
+
+pytestmark = [
+    pytest.mark.asyncio,
+    pytest.mark.django_db(databases=["default", "default_alias"], transaction=True),
+]
+
+
+async def _respond_to_initial_job_requests(ctx, transport: MinerSimulationTransport, accept: set):
+    responded = 0
+    while True:
+        await asyncio.sleep(0.01)
+        for message in transport.sent[responded:]:
+            responded += 1
+            data = json.loads(message)
+            if data["message_type"] != "V0InitialJobRequest":
+                continue
+            job = ctx.jobs[data["job_uuid"]]
+            if data["job_uuid"] in accept:
+                job.handle_message(miner_requests.V0AcceptJobRequest(job_uuid=job.uuid))
+                job.handle_message(miner_requests.V0ExecutorReadyRequest(job_uuid=job.uuid))
+            else:
+                job.handle_message(miner_requests.V0DeclineJobRequest(job_uuid=job.uuid))
+
+
+async def test_initial_job_requests_are_staggered_by_executor_class(
+    mocker: MockerFixture,
+    miner: Miner,
+    axon_dict: dict[str, bittensor.AxonInfo],
+    create_simulation_miner_client: Callable,
+    transport: MinerSimulationTransport,
+    small_spin_up_times,
+):
+    spin_up_uuid, always_on_uuid, declined_uuid = (uuid.uuid4() for _ in range(3))
+    mocker.patch(
+        "compute_horde_validator.validator.synthetic_jobs.generator.current.synthetic_job_generator_factory",
+        MockSyntheticJobGeneratorFactory(uuids=[spin_up_uuid, always_on_uuid, declined_uuid]),
+    )
+
+    ctx = _init_context(axon_dict, [miner], create_miner_client=create_simulation_miner_client)
+    ctx.executors[miner.hotkey][ExecutorClass.spin_up_4min__gpu_24gb] = 1
+    ctx.executors[miner.hotkey][ExecutorClass.always_on__gpu_24gb] = 2
+    await _generate_jobs(ctx)
+    _prepare_frames(ctx)
+
+    responder = asyncio.create_task(
+        _respond_to_initial_job_requests(
+            ctx, transport, accept={str(spin_up_uuid), str(always_on_uuid)}
+        )
+    )
+    try:
+        await asyncio.wait_for(_multi_send_initial_job_request(ctx), timeout=4)
+    finally:
+        responder.cancel()
+
+    spin_up_job = ctx.jobs[str(spin_up_uuid)]
+    always_on_job = ctx.jobs[str(always_on_uuid)]
+    declined_job = ctx.jobs[str(declined_uuid)]
+    for job in (spin_up_job, always_on_job, declined_job):
+        assert job.exception is None
+
+    # max spin-up time is 4 seconds, always on executors get the minimum of 2 seconds
+    stagger = always_on_job.accept_before_sent_time - spin_up_job.accept_before_sent_time
+    assert 1.9 < stagger.total_seconds() < 2.5
+    assert declined_job.accept_before_sent_time >= always_on_job.accept_before_sent_time
+
+    assert spin_up_job.job_started_receipt is not None
+    assert always_on_job.job_started_receipt is not None
+    assert declined_job.job_started_receipt is None
+    sent_types = [json.loads(message)["message_type"] for message in transport.sent]
+    assert sent_types.count("V0JobStartedReceiptRequest") == 2
+
+
+async def test_initial_job_requests_time_out(
+    mocker: MockerFixture,
+    miner: Miner,
+    axon_dict: dict[str, bittensor.AxonInfo],
+    create_simulation_miner_client: Callable,
+    monkeypatch,
+):
+    job_uuid = uuid.uuid4()
+    mocker.patch(
+        "compute_horde_validator.validator.synthetic_jobs.generator.current.synthetic_job_generator_factory",
+        MockSyntheticJobGeneratorFactory(uuids=[job_uuid]),
+    )
+    monkeypatch.setattr(EXECUTOR_CLASS[ExecutorClass.spin_up_4min__gpu_24gb], "spin_up_time", 1)
+    monkeypatch.setattr(
+        "compute_horde_validator.validator.synthetic_jobs.batch_run._MIN_SPIN_UP_TIME", 0
+    )
+
+    ctx = _init_context(axon_dict, [miner], create_miner_client=create_simulation_miner_client)
+    ctx.executors[miner.hotkey][ExecutorClass.spin_up_4min__gpu_24gb] = 1
+    await _generate_jobs(ctx)
+    _prepare_frames(ctx)
+
+    # the miner never responds
+    await asyncio.wait_for(_multi_send_initial_job_request(ctx), timeout=2)
+
+    job = ctx.jobs[str(job_uuid)]
+    assert isinstance(job.exception, TimeoutError)
+    assert job.exception_stage == "_send_initial_job_request"
+    assert job.accept_before_sent_time is not None
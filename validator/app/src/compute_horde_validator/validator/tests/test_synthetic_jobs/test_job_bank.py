@@ -0,0 +1,138 @@
+import pickle
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from asgiref.sync import sync_to_async
+from compute_horde.executor_class import DEFAULT_EXECUTOR_CLASS
+from django.utils.timezone import now
+
+from compute_horde_validator.validator.models import SyntheticJobBankEntry
+from compute_horde_validator.validator.synthetic_jobs.generator.factory import (
+    DefaultSyntheticJobGeneratorFactory,
+)
+from compute_horde_validator.validator.synthetic_jobs.generator.gpu_hashcat import (
+    GPUHashcatSyntheticJobGenerator,
+)
+from compute_horde_validator.validator.synthetic_jobs.job_bank import (
+    claim_job_bank_entries,
+    generate_job_bank_entry,
+    purge_job_bank,
+    refill_job_bank,
+)
+
+pytestmark = [
+    pytest.mark.django_db(databases=["default", "default_alias"], transaction=True),
+    pytest.mark.override_config(
+        DYNAMIC_WEIGHTS_VERSION=1,
+        DYNAMIC_SYNTHETIC_JOB_BANK_SIZE=5,
+        DYNAMIC_SYNTHETIC_JOB_BANK_TTL=60 * 60,
+    ),
+]
+
+
+def test_refill_job_bank_tops_up_to_configured_size():
+    SyntheticJobBankEntry.objects.bulk_create([generate_job_bank_entry(1) for _ in range(2)])
+
+    assert refill_job_bank() == 3
+    assert SyntheticJobBankEntry.objects.filter(weights_version=1).count() == 5
+
+    # already full
+    assert refill_job_bank() == 0
+    assert SyntheticJobBankEntry.objects.count() == 5
+
+
+def test_purge_job_bank_drops_expired_and_other_weights_versions():
+    fresh = generate_job_bank_entry(1)
+    expired = generate_job_bank_entry(1)
+    expired.created_at = now() - timedelta(hours=2)
+    other_version = generate_job_bank_entry(2)
+    SyntheticJobBankEntry.objects.bulk_create([fresh, expired, other_version])
+
+    assert purge_job_bank(1) == 2
+    assert list(SyntheticJobBankEntry.objects.values_list("job_uuid", flat=True)) == [
+        fresh.job_uuid
+    ]
+
+
+def test_claim_job_bank_entries_deletes_claimed_entries():
+    entries = [generate_job_bank_entry(1) for _ in range(3)]
+    SyntheticJobBankEntry.objects.bulk_create(entries)
+
+    first = claim_job_bank_entries(1, 2)
+    second = claim_job_bank_entries(1, 2)
+    third = claim_job_bank_entries(1, 2)
+
+    assert [len(first), len(second), len(third)] == [2, 1, 0]
+    claimed_uuids = [generator.uuid() for generator in first + second]
+    assert sorted(claimed_uuids) == sorted(entry.job_uuid for entry in entries)
+    assert not SyntheticJobBankEntry.objects.exists()
+
+
+def test_claim_job_bank_entries_skips_other_weights_versions():
+    SyntheticJobBankEntry.objects.bulk_create([generate_job_bank_entry(2)])
+
+    assert claim_job_bank_entries(1, 1) == []
+    assert SyntheticJobBankEntry.objects.count() == 1
+
+
+def test_claim_job_bank_entries_keeps_entries_when_unpickling_fails():
+    entry = generate_job_bank_entry(1)
+    entry.hash_job = b"not a pickle"
+    entry.save()
+
+    with pytest.raises(pickle.UnpicklingError):
+        claim_job_bank_entries(1, 1)
+    assert SyntheticJobBankEntry.objects.count() == 1
+
+
+@pytest.mark.asyncio
+async def test_precomputed_generator_uses_stored_values():
+    entry = await sync_to_async(generate_job_bank_entry)(1)
+    await entry.asave()
+    (generator,) = await sync_to_async(claim_job_bank_entries)(1, 1)
+
+    with patch(
+        "compute_horde_validator.validator.synthetic_jobs.generator.gpu_hashcat.generate_hash_job"
+    ) as generate_hash_job:
+        await generator.ainit()
+        assert await generator.volume_contents() == entry.volume_contents
+    generate_hash_job.assert_not_called()
+
+    assert generator.uuid() == entry.job_uuid
+    assert generator.weights_version == 1
+    assert generator.expected_answer == entry.expected_answer
+
+
+@pytest.mark.asyncio
+async def test_create_many_falls_back_when_bank_is_short():
+    entry = await sync_to_async(generate_job_bank_entry)(1)
+    await entry.asave()
+
+    generators = await DefaultSyntheticJobGeneratorFactory().create_many(DEFAULT_EXECUTOR_CLASS, 3)
+
+    assert len(generators) == 3
+    assert generators[0].uuid() == entry.job_uuid
+    assert all(isinstance(generator, GPUHashcatSyntheticJobGenerator) for generator in generators)
+    # fallback generators share the weights version of the claimed jobs
+    assert {generator.weights_version for generator in generators} == {1}
+    assert len({generator.uuid() for generator in generators}) == 3
+    assert not await SyntheticJobBankEntry.objects.aexists()
+
+
+@pytest.mark.asyncio
+async def test_create_many_falls_back_when_claim_fails():
+    with patch(
+        "compute_horde_validator.validator.synthetic_jobs.generator.factory.claim_job_bank_entries",
+        side_effect=RuntimeError("db is gone"),
+    ):
+        generators = await DefaultSyntheticJobGeneratorFactory().create_many(
+            DEFAULT_EXECUTOR_CLASS, 2
+        )
+
+    assert len(generators) == 2
+    for generator in generators:
+        assert generator.hash_job is None
+        await generator.ainit()
+        assert generator.weights_version == 1
+        assert generator.hash_job is not None
@@ -0,0 +1,60 @@
+import base64
+import io
+import pickle
+import zipfile
+
+from cryptography.fernet import Fernet
+
+from compute_horde_validator.validator.synthetic_jobs.parallel_generation import (
+    PrecomputedHashJob,
+    hash_job_process_pool,
+    precompute_hash_jobs,
+)
+from compute_horde_validator.validator.synthetic_jobs.v1_synthetic_job import V1SyntheticJob
+
+
+def _unzip_payload(volume_contents: str) -> bytes:
+    with zipfile.ZipFile(io.BytesIO(base64.b64decode(volume_contents))) as zipf:
+        return zipf.read("payload.txt")
+
+
+def _check_v1_job(job: PrecomputedHashJob):
+    hash_job = job.hash_job
+    assert isinstance(hash_job, V1SyntheticJob)
+    assert job.expected_answer == hash_job.answer
+
+    data = pickle.loads(_unzip_payload(job.volume_contents))
+    assert data["masks"] == hash_job.hash_masks()
+    assert data["payloads"][0] == hash_job._payload(0)
+    for i in range(1, len(hash_job.algorithms)):
+        # Fernet tokens are salted with a random IV, so compare the decrypted contents
+        key = hash_job._hash("\n".join(hash_job.passwords[i - 1]).encode("utf-8"))
+        assert Fernet(key).decrypt(data["payloads"][i]).decode("utf-8") == hash_job._payload(i)
+
+
+def test_hash_hexes_match_hashing_one_by_one():
+    (job,) = precompute_hash_jobs(weights_version=1, count=1)
+    hash_job = job.hash_job
+    for i, algorithm in enumerate(hash_job.algorithms):
+        assert hash_job.hash_hexes(i) == [
+            algorithm.hash(password.encode("ascii") + hash_job.salts[i]).hexdigest()
+            for password in hash_job.passwords[i]
+        ]
+
+
+def test_precompute_hash_jobs_in_process():
+    jobs = precompute_hash_jobs(weights_version=1, count=3)
+    assert len(jobs) == 3
+    for job in jobs:
+        _check_v1_job(job)
+
+
+def test_precompute_hash_jobs_in_process_pool():
+    with hash_job_process_pool(2) as executor:
+        jobs = precompute_hash_jobs(weights_version=1, count=9, executor=executor, workers=2)
+
+    assert len(jobs) == 9
+    for job in jobs:
+        _check_v1_job(job)
+    # workers must not share the random state
+    assert len({tuple(job.hash_job.passwords[0]) for job in jobs}) == 9
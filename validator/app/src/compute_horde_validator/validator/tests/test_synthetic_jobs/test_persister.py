@@ -0,0 +1,145 @@
+import random
+import uuid
+from datetime import UTC, datetime
+
+import bittensor
+import pytest
+import pytest_asyncio
+from pytest_mock import MockerFixture
+
+from compute_horde_validator.validator.models import (
+    JobFinishedReceipt,
+    JobStartedReceipt,
+    Miner,
+    SyntheticJob,
+    SyntheticJobBatch,
+)
+from compute_horde_validator.validator.synthetic_jobs import batch_run
+from compute_horde_validator.validator.synthetic_jobs.batch_run import execute_synthetic_batch_run
+from compute_horde_validator.validator.synthetic_jobs.fake_miners import (
+    FAKE_MINER_HOST,
+    FakeMinerFleet,
+    fake_miner_fleet_configs,
+)
+from compute_horde_validator.validator.synthetic_jobs.persister import BatchPersister
+
+from .mock_generator import MockSyntheticJobGeneratorFactory
+
+pytestmark = [
+    pytest.mark.asyncio,
+    pytest.mark.django_db(databases=["default", "default_alias"], transaction=True),
+]
+
+
+@pytest.fixture
+def configs():
+    return fake_miner_fleet_configs(3, random.randrange(20000, 60000, 100), job_time=0.05)
+
+
+@pytest.fixture
+def axons(configs):
+    return {
+        config.hotkey: bittensor.AxonInfo(
+            version=4,
+            ip=FAKE_MINER_HOST,
+            ip_type=4,
+            port=config.port,
+            hotkey=config.hotkey,
+            coldkey=config.hotkey,
+        )
+        for config in configs
+    }
+
+
+@pytest_asyncio.fixture
+async def fleet(configs, mocker: MockerFixture):
+    mocker.patch(
+        "compute_horde_validator.validator.synthetic_jobs.generator.current.synthetic_job_generator_factory",
+        MockSyntheticJobGeneratorFactory(uuids=[uuid.uuid4() for _ in configs]),
+    )
+    fleet = FakeMinerFleet(configs)
+    await fleet.start()
+    yield fleet
+    await fleet.stop()
+
+
+def _receipt(job_uuid: uuid.UUID) -> JobFinishedReceipt:
+    return JobFinishedReceipt(
+        job_uuid=job_uuid,
+        miner_hotkey="miner",
+        validator_hotkey="validator",
+        time_started=datetime.now(tz=UTC),
+        time_took_us=1,
+        score_str="1",
+    )
+
+
+async def test_persister_writes_in_chunks():
+    persister = BatchPersister(chunk_size=2, max_pending_chunks=1)
+    for _ in range(5):
+        await persister.add(_receipt(uuid.uuid4()))
+    await persister.close()
+
+    assert persister.written == 5
+    assert persister.failed == []
+    assert await JobFinishedReceipt.objects.acount() == 5
+
+
+async def test_persister_keeps_failed_chunks():
+    duplicate = uuid.uuid4()
+    await JobFinishedReceipt.objects.acreate(
+        job_uuid=duplicate,
+        miner_hotkey="miner",
+        validator_hotkey="validator",
+        time_started=datetime.now(tz=UTC),
+        time_took_us=1,
+        score_str="1",
+    )
+
+    persister = BatchPersister(chunk_size=2)
+    rows = [_receipt(uuid.uuid4()), _receipt(duplicate), _receipt(uuid.uuid4())]
+    await persister.add(*rows[:2])
+    await persister.add(rows[2])
+    await persister.close()
+
+    assert persister.written == 1
+    assert persister.failed == rows[:2]
+
+
+async def test_batch_jobs_are_streamed_before_the_batch_is_finished(axons, fleet, monkeypatch):
+    seen = {}
+    db_persist = batch_run._db_persist
+
+    async def checking_db_persist(ctx):
+        seen["jobs"] = await SyntheticJob.objects.acount()
+        seen["finished"] = await SyntheticJobBatch.objects.filter(
+            accepting_results_until__isnull=False
+        ).aexists()
+        await db_persist(ctx)
+
+    monkeypatch.setattr(batch_run, "_db_persist", checking_db_persist)
+
+    miners = [await Miner.objects.acreate(hotkey=hotkey) for hotkey in axons]
+    await execute_synthetic_batch_run(axons, miners)
+
+    assert seen == {"jobs": 3, "finished": False}
+    batch = await SyntheticJobBatch.objects.aget()
+    assert batch.accepting_results_until is not None
+    assert await SyntheticJob.objects.filter(batch=batch).acount() == 3
+    assert await JobStartedReceipt.objects.acount() == 3
+    assert await JobFinishedReceipt.objects.acount() == 3
+
+
+async def test_batch_is_not_finished_if_persisting_fails(axons, fleet, monkeypatch):
+    async def failing_db_persist(ctx):
+        raise RuntimeError("database is gone")
+
+    monkeypatch.setattr(batch_run, "_db_persist", failing_db_persist)
+
+    miners = [await Miner.objects.acreate(hotkey=hotkey) for hotkey in axons]
+    with pytest.raises(RuntimeError):
+        await execute_synthetic_batch_run(axons, miners)
+
+    batch = await SyntheticJobBatch.objects.aget()
+    assert batch.accepting_results_until is None
+    assert await SyntheticJob.objects.filter(batch=batch).acount() == 3
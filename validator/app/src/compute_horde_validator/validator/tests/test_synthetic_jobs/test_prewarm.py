@@ -0,0 +1,123 @@
+import asyncio
+import random
+import uuid
+
+import bittensor
+import pytest
+import pytest_asyncio
+from pytest_mock import MockerFixture
+
+from compute_horde_validator.validator.models import Miner, SyntheticJob, SystemEvent
+from compute_horde_validator.validator.synthetic_jobs import batch_run
+from compute_horde_validator.validator.synthetic_jobs.batch_run import (
+    MinerClient,
+    execute_synthetic_batch_run,
+)
+from compute_horde_validator.validator.synthetic_jobs.fake_miners import (
+    FAKE_MINER_HOST,
+    FakeMinerFleet,
+    fake_miner_fleet_configs,
+)
+
+from .mock_generator import MockSyntheticJobGeneratorFactory
+
+pytestmark = [
+    pytest.mark.asyncio,
+    pytest.mark.django_db(databases=["default", "default_alias"], transaction=True),
+]
+
+
+@pytest.fixture
+def configs():
+    return fake_miner_fleet_configs(2, random.randrange(20000, 60000, 100), job_time=0.05)
+
+
+@pytest.fixture
+def axons(configs):
+    return {
+        config.hotkey: bittensor.AxonInfo(
+            version=4,
+            ip=FAKE_MINER_HOST,
+            ip_type=4,
+            port=config.port,
+            hotkey=config.hotkey,
+            coldkey=config.hotkey,
+        )
+        for config in configs
+    }
+
+
+@pytest_asyncio.fixture
+async def fleet(configs, mocker: MockerFixture):
+    mocker.patch(
+        "compute_horde_validator.validator.synthetic_jobs.generator.current.synthetic_job_generator_factory",
+        MockSyntheticJobGeneratorFactory(uuids=[uuid.uuid4() for _ in configs]),
+    )
+    fleet = FakeMinerFleet(configs)
+    await fleet.start()
+    yield fleet
+    await fleet.stop()
+
+
+async def _batch_telemetry() -> dict:
+    event = await SystemEvent.objects.aget(
+        type=SystemEvent.EventType.VALIDATOR_TELEMETRY,
+        subtype=SystemEvent.EventSubType.SYNTHETIC_BATCH,
+    )
+    return event.data
+
+
+async def test_prewarmed_batch_starts_connected(configs, axons, fleet):
+    clients: dict[str, MinerClient] = {}
+
+    def create_miner_client(ctx, miner_hotkey):
+        clients[miner_hotkey] = MinerClient(ctx=ctx, miner_hotkey=miner_hotkey)
+        return clients[miner_hotkey]
+
+    async def wait_until():
+        async with asyncio.timeout(5):
+            while not all(client.ctx.manifests[hotkey] for hotkey, client in clients.items()):
+                await asyncio.sleep(0.01)
+
+    miners = [await Miner.objects.acreate(hotkey=config.hotkey) for config in configs]
+    await execute_synthetic_batch_run(
+        axons, miners, create_miner_client=create_miner_client, wait_until=wait_until
+    )
+
+    assert {job.status async for job in SyntheticJob.objects.all()} == {
+        SyntheticJob.Status.COMPLETED
+    }
+    telemetry = await _batch_telemetry()
+    assert telemetry["counts"]["prewarmed_miners"] == 2
+    assert "_prewarm_miner_connections" in telemetry["stage_start_time"]
+
+
+async def test_lost_prewarmed_connection_is_reconnected(configs, axons, fleet, monkeypatch):
+    monkeypatch.setattr(batch_run, "_PREWARM_PING_INTERVAL", 0.05)
+    clients: dict[str, MinerClient] = {}
+
+    def create_miner_client(ctx, miner_hotkey):
+        clients[miner_hotkey] = MinerClient(ctx=ctx, miner_hotkey=miner_hotkey)
+        return clients[miner_hotkey]
+
+    async def wait_until():
+        lost = clients[configs[0].hotkey]
+        async with asyncio.timeout(5):
+            while lost.ctx.manifests[configs[0].hotkey] is None:
+                await asyncio.sleep(0.01)
+            # the transport reconnects on its own, without authenticating
+            await lost.transport.ws.close()
+            while lost.ctx.manifests[configs[0].hotkey] is not None:
+                await asyncio.sleep(0.01)
+
+    miners = [await Miner.objects.acreate(hotkey=config.hotkey) for config in configs]
+    await execute_synthetic_batch_run(
+        axons, miners, create_miner_client=create_miner_client, wait_until=wait_until
+    )
+
+    assert {job.status async for job in SyntheticJob.objects.all()} == {
+        SyntheticJob.Status.COMPLETED
+    }
+    telemetry = await _batch_telemetry()
+    assert telemetry["counts"]["prewarmed_miners"] == 1
+    assert telemetry["counts"]["manifests"] == 2
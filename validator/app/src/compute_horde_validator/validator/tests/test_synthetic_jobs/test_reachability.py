@@ -0,0 +1,125 @@
+import random
+import time
+import uuid
+
+import bittensor
+import pytest
+import pytest_asyncio
+from pytest_mock import MockerFixture
+
+from compute_horde_validator.validator.models import (
+    Miner,
+    MinerReachability,
+    SyntheticJob,
+    SystemEvent,
+)
+from compute_horde_validator.validator.synthetic_jobs.batch_run import (
+    db_record_miner_reachability,
+    execute_synthetic_batch_run,
+)
+from compute_horde_validator.validator.synthetic_jobs.fake_miners import (
+    FAKE_MINER_HOST,
+    FakeMinerFleet,
+    fake_miner_fleet_configs,
+)
+from compute_horde_validator.validator.synthetic_jobs.reachability import (
+    recover_unreachable_miners,
+)
+
+from .mock_generator import MockSyntheticJobGeneratorFactory
+
+pytestmark = [
+    pytest.mark.django_db(databases=["default", "default_alias"], transaction=True),
+]
+
+
+@pytest.fixture
+def base_port():
+    return random.randrange(20000, 60000, 100)
+
+
+@pytest.fixture
+def configs(base_port):
+    return fake_miner_fleet_configs(1, base_port, job_time=0.05)
+
+
+@pytest.fixture
+def axons(configs, base_port):
+    # the second miner doesn't listen
+    hotkeys_ports = [(config.hotkey, config.port) for config in configs]
+    hotkeys_ports.append(("dead_miner", base_port + 50))
+    return {
+        hotkey: bittensor.AxonInfo(
+            version=4, ip=FAKE_MINER_HOST, ip_type=4, port=port, hotkey=hotkey, coldkey=hotkey
+        )
+        for hotkey, port in hotkeys_ports
+    }
+
+
+@pytest_asyncio.fixture
+async def fleet(configs, mocker: MockerFixture):
+    mocker.patch(
+        "compute_horde_validator.validator.synthetic_jobs.generator.current.synthetic_job_generator_factory",
+        MockSyntheticJobGeneratorFactory(uuids=[uuid.uuid4() for _ in configs]),
+    )
+    fleet = FakeMinerFleet(configs)
+    await fleet.start()
+    yield fleet
+    await fleet.stop()
+
+
+def test_record_miner_reachability():
+    miners = [Miner.objects.create(hotkey=f"miner_{i}") for i in range(3)]
+    MinerReachability.objects.create(miner=miners[0], consecutive_failures=2)
+
+    db_record_miner_reachability(miners, {"miner_0": False, "miner_1": True})
+    db_record_miner_reachability(miners, {"miner_0": False, "miner_1": False})
+
+    reachability = {
+        r.miner.hotkey: r for r in MinerReachability.objects.select_related("miner").all()
+    }
+    assert reachability.keys() == {"miner_0", "miner_1"}
+    assert reachability["miner_0"].consecutive_failures == 4
+    assert reachability["miner_1"].consecutive_failures == 1
+    assert reachability["miner_1"].last_success_at is not None
+
+
+@pytest.mark.asyncio
+@pytest.mark.override_config(DYNAMIC_SYNTHETIC_JOBS_UNREACHABLE_MINER_FAILURES=3)
+async def test_unreachable_miner_fails_fast(configs, axons, fleet):
+    miners = [await Miner.objects.acreate(hotkey=hotkey) for hotkey in axons]
+    await MinerReachability.objects.acreate(miner=miners[1], consecutive_failures=3)
+
+    start = time.monotonic()
+    await execute_synthetic_batch_run(axons, miners)
+
+    # a single connection attempt instead of the full retries
+    assert time.monotonic() - start < 10
+    assert await SyntheticJob.objects.filter(status=SyntheticJob.Status.COMPLETED).acount() == 1
+    reachability = {
+        r.miner.hotkey: r.consecutive_failures
+        async for r in MinerReachability.objects.select_related("miner").all()
+    }
+    assert reachability == {configs[0].hotkey: 0, "dead_miner": 4}
+
+    telemetry = await SystemEvent.objects.aget(
+        type=SystemEvent.EventType.VALIDATOR_TELEMETRY,
+        subtype=SystemEvent.EventSubType.SYNTHETIC_BATCH,
+    )
+    assert telemetry.data["counts"]["unreachable_miners"] == 1
+    assert telemetry.data["counts"]["recovered_miners"] == 0
+
+
+@pytest.mark.asyncio
+async def test_recover_unreachable_miners(configs, axons, fleet):
+    miners = [await Miner.objects.acreate(hotkey=hotkey) for hotkey in axons]
+    for miner in miners:
+        await MinerReachability.objects.acreate(miner=miner, consecutive_failures=5)
+
+    assert await recover_unreachable_miners(axons, [miners[0]]) == 1
+
+    reachability = {
+        r.miner.hotkey: r.consecutive_failures
+        async for r in MinerReachability.objects.select_related("miner").all()
+    }
+    assert reachability == {configs[0].hotkey: 0, "dead_miner": 5}
@@ -0,0 +1,219 @@
+import asyncio
+import contextlib
+import json
+import pickle
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import bittensor
+import pytest
+from compute_horde.executor_class import DEFAULT_EXECUTOR_CLASS
+from compute_horde.miner_client.base import AbstractTransport
+from compute_horde.mv_protocol import miner_requests
+from pytest_mock import MockerFixture
+
+from compute_horde_validator.validator.dynamic_config import dynamic_config_holder
+from compute_horde_validator.validator.models import (
+    Miner,
+    MinerManifest,
+    SyntheticJob,
+    SyntheticJobBatch,
+    SystemEvent,
+)
+from compute_horde_validator.validator.synthetic_jobs import batch_run
+from compute_horde_validator.validator.synthetic_jobs.batch_run import (
+    BatchShardSync,
+    Job,
+    MinerClient,
+)
+from compute_horde_validator.validator.synthetic_jobs.sharding import (
+    execute_sharded_synthetic_batch_run,
+    split_miners,
+)
+
+from .mock_generator import MOCK_SCORE, MockSyntheticJobGenerator, MockSyntheticJobGeneratorFactory
+
+pytestmark = [
+    pytest.mark.asyncio,
+    pytest.mark.django_db(databases=["default", "default_alias"], transaction=True),
+]
+
+
+class _RespondingTransport(AbstractTransport):
+    """
+    Answers every request the way a healthy miner with a single executor would.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.messages: asyncio.Queue[str] = asyncio.Queue()
+
+    async def start(self): ...
+
+    async def stop(self): ...
+
+    async def send(self, data: str | bytes) -> None:
+        request = json.loads(data)
+        job_uuid = request.get("job_uuid")
+        match request["message_type"]:
+            case "V0AuthenticateRequest":
+                manifest = miner_requests.ExecutorManifest(
+                    executor_classes=[
+                        miner_requests.ExecutorClassManifest(
+                            executor_class=DEFAULT_EXECUTOR_CLASS, count=1
+                        )
+                    ]
+                )
+                responses = [miner_requests.V0ExecutorManifestRequest(manifest=manifest)]
+            case "V0InitialJobRequest":
+                responses = [
+                    miner_requests.V0AcceptJobRequest(job_uuid=job_uuid),
+                    miner_requests.V0ExecutorReadyRequest(job_uuid=job_uuid),
+                ]
+            case "V0JobRequest":
+                responses = [
+                    miner_requests.V0JobFinishedRequest(
+                        job_uuid=job_uuid, docker_process_stdout="", docker_process_stderr=""
+                    )
+                ]
+            case _:
+                responses = []
+        for response in responses:
+            self.messages.put_nowait(response.model_dump_json())
+
+    async def receive(self) -> str:
+        return await self.messages.get()
+
+
+def _create_miner_client(ctx, miner_hotkey: str) -> MinerClient:
+    return MinerClient(
+        ctx=ctx, miner_hotkey=miner_hotkey, transport=_RespondingTransport(miner_hotkey)
+    )
+
+
+async def test_split_miners_round_robin():
+    miners = [Miner(hotkey=f"miner_{i}") for i in range(5)]
+    assert [[miner.hotkey for miner in shard] for shard in split_miners(miners, 2)] == [
+        ["miner_0", "miner_2", "miner_4"],
+        ["miner_1", "miner_3"],
+    ]
+
+
+async def test_shard_sync_agrees_on_max_spin_up_time():
+    barrier, shared = threading.Barrier(2), {}
+    shards = [
+        BatchShardSync(index=index, count=2, batch_uuid="batch", barrier=barrier, shared=shared)
+        for index in range(2)
+    ]
+
+    results = await asyncio.gather(
+        shards[0].synchronize("stage", 4),
+        shards[1].synchronize("stage", 2),
+    )
+
+    assert results == [4, 4]
+
+
+async def test_shard_sync_continues_when_a_shard_aborts():
+    barrier, shared = threading.Barrier(2), {}
+    shards = [
+        BatchShardSync(index=index, count=2, batch_uuid="batch", barrier=barrier, shared=shared)
+        for index in range(2)
+    ]
+
+    shards[1].abort()
+
+    assert await asyncio.wait_for(shards[0].synchronize("stage", 4), timeout=1) == 4
+
+
+async def test_job_pickles_without_context():
+    job = Job(
+        ctx=None,
+        uuid=str(uuid.uuid4()),
+        name="job",
+        miner_hotkey="miner",
+        executor_class=DEFAULT_EXECUTOR_CLASS,
+        job_generator=MockSyntheticJobGenerator(uuid.uuid4()),
+        volume_contents="mock",
+        score=0.5,
+    )
+    job.accept_response_event.set()
+
+    restored = pickle.loads(pickle.dumps(job))
+
+    assert restored.uuid == job.uuid
+    assert restored.score == 0.5
+    assert restored.ctx is None
+    # events belong to the shard's event loop and are not carried over
+    assert not restored.accept_response_event.is_set()
+
+
+async def test_sharded_batch_run_merges_and_persists_all_shards(mocker: MockerFixture, monkeypatch):
+    miners = [await Miner.objects.acreate(hotkey=f"miner_{i}") for i in range(4)]
+    axons = {
+        miner.hotkey: bittensor.AxonInfo(
+            version=4,
+            ip="ignore",
+            ip_type=4,
+            port=9000 + i,
+            hotkey=miner.hotkey,
+            coldkey=miner.hotkey,
+        )
+        for i, miner in enumerate(miners)
+    }
+    job_uuids = [uuid.uuid4() for _ in miners]
+    mocker.patch(
+        "compute_horde_validator.validator.synthetic_jobs.generator.current.synthetic_job_generator_factory",
+        MockSyntheticJobGeneratorFactory(uuids=list(job_uuids)),
+    )
+    monkeypatch.setattr(batch_run, "MinerClient", _create_miner_client)
+    # in separate processes each shard has its own config holder, in threads
+    # they would share its lock between event loops
+    monkeypatch.setattr(dynamic_config_holder, "_lock", contextlib.nullcontext())
+    monkeypatch.setattr(batch_run, "_SHARD_SYNC_TIMEOUT", 5)
+
+    # threads instead of processes, so the shards see the test database
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        await asyncio.wait_for(
+            execute_sharded_synthetic_batch_run(axons, miners, 2, executor=executor),
+            timeout=5,
+        )
+
+    assert await SyntheticJobBatch.objects.acount() == 1
+    jobs = [job async for job in SyntheticJob.objects.all()]
+    assert {job.job_uuid for job in jobs} == set(job_uuids)
+    assert all(job.status == SyntheticJob.Status.COMPLETED for job in jobs)
+    assert all(job.score == MOCK_SCORE for job in jobs)
+    assert await MinerManifest.objects.acount() == 4
+
+    sharded_telemetry = await SystemEvent.objects.aget(
+        type=SystemEvent.EventType.VALIDATOR_TELEMETRY,
+        subtype=SystemEvent.EventSubType.SYNTHETIC_BATCH,
+        data__shards__isnull=False,
+    )
+    shards = sharded_telemetry.data["shards"]
+    assert [shard["jobs"] for shard in shards] == [2, 2]
+    assert all("_multi_send_job_request" in shard["stage_start_time"] for shard in shards)
+
+    shard_telemetry = [
+        event.data["shard"]
+        async for event in SystemEvent.objects.filter(
+            type=SystemEvent.EventType.VALIDATOR_TELEMETRY,
+            subtype=SystemEvent.EventSubType.SYNTHETIC_BATCH,
+            data__shard__isnull=False,
+        )
+    ]
+    assert sorted(shard["index"] for shard in shard_telemetry) == [0, 1]
+
+    # the shards wait for each other, so the initial job requests go out together
+    send_times = [
+        datetime.fromisoformat(event.data["accept_before_sent_time"])
+        async for event in SystemEvent.objects.filter(
+            type=SystemEvent.EventType.VALIDATOR_TELEMETRY,
+            subtype=SystemEvent.EventSubType.SYNTHETIC_JOB,
+        )
+    ]
+    assert len(send_times) == 4
+    assert (max(send_times) - min(send_times)).total_seconds() < 0.2
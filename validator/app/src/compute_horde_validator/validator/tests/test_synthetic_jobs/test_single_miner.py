@@ -1,11 +1,15 @@
 import asyncio
+import json
 import uuid
 from collections.abc import Callable
 from unittest.mock import patch
 
 import bittensor
+import prometheus_client
 import pytest
 from asgiref.sync import sync_to_async
+from compute_horde.executor_class import DEFAULT_EXECUTOR_CLASS
+from compute_horde.mv_protocol.validator_requests import V0InitialJobRequest
 from pytest_mock import MockerFixture
 
 from compute_horde_validator.validator.models import (
@@ -68,6 +72,116 @@ async def test_execute_miner_synthetic_jobs_success(
     )
 
 
+def _sample(name: str, **labels: str) -> float:
+    return prometheus_client.REGISTRY.get_sample_value(name, labels) or 0
+
+
+async def test_execute_miner_synthetic_jobs_observes_metrics(
+    miner: Miner,
+    axon_dict: dict[str, bittensor.AxonInfo],
+    manifest_message: str,
+    executor_ready_message: str,
+    accept_job_message: str,
+    job_finish_message: str,
+    create_simulation_miner_client: Callable,
+    transport: MinerSimulationTransport,
+):
+    await transport.add_message(manifest_message, send_before=1)
+    await transport.add_message(accept_job_message, send_before=1)
+    await transport.add_message(executor_ready_message, send_before=0)
+    await transport.add_message(job_finish_message, send_before=2)
+    executor_class = DEFAULT_EXECUTOR_CLASS.value
+    samples = {
+        "send_delay": (
+            "validator_synthetic_job_send_delay_seconds_count",
+            dict(request="job_request", executor_class=executor_class),
+        ),
+        "send_duration": (
+            "validator_synthetic_job_send_duration_seconds_count",
+            dict(request="initial_job_request", executor_class=executor_class),
+        ),
+        "executor_ready": (
+            "validator_synthetic_job_response_latency_seconds_count",
+            dict(response="executor_ready", executor_class=executor_class),
+        ),
+        "job_response": (
+            "validator_synthetic_job_response_latency_seconds_count",
+            dict(response="job", executor_class=executor_class),
+        ),
+        "success": (
+            "validator_synthetic_jobs_total",
+            dict(executor_class=executor_class, outcome="success"),
+        ),
+        "manifest": (
+            "validator_synthetic_batch_stage_duration_seconds_count",
+            dict(stage="_multi_get_miner_manifest"),
+        ),
+        "db_persist": (
+            "validator_synthetic_batch_stage_duration_seconds_count",
+            dict(stage="_db_persist"),
+        ),
+    }
+    before = {key: _sample(name, **labels) for key, (name, labels) in samples.items()}
+    events_before = _sample("validator_synthetic_batch_system_events_total")
+
+    await asyncio.wait_for(
+        execute_synthetic_batch_run(
+            axon_dict,
+            [miner],
+            create_miner_client=create_simulation_miner_client,
+        ),
+        timeout=1,
+    )
+
+    after = {key: _sample(name, **labels) for key, (name, labels) in samples.items()}
+    assert {key: after[key] - before[key] for key in samples} == {key: 1 for key in samples}
+    events_written = _sample("validator_synthetic_batch_system_events_total") - events_before
+    assert events_written == await SystemEvent.objects.acount()
+
+
+async def test_execute_miner_synthetic_jobs_sends_prepared_frames(
+    miner: Miner,
+    axon_dict: dict[str, bittensor.AxonInfo],
+    manifest_message: str,
+    executor_ready_message: str,
+    accept_job_message: str,
+    job_finish_message: str,
+    create_simulation_miner_client: Callable,
+    transport: MinerSimulationTransport,
+    job_uuid: uuid.UUID,
+):
+    await transport.add_message(manifest_message, send_before=1)
+    await transport.add_message(accept_job_message, send_before=1)
+    await transport.add_message(executor_ready_message, send_before=0)
+    await transport.add_message(job_finish_message, send_before=2)
+
+    await asyncio.wait_for(
+        execute_synthetic_batch_run(
+            axon_dict,
+            [miner],
+            create_miner_client=create_simulation_miner_client,
+        ),
+        timeout=1,
+    )
+
+    sent_types = [json.loads(message)["message_type"] for message in transport.sent]
+    assert sent_types[1:4] == [
+        "V0InitialJobRequest",
+        "V0JobStartedReceiptRequest",
+        "V0JobRequest",
+    ]
+    initial_job_request = V0InitialJobRequest.model_validate_json(transport.sent[1])
+    assert initial_job_request.job_uuid == str(job_uuid)
+
+    batch_telemetry = await SystemEvent.objects.aget(
+        type=SystemEvent.EventType.VALIDATOR_TELEMETRY,
+        subtype=SystemEvent.EventSubType.SYNTHETIC_BATCH,
+    )
+    assert batch_telemetry.data["frame_preparation_time"] >= 0
+    # single job, nothing to skew
+    assert batch_telemetry.data["job_send_skew"] == 0
+
+
 @patch(
     "compute_horde_validator.validator.synthetic_jobs.batch_run._JOB_RESPONSE_EXTRA_TIMEOUT", 0.05
 )
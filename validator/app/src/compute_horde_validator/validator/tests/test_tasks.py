@@ -157,9 +157,9 @@ def test_send_events_to_facilitator__failure():
     ],
 )
 def test__get_epoch_containing_block(netuid, block, expected_epoch):
-    assert (
-        get_epoch_containing_block(block=block, netuid=netuid) == expected_epoch
-    ), f"block: {block}, netuid: {netuid}, expected: {expected_epoch}"
+    assert get_epoch_containing_block(block=block, netuid=netuid) == expected_epoch, (
+        f"block: {block}, netuid: {netuid}, expected: {expected_epoch}"
+    )
 
 
 @pytest.mark.parametrize(
@@ -181,9 +181,9 @@ def test__get_epoch_containing_block(netuid, block, expected_epoch):
     ],
 )
 def test__get_cycle_containing_block(netuid, block, expected_cycle):
-    assert (
-        get_cycle_containing_block(block=block, netuid=netuid) == expected_cycle
-    ), f"block: {block}, netuid: {netuid}, expected: {expected_cycle}"
+    assert get_cycle_containing_block(block=block, netuid=netuid) == expected_cycle, (
+        f"block: {block}, netuid: {netuid}, expected: {expected_cycle}"
+    )
 
 
 @pytest.mark.django_db(databases=["default", "default_alias"])
@@ -428,6 +428,44 @@ def test__run_synthetic_jobs__different_timings(
         assert _run_synthetic_jobs.apply_async.call_count == expected_runs
 
 
+@patch("bittensor.subtensor", lambda *args, **kwargs: MockSubtensor())
+@pytest.mark.django_db(databases=["default", "default_alias"])
+@pytest.mark.override_config(DYNAMIC_SYNTHETIC_JOBS_PREWARM_BLOCKS=2)
+@pytest.mark.parametrize(
+    ("trigger_block", "expected_logs"),
+    [
+        # within the pre-warming window, the batch run is started right away
+        (101, 0),
+        (102, 0),
+        # waiting until the pre-warming window starts
+        (103, 0),
+        (104, 1),
+    ],
+)
+@patch("time.sleep", MagicMock())
+def test__run_synthetic_jobs__prewarm(settings, caplog, trigger_block, expected_logs):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    SyntheticJobBatch.objects.create(block=trigger_block)
+
+    with (
+        patch(
+            "compute_horde_validator.validator.tasks.get_subtensor",
+            lambda *args, **kwargs: MockSubtensor(
+                increase_block_number_with_each_call=True,
+                override_block_number=100,
+            ),
+        ),
+        patch("compute_horde_validator.validator.tasks._run_synthetic_jobs") as _run_synthetic_jobs,
+    ):
+        run_synthetic_jobs(wait_in_advance_blocks=5)
+
+    assert len([r for r in caplog.records if "Waiting for block " in r.message]) == expected_logs
+    assert _run_synthetic_jobs.apply_async.call_count == 1
+    assert _run_synthetic_jobs.apply_async.call_args.kwargs["kwargs"]["start_block"] == (
+        trigger_block
+    )
+
+
 @patch("bittensor.subtensor", lambda *args, **kwargs: MockSubtensor())
 @patch(
     "compute_horde_validator.validator.tasks.get_subtensor", lambda *args, **kwargs: MockSubtensor()
@@ -3,6 +3,9 @@ import io
 import zipfile
 from functools import cache
 
+from compute_horde.transport import CompressionPolicy
+from django.conf import settings
+
 MACHINE_SPEC_CHANNEL = "machine_spec_sending"
 
 
@@ -25,3 +28,14 @@ def get_dummy_inline_zip_volume() -> str:
     zip_contents = in_memory_output.read()
     base64_zip_contents = base64.b64encode(zip_contents)
     return base64_zip_contents.decode()
+
+
+def ws_compression_policy(compress_sent: bool = True) -> CompressionPolicy:
+    """
+    With `compress_sent=False` the sent messages are never compressed, the received ones
+    still can be.
+    """
+    return CompressionPolicy(
+        enabled=settings.WS_COMPRESSION,
+        threshold=settings.WS_COMPRESSION_THRESHOLD if compress_sent else None,
+    )